@@ -50,6 +50,7 @@ class TimeFormat(Enum):
 # Lotus 1-2-3 date epoch: January 1, 1900
 # Note: Lotus has the infamous "1900 leap year bug" where it treats 1900 as leap year
 LOTUS_EPOCH = datetime.date(1899, 12, 31)  # Day 0 is actually Dec 31, 1899
+_LOTUS_EPOCH_ORDINAL = LOTUS_EPOCH.toordinal()
 
 
 @dataclass
@@ -225,10 +226,10 @@ def serial_to_date(serial: float) -> datetime.date:
     Returns:
         Python date object
     """
-    # Handle the 1900 leap year bug (Lotus thinks Feb 29, 1900 existed)
-    if serial >= 60:
-        serial -= 1  # Adjust for the bug
-    return LOTUS_EPOCH + datetime.timedelta(days=int(serial))
+    days = int(serial)
+    # Handle the 1900 leap year bug (Lotus thinks Feb 29, 1900 existed):
+    # serials from 60 on are one day ahead. The bool subtracts as 0 or 1.
+    return datetime.date.fromordinal(_LOTUS_EPOCH_ORDINAL + days - (days >= 60))
 
 
 def date_to_serial(date: datetime.date) -> int:
@@ -240,12 +241,9 @@ def date_to_serial(date: datetime.date) -> int:
     Returns:
         Lotus serial number
     """
-    delta = date - LOTUS_EPOCH
-    serial = delta.days
-    # Add back the leap year bug adjustment
-    if serial >= 60:
-        serial += 1
-    return serial
+    serial = date.toordinal() - _LOTUS_EPOCH_ORDINAL
+    # Add back the leap year bug adjustment (the bool adds as 0 or 1)
+    return serial + (serial >= 60)
 
 
 def serial_to_time(serial: float) -> datetime.time:
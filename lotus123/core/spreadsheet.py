@@ -681,20 +681,29 @@ class Spreadsheet:
         """
         start_row, start_col = parse_cell_ref(start_ref)
         end_row, end_col = parse_cell_ref(end_ref)
+        return self.get_range_by_rc(start_row, start_col, end_row, end_col, context)
 
+    def get_range_by_rc(
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        context: EvaluationContext | None = None,
+    ) -> list[list[Any]]:
+        """Get values in a range given by 0-based corner coordinates as 2D list.
+
+        Corners may be given in either order.
+        """
         # Normalize direction
         if start_row > end_row:
             start_row, end_row = end_row, start_row
         if start_col > end_col:
             start_col, end_col = end_col, start_col
 
-        result = []
-        for r in range(start_row, end_row + 1):
-            row_vals = []
-            for c in range(start_col, end_col + 1):
-                row_vals.append(self.get_value(r, c, context))
-            result.append(row_vals)
-        return result
+        get_value = self.get_value
+        cols = range(start_col, end_col + 1)
+        return [[get_value(r, c, context) for c in cols] for r in range(start_row, end_row + 1)]
 
     def get_range_flat(
         self, start_ref: str, end_ref: str, context: EvaluationContext | None = None
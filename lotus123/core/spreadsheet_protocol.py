@@ -159,6 +159,17 @@ class SpreadsheetProtocol(Protocol):
         """Get values from a range as 2D list."""
         ...
 
+    def get_range_by_rc(
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        context: EvaluationContext | None = None,
+    ) -> list[list[Any]]:
+        """Get values from a range given by 0-based corners as 2D list."""
+        ...
+
     def get_range_flat(
         self, start_ref: str, end_ref: str, context: EvaluationContext | None = None
     ) -> list[Any]:
@@ -6,6 +6,9 @@ from ..core.errors import FormulaError
 from ..core.spreadsheet_protocol import SpreadsheetProtocol
 from .context import EvaluationContext
 
+# Shared empty successor set for cells missing from a dependency graph
+_EMPTY: frozenset[tuple[int, int]] = frozenset()
+
 
 class FormulaEvaluator:
     """Evaluates formulas with dependency tracking.
@@ -68,44 +71,50 @@ class FormulaEvaluator:
         Returns:
             Set of (row, col) tuples that the formula depends on
         """
+        from ..core.reference import parse_cell_ref
         from .tokenizer import Tokenizer, TokenType
 
         deps: set[tuple[int, int]] = set()
 
         # Use tokenizer to properly parse the formula (skips string literals)
         tokenizer = Tokenizer(self.spreadsheet)
-        tokens = tokenizer.tokenize(formula)
+        tokens = iter(tokenizer.tokenize(formula))
+
+        cell_type = TokenType.CELL
+        colon_type = TokenType.COLON
+        range_type = TokenType.RANGE
 
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
+        token = next(tokens, None)
+        while token is not None:
+            # One token of lookahead: the loop consumes ``nxt`` unless it was
+            # folded into a range below.
+            nxt = next(tokens, None)
 
-            if token.type == TokenType.CELL:
+            if token.type is cell_type:
                 # Check if this is part of a range (CELL:CELL or CELL..CELL)
-                if i + 2 < len(tokens) and tokens[i + 1].type == TokenType.COLON:
-                    next_token = tokens[i + 2]
-                    if next_token.type == TokenType.CELL:
+                if nxt is not None and nxt.type is colon_type:
+                    end = next(tokens, None)
+                    if end is not None and end.type is cell_type:
                         # It's a range
-                        deps.update(self._expand_range(token.value, next_token.value))
-                        i += 3
+                        deps.update(self._expand_range(token.value, end.value))
+                        token = next(tokens, None)
                         continue
+                    # Not a range: resume scanning at the token after the colon
+                    nxt = end
                 # Single cell reference
                 try:
-                    from ..core.reference import parse_cell_ref
-
-                    row, col = parse_cell_ref(token.value.replace("$", ""))
-                    deps.add((row, col))
+                    deps.add(parse_cell_ref(token.value.replace("$", "")))
                 except ValueError:
                     pass
 
-            elif token.type == TokenType.RANGE:
+            elif token.type is range_type:
                 # Named range resolved to range string like "A1:B10"
                 if ":" in token.value:
                     parts = token.value.split(":")
                     if len(parts) == 2:
                         deps.update(self._expand_range(parts[0], parts[1]))
 
-            i += 1
+            token = nxt
 
         return deps
 
@@ -176,7 +185,8 @@ def find_circular_references(
 ) -> list[tuple[int, int]]:
     """Find cells involved in circular references.
 
-    Uses Tarjan's algorithm to find strongly connected components.
+    Uses an iterative form of Tarjan's algorithm to find strongly
+    connected components.
 
     Args:
         dependency_graph: Graph from build_dependency_graph
@@ -184,42 +194,58 @@ def find_circular_references(
     Returns:
         List of cells involved in cycles
     """
-    index_counter = [0]
-    stack = []
-    lowlinks = {}
-    index = {}
-    on_stack = {}
-    circular = []
-
-    def strongconnect(node: tuple[int, int]) -> None:
-        index[node] = index_counter[0]
-        lowlinks[node] = index_counter[0]
-        index_counter[0] += 1
-        stack.append(node)
-        on_stack[node] = True
-
-        for dep in dependency_graph.get(node, set()):
-            if dep not in index:
-                strongconnect(dep)
-                lowlinks[node] = min(lowlinks[node], lowlinks.get(dep, index_counter[0]))
-            elif on_stack.get(dep, False):
-                lowlinks[node] = min(lowlinks[node], index.get(dep, index_counter[0]))
-
-        if lowlinks[node] == index[node]:
-            scc = []
-            while True:
-                w = stack.pop()
-                on_stack[w] = False
-                scc.append(w)
-                if w == node:
+    counter = 0
+    stack: list[tuple[int, int]] = []
+    index: dict[tuple[int, int], int] = {}
+    on_stack: set[tuple[int, int]] = set()
+    circular: list[tuple[int, int]] = []
+
+    for root in dependency_graph:
+        if root in index:
+            continue
+
+        # Each frame is [node, successor iterator, current lowlink]. Keeping the
+        # lowlink in the frame avoids a dict read/write per edge and the
+        # explicit stack avoids Python's recursion limit on long chains.
+        index[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        frames: list[list[Any]] = [[root, iter(dependency_graph.get(root, _EMPTY)), index[root]]]
+
+        while frames:
+            frame = frames[-1]
+            node = frame[0]
+            for dep in frame[1]:
+                if dep not in index:
+                    index[dep] = counter
+                    counter += 1
+                    stack.append(dep)
+                    on_stack.add(dep)
+                    frames.append([dep, iter(dependency_graph.get(dep, _EMPTY)), index[dep]])
                     break
-
-            # If SCC has more than one node, or node references itself
-            if len(scc) > 1 or (len(scc) == 1 and node in dependency_graph.get(node, set())):
-                circular.extend(scc)
-
-    for node in dependency_graph:
-        if node not in index:
-            strongconnect(node)
+                if dep in on_stack:
+                    dep_index = index[dep]
+                    if dep_index < frame[2]:
+                        frame[2] = dep_index
+            else:
+                # All successors visited: finish this node
+                frames.pop()
+                low = frame[2]
+                if frames and low < frames[-1][2]:
+                    frames[-1][2] = low
+
+                if low == index[node]:
+                    scc = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        scc.append(w)
+                        if w == node:
+                            break
+
+                    # If SCC has more than one node, or node references itself
+                    if len(scc) > 1 or node in dependency_graph.get(node, _EMPTY):
+                        circular.extend(scc)
 
     return circular
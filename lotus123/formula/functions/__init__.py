@@ -1,16 +1,40 @@
 """Formula function implementations organized by category."""
 
-from typing import Callable
-
-from .database import DATABASE_FUNCTIONS
-from .datetime import DATETIME_FUNCTIONS
-from .financial import FINANCIAL_FUNCTIONS
-from .info import INFO_FUNCTIONS
-from .logical import LOGICAL_FUNCTIONS
-from .lookup import LOOKUP_FUNCTIONS
-from .math import MATH_FUNCTIONS
-from .statistical import STATISTICAL_FUNCTIONS
-from .string import STRING_FUNCTIONS
+import importlib
+import sys
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .database import DATABASE_FUNCTIONS
+    from .datetime import DATETIME_FUNCTIONS
+    from .financial import FINANCIAL_FUNCTIONS
+    from .info import INFO_FUNCTIONS
+    from .logical import LOGICAL_FUNCTIONS
+    from .lookup import LOOKUP_FUNCTIONS
+    from .math import MATH_FUNCTIONS
+    from .statistical import STATISTICAL_FUNCTIONS
+    from .string import STRING_FUNCTIONS
+
+# Category modules and their function tables, in registration order: a later
+# table wins when two define the same name (e.g. statistical SUM over math's).
+# The modules are imported on first use, not when this package is imported.
+_CATEGORY_TABLES = {
+    "MATH_FUNCTIONS": "math",
+    "STATISTICAL_FUNCTIONS": "statistical",
+    "STRING_FUNCTIONS": "string",
+    "LOGICAL_FUNCTIONS": "logical",
+    "LOOKUP_FUNCTIONS": "lookup",
+    "DATETIME_FUNCTIONS": "datetime",
+    "INFO_FUNCTIONS": "info",
+    "FINANCIAL_FUNCTIONS": "financial",
+    "DATABASE_FUNCTIONS": "database",
+}
+
+
+def _load_table(name: str) -> dict[str, Callable]:
+    """Import a category module and return its function table."""
+    module = importlib.import_module(f".{_CATEGORY_TABLES[name]}", __name__)
+    return getattr(module, name)
 
 
 class FunctionRegistry:
@@ -26,15 +50,11 @@ class FunctionRegistry:
 
     def _register_all(self) -> None:
         """Register all built-in functions."""
-        self._functions.update(MATH_FUNCTIONS)
-        self._functions.update(STATISTICAL_FUNCTIONS)
-        self._functions.update(STRING_FUNCTIONS)
-        self._functions.update(LOGICAL_FUNCTIONS)
-        self._functions.update(LOOKUP_FUNCTIONS)
-        self._functions.update(DATETIME_FUNCTIONS)
-        self._functions.update(INFO_FUNCTIONS)
-        self._functions.update(FINANCIAL_FUNCTIONS)
-        self._functions.update(DATABASE_FUNCTIONS)
+        for name in _CATEGORY_TABLES:
+            self._functions.update(_load_table(name))
+        # Intern every key so lookups with interned names (the tokenizer
+        # interns function names) match on identity without comparing text
+        self._functions = {sys.intern(k): v for k, v in self._functions.items()}
 
     def get(self, name: str) -> Callable | None:
         """Get a function by name.
@@ -45,11 +65,13 @@ class FunctionRegistry:
         Returns:
             Function callable or None if not found
         """
-        return self._functions.get(name.upper())
+        # Names from the tokenizer are already upper-case; try them as given
+        # before paying for upper()
+        return self._functions.get(name) or self._functions.get(name.upper())
 
     def exists(self, name: str) -> bool:
         """Check if a function exists."""
-        return name.upper() in self._functions
+        return name in self._functions or name.upper() in self._functions
 
     def register(self, name: str, func: Callable) -> None:
         """Register a custom function.
@@ -58,7 +80,7 @@ class FunctionRegistry:
             name: Function name
             func: Callable implementing the function
         """
-        self._functions[name.upper()] = func
+        self._functions[sys.intern(name.upper())] = func
 
     def list_all(self) -> list[str]:
         """Get sorted list of all function names."""
@@ -94,5 +116,20 @@ __all__ = [
     "REGISTRY",
 ]
 
-# Global singleton registry
-REGISTRY = FunctionRegistry()
+# Global singleton registry, created on first access of ``REGISTRY``. The bare
+# annotation declares the name for type checkers without binding it, so module
+# attribute lookups fall through to ``__getattr__``, as do the category tables.
+REGISTRY: FunctionRegistry
+_registry: FunctionRegistry | None = None
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily build the global registry and load category tables (PEP 562)."""
+    if name == "REGISTRY":
+        global _registry
+        if _registry is None:
+            _registry = FunctionRegistry()
+        return _registry
+    if name in _CATEGORY_TABLES:
+        return _load_table(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
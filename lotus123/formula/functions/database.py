@@ -7,24 +7,47 @@ Database functions operate on a table with headers and apply criteria
 to filter rows before calculating statistics.
 """
 
+import fnmatch
+import functools
 import math
-from typing import Any
+import operator
+import re
+import sys
+from typing import Any, Callable, Iterator
 
 from ...core.errors import FormulaError
 
 
 def _to_number(value: Any) -> float | None:
     """Convert value to number, returning None for non-numeric."""
-    if isinstance(value, (int, float)):
+    # Exact type checks first: these are the common cell value types
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int or isinstance(value, (int, float)):
         return float(value)
     if isinstance(value, str):
         try:
-            return float(value.replace(",", ""))
+            return float(value.replace(",", "") if "," in value else value)
         except ValueError:
             return None
     return None
 
 
+@functools.lru_cache(maxsize=128)
+def _header_index(headers: tuple[str, ...]) -> dict[str, int]:
+    """Map case-folded header names to their first column index.
+
+    Cached by the headers' text, so repeated D-functions over the same table
+    share one map; keying on text rather than the values keeps headers such
+    as 1 and 1.0 apart. The returned dict must not be mutated.
+    """
+    index: dict[str, int] = {}
+    for i, header in enumerate(headers):
+        index.setdefault(sys.intern(header.casefold()), i)
+    return index
+
+
 def _get_field_index(database: list[Any], field: Any) -> int | None:
     """Get the column index for a field.
 
@@ -44,148 +67,321 @@ def _get_field_index(database: list[Any], field: Any) -> int | None:
         return None
 
     # String field name
-    field_str = str(field).upper()
-    for i, header in enumerate(headers):
-        if str(header).upper() == field_str:
-            return i
-    return None
+    return _header_index(tuple(map(str, headers))).get(str(field).casefold())
 
 
-def _matches_criteria(row: list[Any], headers: list[Any], criteria: list[Any]) -> bool:
-    """Check if a row matches the criteria.
+# Memoized _get_matching_values results: (database, values) keyed by the
+# database's identity, field and criteria. See clear_match_cache.
+_MATCH_CACHE: dict[tuple[Any, ...], tuple[list[Any], list[float]]] = {}
+_MATCH_CACHE_SIZE = 256
+
+# Exact cell value types that _text_predicate may skip formatting for, and
+# every character str() can produce for them (digits, sign, exponent, inf, nan)
+_NUMBER_TYPES = (int, float)
+_NUMBER_TEXT_CHARS = frozenset("0123456789.+-einfa")
+
+# A compiled criteria block: OR-list of AND-lists of (column index, predicate)
+CompiledCriteria = list[list[tuple[int, Callable[[Any], bool]]]]
+
+_NUMERIC_OPERATORS: tuple[tuple[str, Callable[[float, float], bool]], ...] = (
+    (">=", operator.ge),
+    ("<=", operator.le),
+    (">", operator.gt),
+    ("<", operator.lt),
+)
+
+
+def _numeric_predicate(op: Callable[[float, float], bool], rhs: float) -> Callable[[Any], bool]:
+    """Build a predicate comparing a cell numerically against a constant."""
+
+    def predicate(value: Any) -> bool:
+        try:
+            return op(float(value), rhs)
+        except (ValueError, TypeError):
+            return False
+
+    return predicate
+
+
+def _text_predicate(rhs: str, equal: bool) -> Callable[[Any], bool]:
+    """Build a case-insensitive (in)equality predicate against a constant.
+
+    When the target contains characters that never appear in str() of an
+    int or float, numeric cells are decided without formatting them.
+    """
+    target = sys.intern(rhs.casefold())
+    if set(target) <= _NUMBER_TEXT_CHARS:
+        if equal:
+            return lambda value: str(value).casefold() == target
+        return lambda value: str(value).casefold() != target
+
+    if equal:
+        return lambda value: type(value) not in _NUMBER_TYPES and str(value).casefold() == target
+    return lambda value: type(value) in _NUMBER_TYPES or str(value).casefold() != target
+
+
+@functools.lru_cache(maxsize=256)
+def _wildcard_matcher(patterns: tuple[str, ...]) -> Callable[[str], re.Match[str] | None]:
+    """Compile wildcard patterns into one anchored, case-folded alternation.
+
+    Cached so that recalculating a D-function does not re-translate and
+    re-compile the same criteria on every evaluation.
+    """
+    regex = "|".join(fnmatch.translate(pattern.casefold()) for pattern in patterns)
+    return re.compile(regex).match
+
+
+def _is_wildcard(crit_str: str) -> bool:
+    """Check if a criterion is a bare wildcard pattern (no operator prefix)."""
+    if crit_str.startswith(("<", ">", "=", "!=")):
+        return False
+    return "*" in crit_str or "?" in crit_str
+
+
+def _wildcard_predicate(*patterns: str) -> Callable[[Any], bool]:
+    """Build a case-insensitive predicate matching any of the wildcard patterns."""
+    match = _wildcard_matcher(patterns)
+    return lambda value: match(str(value).casefold()) is not None
+
+
+def _compile_criterion(crit_str: str) -> Callable[[Any], bool] | None:
+    """Translate a single criterion string into a predicate.
+
+    Returns None if the criterion can never match (non-numeric operand
+    for a numeric comparison).
+    """
+    if crit_str.startswith("<>") or crit_str.startswith("!="):
+        return _text_predicate(crit_str[2:], equal=False)
+
+    for prefix, op in _NUMERIC_OPERATORS:
+        if crit_str.startswith(prefix):
+            try:
+                rhs = float(crit_str[len(prefix) :])
+            except ValueError:
+                return None
+            return _numeric_predicate(op, rhs)
+
+    if crit_str.startswith("="):
+        return _text_predicate(crit_str[1:], equal=True)
+    if _is_wildcard(crit_str):
+        return _wildcard_predicate(crit_str)
+    return _text_predicate(crit_str, equal=True)
+
+
+def _compile_criteria(criteria: list[Any], headers: list[Any]) -> CompiledCriteria:
+    """Pre-parse a criteria block once so rows can be matched cheaply.
 
     Criteria format:
     - First row is headers
     - Subsequent rows are OR conditions (any row matches)
     - Within a row, conditions are AND (all must match)
+
+    Operators, header lookups and operand conversion are resolved here
+    rather than per database row. OR rows that consist of a single wildcard
+    on the same column are merged into one regex alternation. A result of
+    ``[[]]`` matches every row; an empty list matches none.
     """
     if not criteria or len(criteria) < 2:
-        return True  # No criteria, all rows match
+        return [[]]  # No criteria, all rows match
 
     criteria_headers = criteria[0] if isinstance(criteria[0], list) else [criteria[0]]
+    # Resolve each criteria column to its database column once, not per OR row
+    header_index = _header_index(tuple(map(str, headers)))
+    criteria_columns = [header_index.get(str(header).casefold()) for header in criteria_headers]
+
+    compiled: CompiledCriteria = []
+    wildcard_rows: dict[int, list[str]] = {}
+    has_any_condition = False
 
-    # Check each criteria row (OR between rows)
     for crit_row in criteria[1:]:
         if not isinstance(crit_row, list):
             crit_row = [crit_row]
 
-        row_matches = True
+        conjuncts: list[tuple[int, Callable[[Any], bool]]] = []
+        wildcard: str | None = None
         has_condition = False
+        satisfiable = True
 
-        # Check each condition in the row (AND within row)
         for i, crit_value in enumerate(crit_row):
             if crit_value == "" or crit_value is None:
                 continue  # Empty criteria, skip
 
             has_condition = True
 
-            if i >= len(criteria_headers):
+            if i >= len(criteria_columns):
                 continue
 
-            # Find matching column in database
-            crit_header = str(criteria_headers[i]).upper()
-            col_idx = None
-            for j, header in enumerate(headers):
-                if str(header).upper() == crit_header:
-                    col_idx = j
-                    break
-
-            if col_idx is None or col_idx >= len(row):
-                row_matches = False
+            col_idx = criteria_columns[i]
+            crit_str = str(crit_value)
+            predicate = _compile_criterion(crit_str)
+            if col_idx is None or predicate is None:
+                satisfiable = False
                 break
+            conjuncts.append((col_idx, predicate))
+            if _is_wildcard(crit_str):
+                wildcard = crit_str
+
+        has_any_condition = has_any_condition or has_condition
+        if not (has_condition and satisfiable):
+            continue
+        if len(conjuncts) == 1 and wildcard is not None:
+            wildcard_rows.setdefault(conjuncts[0][0], []).append(wildcard)
+        else:
+            compiled.append(conjuncts)
+
+    for col_idx, patterns in wildcard_rows.items():
+        compiled.append([(col_idx, _wildcard_predicate(*patterns))])
+
+    if not has_any_condition:
+        return [[]]  # Only blank criteria rows, all rows match
+    return compiled
+
+
+def _conjunction(conjuncts: list[tuple[int, Callable[[Any], bool]]]) -> Callable[[list[Any]], bool]:
+    """Build a row predicate requiring every condition of one criteria row."""
+    if len(conjuncts) == 1:
+        col_idx, predicate = conjuncts[0]
+        return lambda row: col_idx < len(row) and predicate(row[col_idx])
+
+    def match_all(row: list[Any]) -> bool:
+        row_len = len(row)
+        for col_idx, predicate in conjuncts:
+            if col_idx >= row_len or not predicate(row[col_idx]):
+                return False
+        return True
+
+    return match_all
+
+
+def _row_predicate(compiled: CompiledCriteria) -> Callable[[list[Any]], bool] | None:
+    """Collapse compiled criteria into a single row predicate.
+
+    Each OR row becomes one closure, and several OR rows are tried in turn
+    by an outer closure, so matching a record is one call with no
+    per-row iteration over the criteria structure. Returns None when the
+    criteria accept every row.
+    """
+    if any(not conjuncts for conjuncts in compiled):
+        return None
+    if not compiled:
+        return lambda row: False
+
+    alternatives = [_conjunction(conjuncts) for conjuncts in compiled]
+    if len(alternatives) == 1:
+        return alternatives[0]
+
+    def match_any(row: list[Any]) -> bool:
+        for alternative in alternatives:
+            if alternative(row):
+                return True
+        return False
+
+    return match_any
+
+
+def _matching_rows(database: list[Any], compiled: CompiledCriteria) -> Iterator[list[Any]]:
+    """Iterate over database records (excluding headers) that satisfy the criteria.
+
+    When the criteria accept every row, no predicate is called.
+    """
+    rows = (row if isinstance(row, list) else [row] for row in database[1:])
+    predicate = _row_predicate(compiled)
+    if predicate is None:
+        return rows
+    if len(compiled) == 1 and len(compiled[0]) == 1:
+        # Single condition: test it inline, saving a call per row
+        col_idx, condition = compiled[0][0]
+        return (row for row in rows if col_idx < len(row) and condition(row[col_idx]))
+    return filter(predicate, rows)
 
-            cell_value = row[col_idx]
-            crit_str = str(crit_value)
 
-            # Handle comparison operators
-            if crit_str.startswith(">="):
-                try:
-                    if float(cell_value) < float(crit_str[2:]):
-                        row_matches = False
-                        break
-                except (ValueError, TypeError):
-                    row_matches = False
-                    break
-            elif crit_str.startswith("<="):
-                try:
-                    if float(cell_value) > float(crit_str[2:]):
-                        row_matches = False
-                        break
-                except (ValueError, TypeError):
-                    row_matches = False
-                    break
-            elif crit_str.startswith("<>") or crit_str.startswith("!="):
-                if str(cell_value).upper() == crit_str[2:].upper():
-                    row_matches = False
-                    break
-            elif crit_str.startswith(">"):
-                try:
-                    if float(cell_value) <= float(crit_str[1:]):
-                        row_matches = False
-                        break
-                except (ValueError, TypeError):
-                    row_matches = False
-                    break
-            elif crit_str.startswith("<"):
-                try:
-                    if float(cell_value) >= float(crit_str[1:]):
-                        row_matches = False
-                        break
-                except (ValueError, TypeError):
-                    row_matches = False
-                    break
-            elif crit_str.startswith("="):
-                if str(cell_value).upper() != crit_str[1:].upper():
-                    row_matches = False
-                    break
-            else:
-                # Exact match (case-insensitive) or wildcard
-                if "*" in crit_str or "?" in crit_str:
-                    # Wildcard matching
-                    import fnmatch
-
-                    if not fnmatch.fnmatch(str(cell_value).upper(), crit_str.upper()):
-                        row_matches = False
-                        break
-                else:
-                    if str(cell_value).upper() != crit_str.upper():
-                        row_matches = False
-                        break
-
-        if has_condition and row_matches:
-            return True
-
-    return not any(
-        any(c != "" and c is not None for c in (r if isinstance(r, list) else [r]))
-        for r in criteria[1:]
+def _matches_criteria(row: list[Any], headers: list[Any], criteria: list[Any]) -> bool:
+    """Check if a row matches the criteria.
+
+    Convenience wrapper for a single row; bulk callers should compile the
+    criteria once with _compile_criteria and use _row_predicate.
+    """
+    predicate = _row_predicate(_compile_criteria(criteria, headers))
+    return predicate is None or predicate(row)
+
+
+def _typed_key(block: list[Any]) -> tuple[Any, ...]:
+    """Hashable, type-exact key for a small range such as a criteria block.
+
+    Types are included because 1, 1.0 and True compare equal but match text
+    criteria differently.
+    """
+    return tuple(
+        tuple((type(v), v) for v in row) if isinstance(row, list) else (type(row), row)
+        for row in block
     )
 
 
+def clear_match_cache() -> None:
+    """Drop memoized D-function matches.
+
+    Called by the recalculation engine at the start of each pass. Entries are
+    keyed on the database list's identity, so a caller that mutates a range
+    in place between D-function calls must clear the cache first.
+    """
+    _MATCH_CACHE.clear()
+
+
 def _get_matching_values(database: list[Any], field: Any, criteria: list[Any]) -> list[float]:
-    """Get numeric values from matching rows."""
+    """Get numeric values from matching rows.
+
+    Results are memoized so that several D-functions over the same filter
+    (e.g. @DSUM and @DAVG side by side) scan the table once. The formula
+    engine passes one list per range per evaluation, so a hit needs that
+    same list; checking contents would cost as much as the scan. The
+    returned list must not be mutated.
+    """
     if not database or len(database) < 2:
         return []
 
+    try:
+        key = (id(database), type(field), field, _typed_key(criteria))
+        hash(key)
+    except TypeError:
+        key = None
+    else:
+        entry = _MATCH_CACHE.get(key)
+        # The entry keeps its database alive, so the id cannot have been reused
+        if entry is not None and entry[0] is database:
+            return entry[1]
+
     headers = database[0] if isinstance(database[0], list) else [database[0]]
     field_idx = _get_field_index(database, field)
 
     if field_idx is None:
         return []
 
-    values = []
-    for row in database[1:]:
-        if not isinstance(row, list):
-            row = [row]
-
-        if _matches_criteria(row, headers, criteria):
-            if field_idx < len(row):
-                num = _to_number(row[field_idx])
-                if num is not None:
-                    values.append(num)
+    compiled = _compile_criteria(criteria, headers)
+    # Pull the field column out in one comprehension, then convert it with map()
+    # so the per-value work stays in C-level iteration.
+    column = [row[field_idx] for row in _matching_rows(database, compiled) if field_idx < len(row)]
+    values = [num for num in map(_to_number, column) if num is not None]
 
+    if key is not None:
+        if len(_MATCH_CACHE) >= _MATCH_CACHE_SIZE:
+            _MATCH_CACHE.clear()
+        _MATCH_CACHE[key] = (database, values)
     return values
 
 
+def _sum_squared_deviations(values: list[float]) -> float:
+    """Sum of squared deviations from the mean in one pass (Welford's algorithm)."""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    return m2
+
+
 def fn_dsum(database: Any, field: Any, criteria: Any) -> float:
     """@DSUM - Sum of matching database records.
 
@@ -244,17 +440,14 @@ def fn_dcounta(database: Any, field: Any, criteria: Any) -> int:
         return 0
 
     crit = criteria if isinstance(criteria, list) else []
+    compiled = _compile_criteria(crit, headers)
     count = 0
 
-    for row in database[1:]:
-        if not isinstance(row, list):
-            row = [row]
-
-        if _matches_criteria(row, headers, crit):
-            if field_idx < len(row):
-                val = row[field_idx]
-                if val != "" and val is not None:
-                    count += 1
+    for row in _matching_rows(database, compiled):
+        if field_idx < len(row):
+            val = row[field_idx]
+            if val != "" and val is not None:
+                count += 1
 
     return count
 
@@ -306,9 +499,7 @@ def fn_dstd(database: Any, field: Any, criteria: Any) -> float:
     if len(values) < 2:
         return 0.0
 
-    mean = sum(values) / len(values)
-    variance = sum((x - mean) ** 2 for x in values) / (len(values) - 1)
-    return math.sqrt(variance)
+    return math.sqrt(_sum_squared_deviations(values) / (len(values) - 1))
 
 
 def fn_dstdp(database: Any, field: Any, criteria: Any) -> float:
@@ -325,9 +516,7 @@ def fn_dstdp(database: Any, field: Any, criteria: Any) -> float:
     if not values:
         return 0.0
 
-    mean = sum(values) / len(values)
-    variance = sum((x - mean) ** 2 for x in values) / len(values)
-    return math.sqrt(variance)
+    return math.sqrt(_sum_squared_deviations(values) / len(values))
 
 
 def fn_dvar(database: Any, field: Any, criteria: Any) -> float:
@@ -344,8 +533,7 @@ def fn_dvar(database: Any, field: Any, criteria: Any) -> float:
     if len(values) < 2:
         return 0.0
 
-    mean = sum(values) / len(values)
-    return sum((x - mean) ** 2 for x in values) / (len(values) - 1)
+    return _sum_squared_deviations(values) / (len(values) - 1)
 
 
 def fn_dvarp(database: Any, field: Any, criteria: Any) -> float:
@@ -362,8 +550,7 @@ def fn_dvarp(database: Any, field: Any, criteria: Any) -> float:
     if not values:
         return 0.0
 
-    mean = sum(values) / len(values)
-    return sum((x - mean) ** 2 for x in values) / len(values)
+    return _sum_squared_deviations(values) / len(values)
 
 
 def fn_dget(database: Any, field: Any, criteria: Any) -> Any:
@@ -382,15 +569,12 @@ def fn_dget(database: Any, field: Any, criteria: Any) -> Any:
         return FormulaError.VALUE
 
     crit = criteria if isinstance(criteria, list) else []
+    compiled = _compile_criteria(crit, headers)
     matches = []
 
-    for row in database[1:]:
-        if not isinstance(row, list):
-            row = [row]
-
-        if _matches_criteria(row, headers, crit):
-            if field_idx < len(row):
-                matches.append(row[field_idx])
+    for row in _matching_rows(database, compiled):
+        if field_idx < len(row):
+            matches.append(row[field_idx])
 
     if len(matches) == 0:
         return FormulaError.VALUE
@@ -7,20 +7,41 @@ Implements Lotus 1-2-3 compatible date/time functions:
 """
 
 import datetime
-from typing import Any
+import functools
+import operator
+from typing import Any, Callable
 
 from lotus123.core.formatting import (
     date_to_serial,
     serial_to_date,
-    serial_to_time,
     time_to_serial,
 )
 
 
+_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%m/%d/%y",
+    "%d-%b-%Y",
+    "%d-%b-%y",
+    "%B %d, %Y",
+    "%d.%m.%Y",
+)
+_TIME_FORMATS = ("%H:%M:%S", "%H:%M", "%I:%M:%S %p", "%I:%M %p")
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+@functools.lru_cache(maxsize=4096)
 def _parse_date_string(text: str) -> datetime.date | None:
     """Try to parse a date string."""
-    formats = ["%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%d-%b-%Y", "%d-%b-%y", "%B %d, %Y", "%d.%m.%Y"]
-    for fmt in formats:
+    # Fast path for ISO YYYY-MM-DD, which skips strptime's format parsing. The
+    # shape check keeps out other forms fromisoformat accepts (YYYYMMDD, weeks).
+    if len(text) == 10 and text[4] == text[7] == "-" and text.replace("-", "").isdigit():
+        try:
+            return datetime.date.fromisoformat(text)
+        except ValueError:
+            pass
+    for fmt in _DATE_FORMATS:
         try:
             return datetime.datetime.strptime(text, fmt).date()
         except ValueError:
@@ -28,12 +49,54 @@ def _parse_date_string(text: str) -> datetime.date | None:
     return None
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_time_string(text: str) -> datetime.time | None:
+    """Try to parse a time string."""
+    # Fast path for 24-hour H:M and H:M:S with ASCII digits, which is what
+    # most inputs look like; anything else goes through strptime.
+    parts = text.split(":")
+    if 2 <= len(parts) <= 3 and all(len(p) <= 2 and p.isascii() and p.isdigit() for p in parts):
+        try:
+            hour, minute = int(parts[0]), int(parts[1])
+            second = int(parts[2]) if len(parts) == 3 else 0
+            return datetime.time(hour, minute, second)
+        except ValueError:
+            return None
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _last_day(year: int, month: int) -> int:
+    """Number of days in a month, accounting for leap years."""
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month - 1]
+
+
+def _serial_to_seconds(serial: float) -> int:
+    """Seconds since midnight for a serial's fractional part.
+
+    Lets @HOUR/@MINUTE/@SECOND read a single field without building a
+    datetime.time.
+    """
+    return int(serial % 1 * 86400) % 86400
+
+
 def _to_number(value: Any) -> float:
     """Convert value to number."""
-    if isinstance(value, (int, float)):
+    # Exact type checks first: these are the common cell value types
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int or isinstance(value, (int, float)):
         return float(value)
+    text = value if value_type is str else str(value)
     try:
-        return float(str(value).replace(",", ""))
+        return float(text.replace(",", "") if "," in text else text)
     except ValueError:
         return 0.0
 
@@ -57,16 +120,13 @@ def fn_date(year: Any, month: Any, day: Any) -> int:
 
     try:
         # Handle month overflow/underflow
-        while m < 1:
-            y -= 1
-            m += 12
-        while m > 12:
-            y += 1
-            m -= 12
+        year_offset, month_index = divmod(m - 1, 12)
+        y += year_offset
+        m = month_index + 1
 
         date = datetime.date(y, m, d)
         return date_to_serial(date)
-    except ValueError:
+    except (ValueError, OverflowError):
         return 0
 
 
@@ -82,58 +142,79 @@ def fn_datevalue(date_text: Any) -> int:
     return 0
 
 
-def fn_day(serial_number: Any) -> int:
+def _date_part(serial_number: Any, extract: Callable[[datetime.date], int]) -> Any:
+    """Extract a field from a date serial, or from every serial in a range.
+
+    A range is converted in one batch that keeps its shape; repeated serials
+    (common in date columns) are converted once.
+    """
+    if not isinstance(serial_number, list):
+        try:
+            return extract(serial_to_date(_to_number(serial_number)))
+        except (ValueError, OverflowError):
+            return 0
+
+    parts: dict[float, int] = {}
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, list):
+            return [convert(v) for v in value]
+        serial = _to_number(value)
+        part = parts.get(serial)
+        if part is None:
+            try:
+                part = extract(serial_to_date(serial))
+            except (ValueError, OverflowError):
+                part = 0
+            parts[serial] = part
+        return part
+
+    return convert(serial_number)
+
+
+def fn_day(serial_number: Any) -> Any:
     """@DAY - Day of month from date serial.
 
     Usage: @DAY(serial_number) or @DAY(@NOW())
-    Returns 1-31.
+    Returns 1-31, or a range of days for a range argument.
     """
-    try:
-        date = serial_to_date(_to_number(serial_number))
-        return date.day
-    except (ValueError, OverflowError):
-        return 0
+    return _date_part(serial_number, operator.attrgetter("day"))
 
 
-def fn_month(serial_number: Any) -> int:
+def fn_month(serial_number: Any) -> Any:
     """@MONTH - Month from date serial.
 
     Usage: @MONTH(serial_number)
-    Returns 1-12.
+    Returns 1-12, or a range of months for a range argument.
     """
-    try:
-        date = serial_to_date(_to_number(serial_number))
-        return date.month
-    except (ValueError, OverflowError):
-        return 0
+    return _date_part(serial_number, operator.attrgetter("month"))
 
 
-def fn_year(serial_number: Any) -> int:
+def fn_year(serial_number: Any) -> Any:
     """@YEAR - Year from date serial.
 
     Usage: @YEAR(serial_number)
-    Returns 4-digit year.
+    Returns 4-digit year, or a range of years for a range argument.
     """
-    try:
-        date = serial_to_date(_to_number(serial_number))
-        return date.year
-    except (ValueError, OverflowError):
-        return 0
+    return _date_part(serial_number, operator.attrgetter("year"))
 
 
-def fn_weekday(serial_number: Any, return_type: Any = 1) -> int:
+def fn_weekday(serial_number: Any, return_type: Any = 1) -> Any:
     """@WEEKDAY - Day of week from date serial.
 
     Usage: @WEEKDAY(serial_number, return_type)
     return_type: 1 = Sunday=1 to Saturday=7
                  2 = Monday=1 to Sunday=7
                  3 = Monday=0 to Sunday=6
+    Returns a range of weekdays for a range argument.
     """
     try:
-        date = serial_to_date(_to_number(serial_number))
-        weekday = date.weekday()  # Monday = 0
-
         rtype = int(_to_number(return_type))
+    except (ValueError, OverflowError):
+        return 0
+
+    def extract(date: datetime.date) -> int:
+        weekday = date.weekday()  # Monday = 0
         if rtype == 1:
             # Sunday = 1, Saturday = 7
             return (weekday + 2) % 7 or 7
@@ -143,8 +224,8 @@ def fn_weekday(serial_number: Any, return_type: Any = 1) -> int:
         else:  # rtype == 3
             # Monday = 0, Sunday = 6
             return weekday
-    except (ValueError, OverflowError):
-        return 0
+
+    return _date_part(serial_number, extract)
 
 
 def fn_today() -> int:
@@ -189,15 +270,9 @@ def fn_timevalue(time_text: Any) -> float:
 
     Usage: @TIMEVALUE("14:30:00")
     """
-    text = str(time_text).strip()
-
-    formats = ["%H:%M:%S", "%H:%M", "%I:%M:%S %p", "%I:%M %p"]
-    for fmt in formats:
-        try:
-            time = datetime.datetime.strptime(text, fmt).time()
-            return time_to_serial(time)
-        except ValueError:
-            continue
+    time = _parse_time_string(str(time_text).strip())
+    if time:
+        return time_to_serial(time)
     return 0.0
 
 
@@ -208,8 +283,8 @@ def fn_hour(serial_number: Any) -> int:
     Returns 0-23.
     """
     try:
-        time = serial_to_time(_to_number(serial_number))
-        return time.hour
+        seconds = _serial_to_seconds(_to_number(serial_number))
+        return seconds // 3600
     except (ValueError, OverflowError):
         return 0
 
@@ -221,8 +296,8 @@ def fn_minute(serial_number: Any) -> int:
     Returns 0-59.
     """
     try:
-        time = serial_to_time(_to_number(serial_number))
-        return time.minute
+        seconds = _serial_to_seconds(_to_number(serial_number))
+        return seconds // 60 % 60
     except (ValueError, OverflowError):
         return 0
 
@@ -234,8 +309,8 @@ def fn_second(serial_number: Any) -> int:
     Returns 0-59.
     """
     try:
-        time = serial_to_time(_to_number(serial_number))
-        return time.second
+        seconds = _serial_to_seconds(_to_number(serial_number))
+        return seconds % 60
     except (ValueError, OverflowError):
         return 0
 
@@ -265,10 +340,7 @@ def fn_edate(start_date: Any, months: Any) -> int:
         new_month = ((new_month - 1) % 12) + 1
 
         # Handle day overflow
-        import calendar
-
-        max_day = calendar.monthrange(new_year, new_month)[1]
-        new_day = min(date.day, max_day)
+        new_day = min(date.day, _last_day(new_year, new_month))
 
         new_date = datetime.date(new_year, new_month, new_day)
         return date_to_serial(new_date)
@@ -289,10 +361,7 @@ def fn_eomonth(start_date: Any, months: Any) -> int:
         new_year = date.year + (new_month - 1) // 12
         new_month = ((new_month - 1) % 12) + 1
 
-        import calendar
-
-        last_day = calendar.monthrange(new_year, new_month)[1]
-        new_date = datetime.date(new_year, new_month, last_day)
+        new_date = datetime.date(new_year, new_month, _last_day(new_year, new_month))
         return date_to_serial(new_date)
     except (ValueError, OverflowError):
         return 0
@@ -0,0 +1,25 @@
+"""Cell-by-cell application of single-value functions to range arguments."""
+
+from typing import Any, Callable
+
+from ...core.errors import FormulaError
+
+
+def elementwise(func: Callable[..., Any], *args: Any) -> list[Any] | str:
+    """Apply a scalar function across range arguments, keeping their shape.
+
+    Scalar arguments are reused for every cell. ``func`` handles nested rows
+    itself, and a cell it cannot compute becomes ERR rather than failing the
+    whole range. Range arguments of different lengths give ERR.
+    """
+    sizes = {len(arg) for arg in args if isinstance(arg, list)}
+    if len(sizes) != 1:
+        return FormulaError.ERR
+    size = sizes.pop()
+    result = []
+    for i in range(size):
+        try:
+            result.append(func(*[arg[i] if isinstance(arg, list) else arg for arg in args]))
+        except (ValueError, TypeError, ZeroDivisionError, OverflowError):
+            result.append(FormulaError.ERR)
+    return result
@@ -5,65 +5,136 @@ Implements Lotus 1-2-3 compatible financial functions:
 @SLN, @SYD, @DDB, @IPMT, @PPMT, @TERM
 """
 
+import functools
+import itertools
 import math
 from typing import Any
 
 from ...core.errors import FormulaError
+from .elementwise import elementwise
 
 
-def fn_pmt(rate: Any, nper: Any, pv: Any) -> float:
+def _flatten_args(args: tuple) -> list:
+    """Flatten nested lists in arguments.
+
+    Ranges as the parser builds them (lists of rows of cells) are flattened by
+    C-level chaining; other shapes take an iterative walk, so deep nesting
+    cannot hit the recursion limit.
+    """
+    if args and all(type(arg) is list for arg in args):
+        rows = list(itertools.chain.from_iterable(args))
+        if set(map(type, rows)) == {list}:
+            cells = list(itertools.chain.from_iterable(rows))
+            if list not in map(type, cells):
+                return cells
+
+    result: list[Any] = []
+    append = result.append
+    stack = [iter(args)]
+    while stack:
+        for arg in stack[-1]:
+            if isinstance(arg, list):
+                stack.append(iter(arg))
+                break
+            append(arg)
+        else:
+            stack.pop()
+    return result
+
+
+@functools.lru_cache(maxsize=256)
+def _text_to_float(text: str) -> float | None:
+    """Parse a numeric label such as "-1e3"; None for other text."""
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _as_float(value: Any) -> float | None:
+    """Numeric value of a cash flow cell, or None to skip it.
+
+    Shared by @NPV and @IRR so each cell is coerced once, floats pass through
+    untouched and repeated text (blanks, labels) hits the parse cache
+    instead of raising ValueError every time.
+    """
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is str:
+        return _text_to_float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+def fn_pmt(rate: Any, nper: Any, pv: Any) -> Any:
     """@PMT - Calculate loan payment.
 
     Usage: @PMT(interest_rate, num_periods, present_value)
 
     Returns the periodic payment for a loan based on constant payments
     and a constant interest rate (ordinary annuity).
-    Result is negative (cash outflow).
+    Result is negative (cash outflow). Range arguments give a range of
+    payments, one per cell.
     """
+    if isinstance(rate, list) or isinstance(nper, list) or isinstance(pv, list):
+        return elementwise(fn_pmt, rate, nper, pv)
+
     r = float(rate)
     n = float(nper)
     present = float(pv)
 
     if r == 0:
-        return -float(present / n)
+        return -(present / n)
 
-    return -float(present * (r * (1 + r) ** n) / ((1 + r) ** n - 1))
+    growth = (1 + r) ** n
+    return -float(present * (r * growth) / (growth - 1))
 
 
-def fn_pv(rate: Any, nper: Any, pmt: Any) -> float:
+def fn_pv(rate: Any, nper: Any, pmt: Any) -> Any:
     """@PV - Calculate present value.
 
     Usage: @PV(interest_rate, num_periods, payment)
 
     Returns the present value of an investment based on periodic,
     constant payments and a constant interest rate.
-    Result is negative (represents initial investment).
+    Result is negative (represents initial investment). Range arguments
+    give a range of values, one per cell.
     """
+    if isinstance(rate, list) or isinstance(nper, list) or isinstance(pmt, list):
+        return elementwise(fn_pv, rate, nper, pmt)
+
     r = float(rate)
     n = float(nper)
     payment = float(pmt)
 
     if r == 0:
-        return -float(payment * n)
+        return -(payment * n)
 
     return -float(payment * ((1 - (1 + r) ** -n) / r))
 
 
-def fn_fv(rate: Any, nper: Any, pmt: Any) -> float:
+def fn_fv(rate: Any, nper: Any, pmt: Any) -> Any:
     """@FV - Calculate future value.
 
     Usage: @FV(interest_rate, num_periods, payment)
 
     Returns the future value of an investment based on periodic,
     constant payments and a constant interest rate.
-    Result is negative (represents accumulated value owed).
+    Result is negative (represents accumulated value owed). Range
+    arguments give a range of values, one per cell.
     """
+    if isinstance(rate, list) or isinstance(nper, list) or isinstance(pmt, list):
+        return elementwise(fn_fv, rate, nper, pmt)
+
     r = float(rate)
     n = float(nper)
     payment = float(pmt)
 
     if r == 0:
-        return -float(payment * n)
+        return -(payment * n)
 
     return -float(payment * (((1 + r) ** n - 1) / r))
 
@@ -76,28 +147,102 @@ def fn_npv(rate: Any, *cash_flows: Any) -> float:
     Returns the net present value of an investment based on a discount
     rate and a series of future payments (negative) and income (positive).
     """
-    r = float(rate)
+    discount = 1 / (1 + float(rate))
 
-    # Flatten any lists in cash_flows
-    flows = []
-    for cf in cash_flows:
-        if isinstance(cf, list):
-            for item in cf:
-                if isinstance(item, list):
-                    flows.extend(item)
-                else:
-                    flows.append(item)
+    # Horner's rule over the reversed flows: each step multiplies once by the
+    # discount factor instead of raising (1 + r) to the period's power.
+    # Non-numeric entries still occupy their period.
+    npv = 0.0
+    for cf in map(_as_float, reversed(_flatten_args(cash_flows))):
+        if cf is None:
+            npv *= discount
         else:
-            flows.append(cf)
+            npv = (npv + cf) * discount
+
+    return npv
 
+
+def _npv_with_derivative(reversed_flows: list[float], rate: float) -> tuple[float, float]:
+    """NPV of cash flows at ``rate`` and its derivative with respect to the rate.
+
+    NPV is a polynomial P(x) in x = 1 / (1 + rate), so one Horner pass over the
+    flows (last period first) yields P(x) and P'(x) without computing powers.
+    By the chain rule dNPV/drate = -x**2 * P'(x).
+    """
+    x = 1 / (1 + rate)
     npv = 0.0
-    for i, cf in enumerate(flows):
-        try:
-            npv += float(cf) / ((1 + r) ** (i + 1))
-        except (ValueError, TypeError):
-            pass
+    dpoly = 0.0
+    for cf in reversed_flows:
+        dpoly = dpoly * x + npv
+        npv = npv * x + cf
+    return npv, -x * x * dpoly
 
-    return npv
+
+def _irr_newton(reversed_flows: list[float], rate: float) -> float | None:
+    """Newton-Raphson solve for an IRR, or None if it fails to converge."""
+    best_npv = math.inf
+    stalled = 0
+
+    # Newton-Raphson iteration, kept inside the rate > -1 domain
+    for _ in range(100):
+        npv, npv_deriv = _npv_with_derivative(reversed_flows, rate)
+        if abs(npv) < 1e-12:
+            return rate
+
+        # Give up on Newton once it stops reducing |NPV|
+        if abs(npv) < best_npv:
+            best_npv = abs(npv)
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled >= 5:
+                return None
+
+        if abs(npv_deriv) < 1e-10:
+            return None
+
+        new_rate = rate - npv / npv_deriv
+        if new_rate <= -1:
+            # Step back halfway to -1 instead of leaving the domain
+            new_rate = (rate - 1) / 2
+
+        if abs(new_rate - rate) < 1e-10 * (1 + abs(rate)):
+            return new_rate
+
+        rate = new_rate
+
+    return None
+
+
+# Rates probed for a sign change of NPV when Newton's method fails
+_IRR_BRACKETS = (-0.999, -0.9, -0.5, 0.0, 1.0, 10.0, 100.0)
+
+
+def _bisect_irr(reversed_flows: list[float]) -> float | None:
+    """Find an IRR by bisection, or None if NPV never changes sign."""
+    lo = _IRR_BRACKETS[0]
+    npv_lo = _npv_with_derivative(reversed_flows, lo)[0]
+    for hi in _IRR_BRACKETS[1:]:
+        npv_hi = _npv_with_derivative(reversed_flows, hi)[0]
+        if npv_lo == 0:
+            return lo
+        if (npv_lo < 0) != (npv_hi < 0):
+            break
+        lo, npv_lo = hi, npv_hi
+    else:
+        return None
+
+    # The bracket is at most ~90 wide, so this reaches 1e-12 in ~50 halvings
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        npv_mid = _npv_with_derivative(reversed_flows, mid)[0]
+        if abs(npv_mid) < 1e-12 or hi - lo < 1e-12:
+            return mid
+        if (npv_mid < 0) == (npv_lo < 0):
+            lo, npv_lo = mid, npv_mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
 
 
 def fn_irr(*args: Any) -> float | str:
@@ -106,7 +251,8 @@ def fn_irr(*args: Any) -> float | str:
     Usage: @IRR(range) or @IRR(guess, range)
 
     Returns the internal rate of return for a series of cash flows.
-    Uses Newton-Raphson iteration.
+    Uses Newton-Raphson iteration, falling back to bisection when it
+    does not converge.
     """
     # Parse arguments - IRR can be called as @IRR(range) or @IRR(guess, range)
     if not args:
@@ -127,45 +273,87 @@ def fn_irr(*args: Any) -> float | str:
         guess_val = float(first_arg) if first_arg else 0.1
         cash_flow_args = args[1:]
 
-    # Flatten cash flows
-    flows: list[Any] = []
-    for cf in cash_flow_args:
-        if isinstance(cf, list):
-            for item in cf:
-                if isinstance(item, list):
-                    flows.extend(item)
-                else:
-                    flows.append(item)
-        else:
-            flows.append(cf)
+    flows = _flatten_args(cash_flow_args)
 
-    float_flows = [
-        float(f)
-        for f in flows
-        if isinstance(f, (int, float))
-        or (isinstance(f, str) and f.replace(".", "").replace("-", "").isdigit())
-    ]
+    float_flows = [v for v in map(_as_float, flows) if v is not None]
 
     # IRR requires at least 2 cash flows to be meaningful
     if len(float_flows) < 2:
         return FormulaError.ERR
 
-    rate = guess_val
+    # The root is unchanged by scaling every flow, and with NPV near unit size
+    # the solvers' absolute tolerances mean the same thing for any currency
+    scale = max(map(abs, float_flows)) or 1.0
+    reversed_flows = [cf / scale for cf in reversed(float_flows)]
+    root = _irr_newton(reversed_flows, guess_val)
+    if root is None:
+        root = _bisect_irr(reversed_flows)
+    if root is None:
+        return FormulaError.ERR
+    return root
+
+
+def _rate_newton(n: float, payment: float, present: float, future: float, rate: float) -> float:
+    """Newton-Raphson solve of the annuity equation for the periodic rate.
 
-    # Newton-Raphson iteration
+    Works on plain floats only. Each step takes one power:
+    (1 + rate) ** n is derived from (1 + rate) ** (n - 1).
+    """
     for _ in range(100):
-        npv = sum(cf / ((1 + rate) ** i) for i, cf in enumerate(float_flows))
-        npv_deriv = sum(-i * cf / ((1 + rate) ** (i + 1)) for i, cf in enumerate(float_flows))
+        if rate == 0:
+            y = present + payment * n + future
+            dy = 0.0
+        else:
+            q = (1 + rate) ** (n - 1)
+            r1 = q * (1 + rate)
+            y = present * r1 + payment * (r1 - 1) / rate + future
+            dy = present * n * q + payment * ((n * q * rate - (r1 - 1)) / (rate * rate))
 
-        if abs(npv_deriv) < 1e-10:
+        if abs(dy) < 1e-10:
+            # Flat derivative (always so at rate 0): finish derivative-free
+            return _rate_secant(n, payment, present, future, rate)
+
+        new_rate = rate - y / dy
+
+        if abs(new_rate - rate) < 1e-10 * (1 + abs(rate)):
+            return new_rate
+
+        rate = new_rate
+
+    return rate
+
+
+def _annuity_residual(
+    n: float, payment: float, present: float, future: float, rate: float
+) -> float:
+    """Value of the annuity equation @RATE solves; zero at the answer."""
+    if rate == 0:
+        return present + payment * n + future
+    r1 = (1 + rate) ** n
+    return present * r1 + payment * (r1 - 1) / rate + future
+
+
+def _rate_secant(n: float, payment: float, present: float, future: float, rate: float) -> float:
+    """Secant iteration for @RATE, used where Newton's derivative vanishes.
+
+    Needs one power per step and no derivative. Starts from ``rate`` and a
+    nearby second point.
+    """
+    prev = rate + 0.01
+    y_prev = _annuity_residual(n, payment, present, future, prev)
+    y = _annuity_residual(n, payment, present, future, rate)
+    for _ in range(100):
+        if y == y_prev:
             break
 
-        new_rate = rate - npv / npv_deriv
+        new_rate = rate - y * (rate - prev) / (y - y_prev)
 
-        if abs(new_rate - rate) < 1e-10:
+        if abs(new_rate - rate) < 1e-10 * (1 + abs(rate)):
             return new_rate
 
+        prev, y_prev = rate, y
         rate = new_rate
+        y = _annuity_residual(n, payment, present, future, rate)
 
     return rate
 
@@ -183,29 +371,10 @@ def fn_rate(nper: Any, pmt: Any, pv: Any, fv: Any = 0, guess: Any = 0.1) -> floa
     future = float(fv) if fv else 0
     rate = float(guess) if guess else 0.1
 
-    # Newton-Raphson iteration
-    for _ in range(100):
-        if rate == 0:
-            y = present + payment * n + future
-            dy = 0
-        else:
-            r1 = (1 + rate) ** n
-            y = present * r1 + payment * (r1 - 1) / rate + future
-            dy = present * n * (1 + rate) ** (n - 1) + payment * (
-                (n * (1 + rate) ** (n - 1) * rate - (r1 - 1)) / (rate**2)
-            )
-
-        if abs(dy) < 1e-10:
-            break
-
-        new_rate = rate - y / dy
-
-        if abs(new_rate - rate) < 1e-10:
-            return new_rate
-
-        rate = new_rate
-
-    return rate
+    # Scale the cash amounts to unit size; the rate that solves the annuity
+    # equation is unchanged and the derivative test stays meaningful
+    scale = max(abs(payment), abs(present), abs(future)) or 1.0
+    return _rate_newton(n, payment / scale, present / scale, future / scale, rate)
 
 
 def fn_nper(rate: Any, pmt: Any, pv: Any, fv: Any = 0) -> float:
@@ -223,7 +392,8 @@ def fn_nper(rate: Any, pmt: Any, pv: Any, fv: Any = 0) -> float:
     if r == 0:
         return -(present + future) / payment
 
-    return math.log((payment - future * r) / (payment + present * r)) / math.log(1 + r)
+    # log1p keeps full precision for the small per-period rates typical here
+    return math.log((payment - future * r) / (payment + present * r)) / math.log1p(r)
 
 
 def fn_cterm(rate: Any, fv: Any, pv: Any) -> float | str:
@@ -241,7 +411,7 @@ def fn_cterm(rate: Any, fv: Any, pv: Any) -> float | str:
     if r <= 0 or present <= 0 or future <= 0:
         return FormulaError.ERR
 
-    return math.log(future / present) / math.log(1 + r)
+    return math.log(future / present) / math.log1p(r)
 
 
 def fn_term(pmt: Any, rate: Any, fv: Any) -> float:
@@ -258,7 +428,7 @@ def fn_term(pmt: Any, rate: Any, fv: Any) -> float:
     if r == 0:
         return future / payment
 
-    return math.log(1 + (future * r / payment)) / math.log(1 + r)
+    return math.log1p(future * r / payment) / math.log1p(r)
 
 
 def fn_sln(cost: Any, salvage: Any, life: Any) -> float | str:
@@ -313,15 +483,13 @@ def fn_ddb(cost: Any, salvage: Any, life: Any, period: Any, factor: Any = 2) ->
     if n <= 0 or per <= 0:
         return FormulaError.ERR
 
-    # Calculate book value at start of period
+    # Book value at start of period: each earlier period keeps (1 - rate) of
+    # the balance, so it is c * (1 - rate) ** (per - 1) until it reaches
+    # salvage. A rate above 1 wipes out the balance in the first period.
     rate = f / n
-    book_value = c
-    for _ in range(per - 1):
-        depreciation = book_value * rate
-        book_value -= depreciation
-        if book_value < s:
-            book_value = s
-            break
+    book_value = c * max(1 - rate, 0.0) ** (per - 1)
+    if book_value < s:
+        book_value = s
 
     # Calculate depreciation for this period
     depreciation = book_value * rate
@@ -331,6 +499,23 @@ def fn_ddb(cost: Any, salvage: Any, life: Any, period: Any, factor: Any = 2) ->
     return max(0.0, depreciation)
 
 
+def _amort_period(r: float, per: int, n: int, present: float) -> tuple[float, float, float]:
+    """Payment, interest and principal for one period of a loan.
+
+    Computes the level payment and the balance remaining before ``per``
+    with one power each, so @IPMT and @PPMT share a single pass.
+    """
+    if r == 0:
+        return present / n, 0.0, present / n
+
+    q_n = (1 + r) ** n
+    q_per = (1 + r) ** (per - 1)
+    pmt = present * r * q_n / (q_n - 1)
+    remaining = present * q_per - pmt * (q_per - 1) / r
+    interest = remaining * r
+    return pmt, interest, pmt - interest
+
+
 def fn_ipmt(rate: Any, period: Any, nper: Any, pv: Any) -> float | str:
     """@IPMT - Interest portion of payment.
 
@@ -338,27 +523,13 @@ def fn_ipmt(rate: Any, period: Any, nper: Any, pv: Any) -> float | str:
 
     Returns the interest payment for a given period of an investment.
     """
-    r = float(rate)
     per = int(period)
     n = int(nper)
-    present = float(pv)
 
     if per < 1 or per > n:
         return FormulaError.ERR
 
-    # Calculate payment
-    if r == 0:
-        pmt = present / n
-    else:
-        pmt = present * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
-
-    # Calculate remaining principal at start of period
-    if r == 0:
-        remaining = present - (per - 1) * pmt
-    else:
-        remaining = present * (1 + r) ** (per - 1) - pmt * ((1 + r) ** (per - 1) - 1) / r
-
-    return remaining * r
+    return _amort_period(float(rate), per, n, float(pv))[1]
 
 
 def fn_ppmt(rate: Any, period: Any, nper: Any, pv: Any) -> float | str:
@@ -368,26 +539,13 @@ def fn_ppmt(rate: Any, period: Any, nper: Any, pv: Any) -> float | str:
 
     Returns the principal payment for a given period of an investment.
     """
-    r = float(rate)
     per = int(period)
     n = int(nper)
-    present = float(pv)
 
     if per < 1 or per > n:
         return FormulaError.ERR
 
-    # Calculate payment
-    if r == 0:
-        pmt = present / n
-        return pmt
-    else:
-        pmt = present * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
-
-    # Principal = Payment - Interest
-    ipmt_result = fn_ipmt(rate, period, nper, pv)
-    if isinstance(ipmt_result, str):
-        return ipmt_result
-    return pmt - ipmt_result
+    return _amort_period(float(rate), per, n, float(pv))[2]
 
 
 # Function registry for this module
@@ -5,8 +5,48 @@ Implements Lotus 1-2-3 compatible information functions:
 @ISNUMBER, @ISSTRING, @ISERR, @ISNA, @TYPE
 """
 
+import functools
+import os
+import sys
 from typing import Any
 
+from ...core.errors import ERROR_TYPE_MAP, FormulaError
+
+# @TYPE codes by exact value type; bool precedes int for the subclass fallback
+_TYPE_CODES: dict[type, int] = {bool: 4, int: 1, float: 1, str: 2, list: 64}
+
+# @CELL attributes that do not depend on the reference
+_CELL_CONSTANTS: dict[str, Any] = {
+    "address": "$A$1",
+    "col": 1,
+    "row": 1,
+    "width": 9,  # Default width
+    "format": "G",  # General
+    "prefix": "'",  # Default left-align
+}
+
+# @INFO attributes fixed for the life of the process
+_INFO_CONSTANTS: dict[str, Any] = {
+    "numfile": 1,
+    "origin": "$A:$A$1",
+    "osversion": sys.platform,
+    "recalc": "Automatic",
+    "release": "1.0",
+    "system": sys.platform,
+    "totmem": 1000000,
+    "usedmem": 100000,
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _attribute_name(text: str) -> str:
+    """Normalize an @CELL/@INFO attribute name ('"Row"' -> "row").
+
+    Formulas repeat the same few literals, so the result is cached and
+    interned for the table lookup that follows.
+    """
+    return sys.intern(text.lower().strip('"'))
+
 
 def fn_type(value: Any) -> int:
     """@TYPE - Return type number of value.
@@ -18,17 +58,13 @@ def fn_type(value: Any) -> int:
         16 = Error
         64 = Array
     """
-    if isinstance(value, bool):
-        return 4
-    if isinstance(value, (int, float)):
-        return 1
-    if isinstance(value, str):
-        if value.startswith("#"):
-            return 16  # Error
-        return 2  # Text
-    if isinstance(value, list):
-        return 64
-    return 1  # Default to number
+    code = _TYPE_CODES.get(type(value))
+    if code is None:
+        # Subclasses of the known types
+        code = next((c for t, c in _TYPE_CODES.items() if isinstance(value, t)), 1)
+    if code == 2 and value[:1] == "#":
+        return 16  # Error
+    return code
 
 
 def fn_cell(info_type: Any, reference: Any = None) -> Any:
@@ -46,31 +82,21 @@ def fn_cell(info_type: Any, reference: Any = None) -> Any:
 
     Note: Without spreadsheet context, returns placeholder values.
     """
-    info = str(info_type).lower().strip('"')
-
-    if info == "address":
-        return "$A$1"
-    elif info == "col":
-        return 1
-    elif info == "row":
-        return 1
-    elif info == "contents":
+    info = _attribute_name(str(info_type))
+
+    value = _CELL_CONSTANTS.get(info)
+    if value is not None:
+        return value
+    if info == "contents":
         return reference if reference else ""
-    elif info == "type":
+    if info == "type":
         if reference is None or reference == "":
             return "b"  # blank
         elif isinstance(reference, (int, float)):
             return "v"  # value
         else:
             return "l"  # label
-    elif info == "width":
-        return 9  # Default width
-    elif info == "format":
-        return "G"  # General
-    elif info == "prefix":
-        return "'"  # Default left-align
-    else:
-        return ""
+    return ""
 
 
 def fn_cellpointer(attribute: Any = "contents") -> Any:
@@ -96,31 +122,11 @@ def fn_info(type_text: Any) -> Any:
         "totmem" - Total memory
         "usedmem" - Used memory
     """
-    import os
-    import sys
-
-    info = str(type_text).lower().strip('"')
+    info = _attribute_name(str(type_text))
 
     if info == "directory":
         return os.getcwd()
-    elif info == "numfile":
-        return 1
-    elif info == "origin":
-        return "$A:$A$1"
-    elif info == "osversion":
-        return sys.platform
-    elif info == "recalc":
-        return "Automatic"
-    elif info == "release":
-        return "1.0"
-    elif info == "system":
-        return sys.platform
-    elif info == "totmem":
-        return 1000000
-    elif info == "usedmem":
-        return 100000
-    else:
-        return ""
+    return _INFO_CONSTANTS.get(info, "")
 
 
 def fn_error_type(error_val: Any) -> int:
@@ -136,16 +142,10 @@ def fn_error_type(error_val: Any) -> int:
         7 = #N/A
         8 = #CIRC!
     """
-    from ...core.errors import ERROR_TYPE_MAP, FormulaError
-
+    # Only exact error values are accepted, so a direct lookup suffices
     if not FormulaError.is_error(error_val):
         return 0
-
-    # Check for partial matches
-    for err, num in ERROR_TYPE_MAP.items():
-        if error_val.startswith(err.rstrip("!")):
-            return num
-    return 0
+    return ERROR_TYPE_MAP.get(error_val, 0)
 
 
 def fn_sheet(value: Any = None) -> int:
@@ -5,20 +5,43 @@ Implements Lotus 1-2-3 compatible logical functions:
 @ISERR, @ISNA, @ISNUMBER, @ISSTRING
 """
 
-from typing import Any
+import functools
+from typing import Any, Iterator
 
 from ...core.errors import FormulaError
 
+# Exact numeric cell types, checked before any isinstance() fallback
+_NUMERIC_TYPES = frozenset((bool, int, float))
+
+
+def _iter_args(args: tuple) -> Iterator[Any]:
+    """Yield the values in arguments, descending into nested lists.
+
+    Lazy, so callers such as @AND/@OR can stop at the first deciding value;
+    an explicit stack keeps deep nesting clear of the recursion limit.
+    """
+    stack = [iter(args)]
+    while stack:
+        for arg in stack[-1]:
+            if isinstance(arg, list):
+                stack.append(iter(arg))
+                break
+            yield arg
+        else:
+            stack.pop()
+
 
 def _flatten_args(args: tuple) -> list:
     """Flatten nested lists in arguments."""
-    result = []
-    for arg in args:
-        if isinstance(arg, list):
-            result.extend(_flatten_args(tuple(arg)))
-        else:
-            result.append(arg)
-    return result
+    return list(_iter_args(args))
+
+
+def _is_error_text(value: Any) -> bool:
+    """Check for error-style text such as "#DIV/0!".
+
+    A one-character slice compare is cheaper than a startswith() call.
+    """
+    return isinstance(value, str) and value[:1] == "#"
 
 
 def _to_bool(value: Any) -> bool:
@@ -30,20 +53,22 @@ def _to_bool(value: Any) -> bool:
     - Empty string is False
     - Non-empty string is True (in some contexts)
     """
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, (int, float)):
+    value_type = type(value)
+    if value_type in _NUMERIC_TYPES:
         return value != 0
-    if isinstance(value, str):
-        if value.upper() == "TRUE":
+    if value_type is str or isinstance(value, str):
+        upper = value.upper()
+        if upper == "TRUE":
             return True
-        if value.upper() == "FALSE":
+        if upper == "FALSE":
             return False
         # Try as number
         try:
             return float(value) != 0
         except ValueError:
             return bool(value)  # Non-empty string is truthy
+    if isinstance(value, (int, float)):
+        return value != 0
     return False
 
 
@@ -73,10 +98,8 @@ def fn_and(*args: Any) -> bool:
 
     Returns TRUE if all arguments are true.
     """
-    values = _flatten_args(args)
-    if not values:
-        return True
-    return all(_to_bool(v) for v in values)
+    # all() of no values is True, matching @AND with no arguments
+    return all(map(_to_bool, _iter_args(args)))
 
 
 def fn_or(*args: Any) -> bool:
@@ -84,10 +107,8 @@ def fn_or(*args: Any) -> bool:
 
     Returns TRUE if any argument is true.
     """
-    values = _flatten_args(args)
-    if not values:
-        return False
-    return any(_to_bool(v) for v in values)
+    # any() of no values is False, matching @OR with no arguments
+    return any(map(_to_bool, _iter_args(args)))
 
 
 def fn_not(value: Any) -> bool:
@@ -103,8 +124,7 @@ def fn_xor(*args: Any) -> bool:
 
     Returns TRUE if an odd number of arguments are true.
     """
-    values = _flatten_args(args)
-    count = sum(1 for v in values if _to_bool(v))
+    count = sum(map(_to_bool, _iter_args(args)))
     return count % 2 == 1
 
 
@@ -113,30 +133,33 @@ def fn_iserr(value: Any) -> bool:
 
     Returns TRUE for errors like #DIV/0!, #ERR!, #CIRC!, etc.
     """
-    if isinstance(value, str) and value.startswith("#"):
+    if _is_error_text(value):
         return value != FormulaError.NA
     return False
 
 
 def fn_iserror(value: Any) -> bool:
     """@ISERROR - Check if value is any error (including #N/A)."""
-    return isinstance(value, str) and value.startswith("#")
+    return _is_error_text(value)
 
 
 def fn_isna(value: Any) -> bool:
     """@ISNA - Check if value is #N/A error."""
-    return bool(value == FormulaError.NA)
+    return value == FormulaError.NA
 
 
 def fn_isnumber(value: Any) -> bool:
     """@ISNUMBER - Check if value is numeric."""
+    value_type = type(value)
+    if value_type is int or value_type is float:
+        return True
     if isinstance(value, bool):
         return False  # Booleans are not numbers in this context
     if isinstance(value, (int, float)):
         return True
-    if isinstance(value, str):
+    if value_type is str or isinstance(value, str):
         try:
-            float(value.replace(",", ""))
+            float(value.replace(",", "") if "," in value else value)
             return True
         except ValueError:
             return False
@@ -150,10 +173,10 @@ def fn_isstring(value: Any) -> bool:
     """
     if isinstance(value, str):
         # Check it's not an error or number
-        if value.startswith("#"):
+        if value[:1] == "#":
             return False
         try:
-            float(value.replace(",", ""))
+            float(value.replace(",", "") if "," in value else value)
             return False  # It's a number formatted as text
         except ValueError:
             return True
@@ -217,7 +240,7 @@ def fn_iferror(value: Any, value_if_error: Any) -> Any:
 
     Usage: @IFERROR(value, value_if_error)
     """
-    if isinstance(value, str) and value.startswith("#"):
+    if _is_error_text(value):
         return value_if_error
     return value
 
@@ -232,22 +255,39 @@ def fn_ifna(value: Any, value_if_na: Any) -> Any:
     return value
 
 
-def fn_switch(expression: Any, *args: Any) -> Any:
-    """@SWITCH - Match value against list of cases.
+@functools.lru_cache(maxsize=256)
+def _switch_table(args: tuple) -> dict[Any, int]:
+    """Map each @SWITCH case value to the position of its result in ``args``.
 
-    Usage: @SWITCH(expression, value1, result1, value2, result2, ..., default)
+    Cached because a @SWITCH copied down a column repeats the same cases
+    with a different expression. Positions rather than results are stored,
+    so arguments that are equal but differently typed (1, 1.0, True) can
+    share a table while results still come from the caller's own arguments.
     """
-    pairs = list(args)
+    # Reversed so the first of any duplicate cases wins, as in a linear scan
+    last_case = len(args) - 2 if len(args) % 2 == 0 else len(args) - 3
+    return {args[i]: i + 1 for i in range(last_case, -1, -2)}
 
-    # Check for default value (odd number of remaining args)
-    default: Any = "" if len(pairs) % 2 == 0 else pairs.pop()
 
-    # Check each value/result pair
-    for i in range(0, len(pairs), 2):
-        if expression == pairs[i]:
-            return pairs[i + 1]
+def fn_switch(expression: Any, *args: Any) -> Any:
+    """@SWITCH - Match value against list of cases.
 
-    return default
+    Usage: @SWITCH(expression, value1, result1, value2, result2, ..., default)
+    """
+    try:
+        index = _switch_table(args).get(expression)
+    except TypeError:
+        # Unhashable case values or expression (e.g. ranges): scan pairwise
+        index = next(
+            (i + 1 for i in range(0, len(args) - 1, 2) if expression == args[i]),
+            None,
+        )
+
+    if index is not None:
+        return args[index]
+
+    # Odd number of remaining args means the last one is the default
+    return args[-1] if len(args) % 2 else ""
 
 
 def fn_choose(index: Any, *values: Any) -> Any:
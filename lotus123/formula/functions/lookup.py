@@ -5,11 +5,23 @@ Implements Lotus 1-2-3 compatible lookup functions:
 @CELL, @CELLPOINTER, @COLS, @ROWS
 """
 
-from typing import Any
+import bisect
+import functools
+import itertools
+import math
+import operator
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from ...core.errors import FormulaError
 
 
+# Matches any text float() might accept: it needs a digit, "inf" or "nan"
+_NUMERIC_TEXT = re.compile(r"\d|inf|nan", re.IGNORECASE)
+
+
 # These functions need access to the spreadsheet for range operations
 # They're called with the spreadsheet as the first hidden argument
 
@@ -37,6 +49,16 @@ def _is_sorted(values: list[Any]) -> bool:
     """Check if values are sorted ascending for range lookups."""
     if len(values) < 2:
         return True
+    sort_keys = _sort_keys(values)
+    if sort_keys is None:
+        return _is_sorted_pairwise(values)
+    keys = sort_keys[1]
+    # Timsort confirms an already-sorted run in one C-level pass
+    return keys == sorted(keys)
+
+
+def _is_sorted_pairwise(values: list[Any]) -> bool:
+    """Sort check for mixed values, which compare numerically only pairwise."""
     last = values[0]
     for value in values[1:]:
         if _compare_for_sort(last, value) > 0:
@@ -45,6 +67,227 @@ def _is_sorted(values: list[Any]) -> bool:
     return True
 
 
+def _sort_keys(values: list[Any]) -> tuple[bool, list[Any]] | None:
+    """Comparison keys for values that are all numbers or all text.
+
+    Returns (numeric, keys): floats when every value parses as a number,
+    upper-cased strings when none does. Mixed values (or NaN) return None,
+    since pairwise lookup comparisons over them are not a total order.
+    """
+    try:
+        numbers = list(map(float, values))
+    except (ValueError, TypeError):
+        # Text holding no digit, "inf" or "nan" can't parse; skip raising for it
+        candidates = [v for v in values if not isinstance(v, str) or _NUMERIC_TEXT.search(v)]
+        if any(_try_float(v) is not None for v in candidates):
+            return None
+        return False, list(map(str.upper, map(str, values)))
+    if any(map(math.isnan, numbers)):
+        return None
+    return True, numbers
+
+
+def _search_target(numeric: bool, lookup_value: Any) -> Any:
+    """Key to compare lookup_value against ``_sort_keys`` output, or None.
+
+    None means the lookup value is text (or NaN) against numeric keys, which
+    the pairwise comparisons order differently from the keys.
+    """
+    if not numeric:
+        return str(lookup_value).upper()
+    target = _try_float(lookup_value)
+    if target is None or target != target:  # Text or NaN
+        return None
+    return target
+
+
+def _bisect_last_le(sort_keys: tuple[bool, list[Any]] | None, lookup_value: Any) -> int | None:
+    """Binary-search sorted keys for the last one <= lookup_value.
+
+    Takes the result of ``_sort_keys`` for a sorted column and matches what
+    a linear scan with ``_is_match(..., True)`` finds, in O(log n)
+    comparisons. Returns -1 when every value is greater, or None when the
+    values (or the lookup value) mix numbers and text and the caller must
+    scan instead.
+    """
+    if sort_keys is None:
+        return None
+    numeric, keys = sort_keys
+    target = _search_target(numeric, lookup_value)
+    if target is None:
+        return None
+    return bisect.bisect_right(keys, target) - 1
+
+
+# Tables shorter than this are scanned; building an index costs more.
+_EXACT_INDEX_MIN = 64
+
+
+def _exact_key(value: Any) -> Any:
+    """Hash key under which ``_is_match(..., False)`` considers values equal."""
+    return value.upper() if isinstance(value, str) else value
+
+
+def _build_exact_index(entries: Iterable[tuple[int, Any]]) -> dict[Any, int] | None:
+    """Map each exact-match key to the position of its first occurrence.
+
+    Takes (position, value) pairs so callers can leave out entries their
+    linear scan would skip. Returns None when a value is unhashable and
+    the caller must scan instead.
+    """
+    index: dict[Any, int] = {}
+    try:
+        for pos, value in entries:
+            key = value.upper() if isinstance(value, str) else value
+            if key not in index:
+                index[key] = pos
+    except TypeError:
+        return None
+    return index
+
+
+def _find_exact(index: dict[Any, int], lookup_value: Any) -> int | None:
+    """Position of lookup_value's first exact match in an index, if any."""
+    if lookup_value != lookup_value:  # NaN equals nothing, not even itself
+        return None
+    try:
+        return index.get(_exact_key(lookup_value))
+    except TypeError:
+        return None
+
+
+@dataclass(eq=False)
+class _LookupIndex:
+    """Search structures for one lookup column, each built on first use."""
+
+    values: list[Any]
+
+    @functools.cached_property
+    def is_sorted(self) -> bool:
+        if self.sort_keys is not None:
+            return self.ascending is not None
+        # Mixed column: compare neighbours as _compare_for_sort would
+        pairs = zip(self.numbers, self.upper_keys)
+        last_num, last_str = next(pairs)
+        for num, text in pairs:
+            if last_num is not None and num is not None:
+                if last_num > num:
+                    return False
+            elif last_str > text:
+                return False
+            last_num, last_str = num, text
+        return True
+
+    @functools.cached_property
+    def sort_keys(self) -> tuple[bool, list[Any]] | None:
+        return _sort_keys(self.values)
+
+    @functools.cached_property
+    def numbers(self) -> list[float | None]:
+        """Each value parsed as a number, or None for text."""
+        return [_try_float(v) for v in self.values]
+
+    @functools.cached_property
+    def upper_keys(self) -> list[str]:
+        """Each value as upper-cased text."""
+        return list(map(str.upper, map(str, self.values)))
+
+    @functools.cached_property
+    def ascending(self) -> tuple[bool, list[Any]] | None:
+        """Sort keys if they never decrease, else None."""
+        keys = self.sort_keys
+        if keys is None or keys[1] != sorted(keys[1]):
+            return None
+        return keys
+
+    @functools.cached_property
+    def descending(self) -> tuple[bool, list[Any]] | None:
+        """Sort keys reversed, if that makes them never decrease, else None."""
+        keys = self.sort_keys
+        if keys is None:
+            return None
+        numeric, forward = keys
+        reverse = forward[::-1]
+        if reverse != sorted(reverse):
+            return None
+        return numeric, reverse
+
+    @functools.cached_property
+    def exact(self) -> dict[Any, int] | None:
+        return _build_exact_index(enumerate(self.values))
+
+    def compare(self, op: Callable[[Any, Any], bool], lookup_value: Any) -> Iterator[bool]:
+        """Yield op(value, lookup_value) for each value, as the scans compare.
+
+        Pairs where both sides parse as numbers compare numerically, others
+        compare as upper-cased text, using the cached conversions.
+        """
+        if self.sort_keys is not None:
+            numeric, keys = self.sort_keys
+            target = _search_target(numeric, lookup_value)
+            if target is not None:
+                return map(op, keys, itertools.repeat(target))
+        target = str(lookup_value).upper()
+        number = _try_float(lookup_value)
+        if number is None:
+            return map(op, self.upper_keys, itertools.repeat(target))
+        return (
+            op(num, number) if num is not None else op(text, target)
+            for num, text in zip(self.numbers, self.upper_keys)
+        )
+
+    def last_le(self, lookup_value: Any) -> int:
+        """Position of the last value <= lookup_value, or -1 if none is."""
+        found = _bisect_last_le(self.ascending, lookup_value)
+        if found is None:
+            hits = list(
+                itertools.compress(itertools.count(), self.compare(operator.le, lookup_value))
+            )
+            found = hits[-1] if hits else -1
+        return found
+
+    def prefix_length(self, op: Callable[[Any, Any], bool], lookup_value: Any) -> int:
+        """Count the leading values for which op(value, lookup_value) holds."""
+        misses = map(operator.not_, self.compare(op, lookup_value))
+        return next(itertools.compress(itertools.count(), misses), len(self.values))
+
+
+# Lookup indexes keyed by column contents and value types. See
+# clear_lookup_cache.
+_LOOKUP_CACHE: dict[tuple[tuple[Any, ...], tuple[type, ...]], _LookupIndex] = {}
+_LOOKUP_CACHE_SIZE = 256
+
+
+def clear_lookup_cache() -> None:
+    """Drop memoized lookup indexes.
+
+    Called by the recalculation engine at the start of each pass. Entries are
+    keyed by the column contents, so clearing only bounds memory.
+    """
+    _LOOKUP_CACHE.clear()
+
+
+def _get_lookup_index(values: list[Any]) -> _LookupIndex:
+    """Get the lookup index for a column, shared by equal columns.
+
+    The formula engine builds a fresh list per evaluation, so entries are
+    keyed by contents rather than identity: many lookups into the same range
+    sort-check and index it once. Types are part of the key because equal
+    values such as 1 and 1.0 compare differently as text. Columns holding
+    unhashable values get an uncached index.
+    """
+    try:
+        key = (tuple(values), tuple(map(type, values)))
+        index = _LOOKUP_CACHE.get(key)
+    except TypeError:
+        return _LookupIndex(values)
+    if index is None:
+        if len(_LOOKUP_CACHE) >= _LOOKUP_CACHE_SIZE:
+            _LOOKUP_CACHE.clear()
+        index = _LOOKUP_CACHE[key] = _LookupIndex(list(key[0]))
+    return index
+
+
 def _is_match(lookup_value: Any, table_value: Any, range_lookup: bool = True) -> bool:
     """Check if values match for lookup.
 
@@ -67,6 +310,19 @@ def _is_match(lookup_value: Any, table_value: Any, range_lookup: bool = True) ->
         return bool(lookup_value == table_value)
 
 
+def _flatten_once(values: list[Any]) -> list[Any]:
+    """Splice the rows of a range into one vector, keeping loose values."""
+    if all(map(isinstance, values, itertools.repeat(list))):
+        return list(itertools.chain.from_iterable(values))
+    flat = []
+    for item in values:
+        if isinstance(item, list):
+            flat.extend(item)
+        else:
+            flat.append(item)
+    return flat
+
+
 def fn_vlookup(
     lookup_value: Any, table: list[Any], col_index: Any, range_lookup: Any = True
 ) -> Any:
@@ -96,27 +352,46 @@ def fn_vlookup(
     if col_idx < 0 or (table and col_idx >= len(table[0])):
         return FormulaError.REF
 
-    if range_match:
+    last_match_row = None
+    searched = False
+
+    if (range_match or len(table) >= _EXACT_INDEX_MIN) and all(table):
+        # No blank rows to skip: search the first column's cached index
+        index = _get_lookup_index([row[0] if isinstance(row, list) else row for row in table])
+        if range_match:
+            if not index.is_sorted:
+                return FormulaError.NA
+            searched = True
+            found = index.last_le(lookup_value)
+            last_match_row = found if found >= 0 else None
+        elif index.exact is not None:
+            match_row = _find_exact(index.exact, lookup_value)
+            if match_row is None:
+                return FormulaError.NA
+            row = table[match_row]
+            if isinstance(row, list) and col_idx < len(row):
+                return row[col_idx]
+            return FormulaError.REF
+    elif range_match:
         first_col = [row[0] if isinstance(row, list) else row for row in table if row is not None]
         if not _is_sorted(first_col):
             return FormulaError.NA
 
-    last_match_row = None
-
-    for row_idx, row in enumerate(table):
-        if not row:
-            continue
+    if not searched:
+        for row_idx, row in enumerate(table):
+            if not row:
+                continue
 
-        cell_value = row[0] if isinstance(row, list) else row
+            cell_value = row[0] if isinstance(row, list) else row
 
-        if range_match:
-            if _is_match(lookup_value, cell_value, True):
-                last_match_row = row_idx
-        else:
-            if _is_match(lookup_value, cell_value, False):
-                if isinstance(row, list) and col_idx < len(row):
-                    return row[col_idx]
-                return FormulaError.REF
+            if range_match:
+                if _is_match(lookup_value, cell_value, True):
+                    last_match_row = row_idx
+            else:
+                if _is_match(lookup_value, cell_value, False):
+                    if isinstance(row, list) and col_idx < len(row):
+                        return row[col_idx]
+                    return FormulaError.REF
 
     if range_match and last_match_row is not None:
         row = table[last_match_row]
@@ -151,25 +426,34 @@ def fn_hlookup(
         return FormulaError.REF
 
     first_row = table[0]
-    if range_match and not _is_sorted(first_row):
-        return FormulaError.NA
-    last_match_col = None
-
-    for col_idx, cell_value in enumerate(first_row):
-        if range_match:
-            if _is_match(lookup_value, cell_value, True):
-                last_match_col = col_idx
-        else:
-            if _is_match(lookup_value, cell_value, False):
-                if row_idx < len(table) and col_idx < len(table[row_idx]):
-                    return table[row_idx][col_idx]
-                return FormulaError.REF
 
-    if range_match and last_match_col is not None:
-        if row_idx < len(table) and last_match_col < len(table[row_idx]):
+    if range_match:
+        index = _get_lookup_index(first_row)
+        if not index.is_sorted:
+            return FormulaError.NA
+        last_match_col = index.last_le(lookup_value)
+        if last_match_col < 0:
+            return FormulaError.NA
+        if last_match_col < len(table[row_idx]):
             return table[row_idx][last_match_col]
         return FormulaError.REF
 
+    if len(first_row) >= _EXACT_INDEX_MIN:
+        exact = _get_lookup_index(first_row).exact
+        if exact is not None:
+            match_col = _find_exact(exact, lookup_value)
+            if match_col is None:
+                return FormulaError.NA
+            if match_col < len(table[row_idx]):
+                return table[row_idx][match_col]
+            return FormulaError.REF
+
+    for col_idx, cell_value in enumerate(first_row):
+        if _is_match(lookup_value, cell_value, False):
+            if col_idx < len(table[row_idx]):
+                return table[row_idx][col_idx]
+            return FormulaError.REF
+
     return FormulaError.NA
 
 
@@ -183,26 +467,18 @@ def fn_index(array: Any, row_num: Any, col_num: Any = None) -> Any:
         return array if row_num == 1 else FormulaError.REF
 
     row_idx = int(row_num) - 1
-
-    # Handle 1D array
-    if not array or not isinstance(array[0], list):
-        if 0 <= row_idx < len(array):
-            return array[row_idx]
+    if not 0 <= row_idx < len(array):
         return FormulaError.REF
 
-    # Handle 2D array
-    if row_idx < 0 or row_idx >= len(array):
-        return FormulaError.REF
-
-    if col_num is None:
-        return array[row_idx]
-
-    col_idx = int(col_num) - 1
+    # A 1D array, or a 2D array without col_num, yields the whole entry
     row = array[row_idx]
-    if col_idx < 0 or col_idx >= len(row):
-        return FormulaError.REF
+    if col_num is None or not isinstance(array[0], list):
+        return row
 
-    return row[col_idx]
+    col_idx = int(col_num) - 1
+    if 0 <= col_idx < len(row):
+        return row[col_idx]
+    return FormulaError.REF
 
 
 def fn_match(lookup_value: Any, lookup_array: list[Any], match_type: Any = 1) -> int:
@@ -218,54 +494,39 @@ def fn_match(lookup_value: Any, lookup_array: list[Any], match_type: Any = 1) ->
     if not isinstance(lookup_array, list):
         return 0
 
-    # Flatten if nested
-    flat = []
-    for item in lookup_array:
-        if isinstance(item, list):
-            flat.extend(item)
-        else:
-            flat.append(item)
+    flat = _flatten_once(lookup_array)
 
     mtype = int(match_type) if match_type is not None else 1
 
     if mtype == 0:
         # Exact match
+        if len(flat) >= _EXACT_INDEX_MIN:
+            exact = _get_lookup_index(flat).exact
+            if exact is not None:
+                pos = _find_exact(exact, lookup_value)
+                return 0 if pos is None else pos + 1
         for i, val in enumerate(flat):
             if _is_match(lookup_value, val, False):
                 return i + 1
         return 0
 
-    elif mtype == 1:
+    index = _get_lookup_index(flat)
+    if mtype == 1:
         # Largest <= lookup_value (ascending order)
-        last_match = None
-        for i, val in enumerate(flat):
-            try:
-                if float(val) <= float(lookup_value):
-                    last_match = i + 1
-                else:
-                    break
-            except (ValueError, TypeError):
-                if str(val).upper() <= str(lookup_value).upper():
-                    last_match = i + 1
-                else:
-                    break
-        return last_match or 0
-
-    else:  # mtype == -1
-        # Smallest >= lookup_value (descending order)
-        last_match = None
-        for i, val in enumerate(flat):
-            try:
-                if float(val) >= float(lookup_value):
-                    last_match = i + 1
-                else:
-                    break
-            except (ValueError, TypeError):
-                if str(val).upper() >= str(lookup_value).upper():
-                    last_match = i + 1
-                else:
-                    break
-        return last_match or 0
+        found = _bisect_last_le(index.ascending, lookup_value)
+        if found is not None:
+            return found + 1
+        # Unsorted or mixed: the match is the run of values <= lookup_value
+        return index.prefix_length(operator.le, lookup_value)
+
+    # mtype == -1: smallest >= lookup_value (descending order)
+    if index.descending is not None:
+        numeric, reverse = index.descending
+        target = _search_target(numeric, lookup_value)
+        if target is not None:
+            # Values >= target form a prefix; the rest sort first in reverse
+            return len(reverse) - bisect.bisect_left(reverse, target)
+    return index.prefix_length(operator.ge, lookup_value)
 
 
 def fn_lookup(
@@ -279,35 +540,14 @@ def fn_lookup(
     if not isinstance(lookup_vector, list):
         return FormulaError.NA
 
-    # Flatten vectors
-    lv = []
-    for item in lookup_vector:
-        if isinstance(item, list):
-            lv.extend(item)
-        else:
-            lv.append(item)
+    # Find last value <= lookup_value, by binary search when lv is sorted
+    lv = _flatten_once(lookup_vector)
+    last_match = _get_lookup_index(lv).last_le(lookup_value)
+    if last_match < 0:
+        return FormulaError.NA
 
-    if result_vector is None:
-        rv = lv
-    else:
-        rv = []
-        for item in result_vector:
-            if isinstance(item, list):
-                rv.extend(item)
-            else:
-                rv.append(item)
-
-    # Find last value <= lookup_value
-    last_match = None
-    for i, val in enumerate(lv):
-        try:
-            if float(val) <= float(lookup_value):
-                last_match = i
-        except (ValueError, TypeError):
-            if str(val).upper() <= str(lookup_value).upper():
-                last_match = i
-
-    if last_match is not None and last_match < len(rv):
+    rv = lv if result_vector is None else _flatten_once(result_vector)
+    if last_match < len(rv):
         return rv[last_match]
     return FormulaError.NA
 
@@ -349,20 +589,8 @@ def fn_transpose(array: Any) -> list[Any]:
     if not isinstance(array[0], list):
         return [[v] for v in array]
 
-    # Transpose 2D array
-    rows = len(array)
-    cols = max(len(row) for row in array)
-
-    result = []
-    for c in range(cols):
-        new_row = []
-        for r in range(rows):
-            if c < len(array[r]):
-                new_row.append(array[r][c])
-            else:
-                new_row.append("")
-        result.append(new_row)
-    return result
+    # Transpose 2D array, padding short rows with blanks
+    return list(map(list, itertools.zip_longest(*array, fillvalue="")))
 
 
 def fn_offset(reference: Any, rows: Any, cols: Any, height: Any = None, width: Any = None) -> Any:
@@ -3,31 +3,61 @@
 Implements Lotus 1-2-3 compatible math functions:
 @SUM, @ABS, @INT, @ROUND, @MOD, @SQRT, @EXP, @LN, @LOG
 Trigonometric: @SIN, @COS, @TAN, @ASIN, @ACOS, @ATAN, @ATAN2, @PI, @RAND
+
+Single-value functions such as @ABS, @ROUND, @SQRT and the trigonometric
+functions apply cell by cell when given a range.
 """
 
 import math
 import random
+from collections import deque
 from typing import Any
 
+from .elementwise import elementwise
+
+# Exact value types _to_number converts with a plain float() call
+_NUMBER_TYPES = frozenset((int, float, bool))
+
+# Powers of ten for common @TRUNC decimal places
+_POW10 = tuple(10.0**i for i in range(16))
+
+# Distance from a whole number, in ulps of the scaled value, within which
+# @TRUNC treats that value as the whole number
+_TRUNC_SNAP_ULPS = 4
+
 
 def _to_number(value: Any) -> float:
     """Convert value to number, returning 0 for non-numeric."""
-    if isinstance(value, (int, float)):
+    if type(value) in _NUMBER_TYPES:
         return float(value)
     if isinstance(value, str):
         try:
-            return float(value.replace(",", ""))
+            return float(value.replace(",", "") if "," in value else value)
         except ValueError:
             return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
     return 0.0
 
 
 def _flatten_args(args: tuple) -> list:
-    """Flatten nested lists in arguments."""
+    """Flatten nested lists in arguments.
+
+    Walks a deque of pending values instead of recursing, so nesting depth
+    costs neither stack frames nor a tuple copy per level. Lists holding no
+    lists (range rows) are copied whole.
+    """
+    if list not in map(type, args):
+        return list(args)
     result = []
-    for arg in args:
+    pending = deque(args)
+    while pending:
+        arg = pending.popleft()
         if isinstance(arg, list):
-            result.extend(_flatten_args(tuple(arg)))
+            if list in map(type, arg):
+                pending.extendleft(reversed(arg))
+            else:
+                result.extend(arg)
         else:
             result.append(arg)
     return result
@@ -42,19 +72,22 @@ def fn_sum(*args: Any) -> float:
     return sum(_to_number(v) for v in values if isinstance(v, (int, float, str)) and v != "")
 
 
-def fn_abs(value: Any) -> float:
+def fn_abs(value: Any) -> Any:
     """@ABS - Absolute value."""
+    if isinstance(value, list):
+        return elementwise(fn_abs, value)
     return abs(_to_number(value))
 
 
 def fn_int(value: Any) -> int:
     """@INT - Integer portion (truncates toward negative infinity)."""
-    n = _to_number(value)
-    return int(math.floor(n))
+    return math.floor(_to_number(value))
 
 
-def fn_round(value: Any, decimals: Any = 0) -> float:
+def fn_round(value: Any, decimals: Any = 0) -> Any:
     """@ROUND - Round to specified decimal places."""
+    if isinstance(value, list) or isinstance(decimals, list):
+        return elementwise(fn_round, value, decimals)
     n = _to_number(value)
     d = int(_to_number(decimals))
     return round(n, d)
@@ -65,72 +98,92 @@ def fn_mod(dividend: Any, divisor: Any) -> float:
     n = _to_number(dividend)
     d = _to_number(divisor)
     if d == 0:
-        return float("nan")  # Will be converted to #DIV/0!
+        return math.nan  # Will be converted to #DIV/0!
     return n % d
 
 
-def fn_sqrt(value: Any) -> float:
+def fn_sqrt(value: Any) -> Any:
     """@SQRT - Square root."""
+    if isinstance(value, list):
+        return elementwise(fn_sqrt, value)
     n = _to_number(value)
     if n < 0:
-        return float("nan")  # Will be converted to #ERR!
+        return math.nan  # Will be converted to #ERR!
     return math.sqrt(n)
 
 
-def fn_exp(value: Any) -> float:
+def fn_exp(value: Any) -> Any:
     """@EXP - e raised to power."""
+    if isinstance(value, list):
+        return elementwise(fn_exp, value)
     return math.exp(_to_number(value))
 
 
-def fn_ln(value: Any) -> float:
+def fn_ln(value: Any) -> Any:
     """@LN - Natural logarithm."""
+    if isinstance(value, list):
+        return elementwise(fn_ln, value)
     n = _to_number(value)
     if n <= 0:
-        return float("nan")
+        return math.nan
     return math.log(n)
 
 
-def fn_log(value: Any) -> float:
+def fn_log(value: Any) -> Any:
     """@LOG - Base-10 logarithm."""
+    if isinstance(value, list):
+        return elementwise(fn_log, value)
     n = _to_number(value)
     if n <= 0:
-        return float("nan")
+        return math.nan
     return math.log10(n)
 
 
-def fn_sin(value: Any) -> float:
+def fn_sin(value: Any) -> Any:
     """@SIN - Sine (argument in radians)."""
+    if isinstance(value, list):
+        return elementwise(fn_sin, value)
     return math.sin(_to_number(value))
 
 
-def fn_cos(value: Any) -> float:
+def fn_cos(value: Any) -> Any:
     """@COS - Cosine (argument in radians)."""
+    if isinstance(value, list):
+        return elementwise(fn_cos, value)
     return math.cos(_to_number(value))
 
 
-def fn_tan(value: Any) -> float:
+def fn_tan(value: Any) -> Any:
     """@TAN - Tangent (argument in radians)."""
+    if isinstance(value, list):
+        return elementwise(fn_tan, value)
     return math.tan(_to_number(value))
 
 
-def fn_asin(value: Any) -> float:
+def fn_asin(value: Any) -> Any:
     """@ASIN - Arc sine (result in radians)."""
+    if isinstance(value, list):
+        return elementwise(fn_asin, value)
     n = _to_number(value)
     if n < -1 or n > 1:
-        return float("nan")
+        return math.nan
     return math.asin(n)
 
 
-def fn_acos(value: Any) -> float:
+def fn_acos(value: Any) -> Any:
     """@ACOS - Arc cosine (result in radians)."""
+    if isinstance(value, list):
+        return elementwise(fn_acos, value)
     n = _to_number(value)
     if n < -1 or n > 1:
-        return float("nan")
+        return math.nan
     return math.acos(n)
 
 
-def fn_atan(value: Any) -> float:
+def fn_atan(value: Any) -> Any:
     """@ATAN - Arc tangent (result in radians)."""
+    if isinstance(value, list):
+        return elementwise(fn_atan, value)
     return math.atan(_to_number(value))
 
 
@@ -160,29 +213,33 @@ def fn_power(base: Any, exponent: Any) -> float:
 def fn_sign(value: Any) -> int:
     """@SIGN - Returns -1, 0, or 1 based on sign of value."""
     n = _to_number(value)
-    if n > 0:
-        return 1
-    elif n < 0:
-        return -1
-    return 0
+    return (n > 0) - (n < 0)
 
 
-def fn_trunc(value: Any, decimals: Any = 0) -> float:
+def fn_trunc(value: Any, decimals: Any = 0) -> Any:
     """@TRUNC - Truncate to specified decimal places."""
+    if isinstance(value, list) or isinstance(decimals, list):
+        return elementwise(fn_trunc, value, decimals)
     n = _to_number(value)
     d = int(_to_number(decimals))
-    factor = 10.0**d
-    return float(int(n * factor) / factor)
+    factor = _POW10[d] if 0 <= d < len(_POW10) else 10.0**d
+    scaled = n * factor
+    # Snap products like 0.29 * 100 = 28.999999999999996 to the whole number
+    # they stand for, so binary representation error doesn't drop a digit
+    nearest = round(scaled)
+    if abs(scaled - nearest) <= _TRUNC_SNAP_ULPS * math.ulp(scaled):
+        scaled = nearest
+    return math.trunc(scaled) / factor
 
 
 def fn_ceiling(value: Any) -> int:
     """@CEILING - Round up to nearest integer."""
-    return int(math.ceil(_to_number(value)))
+    return math.ceil(_to_number(value))
 
 
 def fn_floor(value: Any) -> int:
     """@FLOOR - Round down to nearest integer."""
-    return int(math.floor(_to_number(value)))
+    return math.floor(_to_number(value))
 
 
 def fn_degrees(radians: Any) -> float:
@@ -203,15 +260,14 @@ def fn_fact(n: Any) -> int:
     return math.factorial(num)
 
 
-def fn_gcd(a: Any, b: Any) -> int:
-    """@GCD - Greatest common divisor."""
-    return math.gcd(int(_to_number(a)), int(_to_number(b)))
+def fn_gcd(*args: Any) -> int:
+    """@GCD - Greatest common divisor of all arguments."""
+    return math.gcd(*map(int, map(_to_number, _flatten_args(args))))
 
 
-def fn_lcm(a: Any, b: Any) -> int:
-    """@LCM - Least common multiple."""
-    x, y = int(_to_number(a)), int(_to_number(b))
-    return abs(x * y) // math.gcd(x, y) if x and y else 0
+def fn_lcm(*args: Any) -> int:
+    """@LCM - Least common multiple of all arguments."""
+    return math.lcm(*map(int, map(_to_number, _flatten_args(args))))
 
 
 # Function registry for this module
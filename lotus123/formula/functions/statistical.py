@@ -4,28 +4,72 @@ Implements Lotus 1-2-3 compatible statistical functions:
 @AVG, @COUNT, @MIN, @MAX, @STD, @VAR
 """
 
+import heapq
 import math
-from typing import Any
+import statistics
+from collections import Counter, deque
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Callable
+
+# Exact value types _get_numbers and fn_sum convert with a plain float() call
+_NUMBER_TYPES = frozenset((int, float, bool))
+
+# @LARGE/@SMALL/@PERCENTILE select with a heap while the wanted position is
+# within n / _HEAP_SELECT_RATIO of either end
+_HEAP_SELECT_RATIO = 16
+
+# @FACT results small enough for a 64-bit integer, 0! through 20!
+_FACTORIALS = tuple(math.factorial(i) for i in range(21))
+
+
+def _parse_text(value: str) -> float | None:
+    """Parse a text cell as a number, ignoring thousands separators."""
+    try:
+        return float(value.replace(",", "") if "," in value else value)
+    except ValueError:
+        return None
+
+
+# Converters keyed by exact cell type, so the common cases take one lookup
+_CONVERTERS: dict[type, Callable[[Any], float | None]] = {
+    int: float,
+    float: float,
+    bool: float,
+    str: _parse_text,
+}
 
 
 def _to_number(value: Any) -> float | None:
     """Convert value to number, returning None for non-numeric."""
+    convert = _CONVERTERS.get(type(value))
+    if convert is not None:
+        return convert(value)
+    # Subclasses (e.g. IntEnum, str enums) miss the exact-type table
     if isinstance(value, (int, float)):
         return float(value)
     if isinstance(value, str):
-        try:
-            return float(value.replace(",", ""))
-        except ValueError:
-            return None
+        return _parse_text(value)
     return None
 
 
 def _flatten_args(args: tuple) -> list:
-    """Flatten nested lists in arguments."""
+    """Flatten nested lists in arguments.
+
+    Iterative, like the math module's helper: nested lists are pushed back
+    onto a deque in order, and flat lists (range rows) are extended whole.
+    """
+    if list not in map(type, args):
+        return list(args)
     result = []
-    for arg in args:
+    pending = deque(args)
+    while pending:
+        arg = pending.popleft()
         if isinstance(arg, list):
-            result.extend(_flatten_args(tuple(arg)))
+            if list in map(type, arg):
+                pending.extendleft(reversed(arg))
+            else:
+                result.extend(arg)
         else:
             result.append(arg)
     return result
@@ -34,12 +78,23 @@ def _flatten_args(args: tuple) -> list:
 def _get_numbers(args: tuple[Any, ...]) -> list[float]:
     """Extract all numeric values from arguments."""
     values = _flatten_args(args)
-    numbers = []
-    for v in values:
-        n = _to_number(v)
-        if n is not None:
-            numbers.append(n)
-    return numbers
+    if _NUMBER_TYPES.issuperset(map(type, values)):
+        # All plain numbers: convert at C level, nothing to filter out
+        return list(map(float, values))
+    return [n for n in map(_to_number, values) if n is not None]
+
+
+def _sum_squared_deviations(values: list[float]) -> float:
+    """Sum of squared deviations from the mean in one pass (Welford's algorithm)."""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    return m2
 
 
 def fn_avg(*args: Any) -> float:
@@ -102,9 +157,7 @@ def fn_std(*args: Any) -> float:
     if len(numbers) < 2:
         return 0.0
 
-    mean = sum(numbers) / len(numbers)
-    variance = sum((x - mean) ** 2 for x in numbers) / (len(numbers) - 1)
-    return math.sqrt(variance)
+    return math.sqrt(_sum_squared_deviations(numbers) / (len(numbers) - 1))
 
 
 def fn_stds(*args: Any) -> float:
@@ -121,9 +174,7 @@ def fn_stdp(*args: Any) -> float:
     if not numbers:
         return 0.0
 
-    mean = sum(numbers) / len(numbers)
-    variance = sum((x - mean) ** 2 for x in numbers) / len(numbers)
-    return math.sqrt(variance)
+    return math.sqrt(_sum_squared_deviations(numbers) / len(numbers))
 
 
 def fn_var(*args: Any) -> float:
@@ -135,8 +186,7 @@ def fn_var(*args: Any) -> float:
     if len(numbers) < 2:
         return 0.0
 
-    mean = sum(numbers) / len(numbers)
-    return sum((x - mean) ** 2 for x in numbers) / (len(numbers) - 1)
+    return _sum_squared_deviations(numbers) / (len(numbers) - 1)
 
 
 def fn_vars(*args: Any) -> float:
@@ -153,21 +203,15 @@ def fn_varp(*args: Any) -> float:
     if not numbers:
         return 0.0
 
-    mean = sum(numbers) / len(numbers)
-    return sum((x - mean) ** 2 for x in numbers) / len(numbers)
+    return _sum_squared_deviations(numbers) / len(numbers)
 
 
 def fn_median(*args: Any) -> float:
     """@MEDIAN - Middle value when sorted."""
-    numbers = sorted(_get_numbers(args))
+    numbers = _get_numbers(args)
     if not numbers:
         return 0.0
-
-    n = len(numbers)
-    mid = n // 2
-    if n % 2 == 0:
-        return (numbers[mid - 1] + numbers[mid]) / 2
-    return numbers[mid]
+    return statistics.median(numbers)
 
 
 def fn_mode(*args: Any) -> float:
@@ -176,14 +220,39 @@ def fn_mode(*args: Any) -> float:
     if not numbers:
         return 0.0
 
-    from collections import Counter
-
     counts = Counter(numbers)
-    max_count = max(counts.values())
+    ((_, max_count),) = counts.most_common(1)
     if max_count == 1:
         return numbers[0]  # No mode, return first value
-    modes = [k for k, v in counts.items() if v == max_count]
-    return min(modes)  # Return smallest mode
+    return min(k for k, v in counts.items() if v == max_count)  # Smallest mode
+
+
+def _kth_value(numbers: list[float], k: int, largest: bool) -> float:
+    """k-th largest (or smallest) of numbers, for 1 <= k <= len(numbers).
+
+    A heap selection costs O(n log k), beating a full sort while k is a
+    small fraction of n; past that the C sort is faster.
+    """
+    if k * _HEAP_SELECT_RATIO <= len(numbers):
+        select = heapq.nlargest if largest else heapq.nsmallest
+        return select(k, numbers)[-1]
+    return sorted(numbers, reverse=largest)[k - 1]
+
+
+def _adjacent_values(numbers: list[float], i: int) -> tuple[float, float]:
+    """The i-th and (i+1)-th smallest of numbers (0-based), for i + 1 < len(numbers).
+
+    Positions near either end are selected with a heap, as in _kth_value.
+    """
+    n = len(numbers)
+    if (i + 2) * _HEAP_SELECT_RATIO <= n:
+        smallest = heapq.nsmallest(i + 2, numbers)
+        return smallest[i], smallest[i + 1]
+    if (n - i) * _HEAP_SELECT_RATIO <= n:
+        largest = heapq.nlargest(n - i, numbers)
+        return largest[-1], largest[-2]
+    ordered = sorted(numbers)
+    return ordered[i], ordered[i + 1]
 
 
 def fn_large(*args: Any) -> float:
@@ -195,12 +264,12 @@ def fn_large(*args: Any) -> float:
         return float("nan")
 
     *range_args, k = args
-    numbers = sorted(_get_numbers(tuple(range_args)), reverse=True)
+    numbers = _get_numbers(tuple(range_args))
     k_val = int(_to_number(k) or 1)
 
     if k_val < 1 or k_val > len(numbers):
         return float("nan")
-    return numbers[k_val - 1]
+    return _kth_value(numbers, k_val, largest=True)
 
 
 def fn_small(*args: Any) -> float:
@@ -212,12 +281,12 @@ def fn_small(*args: Any) -> float:
         return float("nan")
 
     *range_args, k = args
-    numbers = sorted(_get_numbers(tuple(range_args)))
+    numbers = _get_numbers(tuple(range_args))
     k_val = int(_to_number(k) or 1)
 
     if k_val < 1 or k_val > len(numbers):
         return float("nan")
-    return numbers[k_val - 1]
+    return _kth_value(numbers, k_val, largest=False)
 
 
 def fn_rank(*args: Any) -> int:
@@ -237,17 +306,15 @@ def fn_rank(*args: Any) -> int:
     order_val = _to_number(args[-1]) if len(args) > 2 else 0.0
     order = int(order_val) if order_val is not None else 0
 
+    if value not in numbers:
+        return 0
+    # The rank is one more than the count of values ordered before it, so no
+    # sort is needed; ties share the rank of their first position
     if order == 0:
         # Descending - largest is rank 1
-        sorted_nums = sorted(numbers, reverse=True)
-    else:
-        # Ascending - smallest is rank 1
-        sorted_nums = sorted(numbers)
-
-    try:
-        return sorted_nums.index(value) + 1
-    except ValueError:
-        return 0
+        return sum(map(value.__lt__, numbers)) + 1
+    # Ascending - smallest is rank 1
+    return sum(map(value.__gt__, numbers)) + 1
 
 
 def fn_percentile(*args: Any) -> float:
@@ -259,7 +326,7 @@ def fn_percentile(*args: Any) -> float:
         return float("nan")
 
     *range_args, k = args
-    numbers = sorted(_get_numbers(tuple(range_args)))
+    numbers = _get_numbers(tuple(range_args))
     k_val = _to_number(k) or 0
 
     if not numbers or k_val < 0 or k_val > 1:
@@ -268,13 +335,13 @@ def fn_percentile(*args: Any) -> float:
     n = len(numbers)
     idx = k_val * (n - 1)
     lower = int(idx)
-    upper = lower + 1
 
-    if upper >= n:
-        return numbers[-1]
+    if lower + 1 >= n:
+        return max(numbers)
 
     frac = idx - lower
-    return numbers[lower] * (1 - frac) + numbers[upper] * frac
+    low, high = _adjacent_values(numbers, lower)
+    return low * (1 - frac) + high * frac
 
 
 def fn_quartile(*args: Any) -> float:
@@ -292,9 +359,7 @@ def fn_quartile(*args: Any) -> float:
     if q < 0 or q > 4:
         return float("nan")
 
-    # Convert quartile to percentile
-    percentiles = {0: 0.0, 1: 0.25, 2: 0.5, 3: 0.75, 4: 1.0}
-    return fn_percentile(*range_args, percentiles[q])
+    return fn_percentile(*range_args, q / 4)
 
 
 def fn_rand() -> float:
@@ -324,25 +389,21 @@ def fn_sumproduct(*args: Any) -> float:
     for arg in args:
         if isinstance(arg, list):
             flat = _flatten_args((arg,))
-            arrays.append([_to_number(v) or 0 for v in flat])
+            arrays.append([_to_number(v) or 0.0 for v in flat])
         else:
-            n = _to_number(arg)
-            arrays.append([n if n is not None else 0])
+            arrays.append([_to_number(arg) or 0.0])
 
     if not arrays:
         return 0.0
 
-    # All arrays must be same length
-    min_len = min(len(a) for a in arrays)
-
-    result = 0.0
-    for i in range(min_len):
-        product = 1.0
-        for arr in arrays:
-            product *= arr[i]
-        result += product
-
-    return result
+    # Extra elements of longer arrays are ignored
+    if len(arrays) == 1:
+        return float(sum(arrays[0]))
+    if len(arrays) == 2:
+        first, second = arrays
+        min_len = min(len(first), len(second))
+        return float(math.sumprod(first[:min_len], second[:min_len]))
+    return float(sum(map(math.prod, zip(*arrays))))
 
 
 def fn_permut(n: Any, k: Any) -> int:
@@ -358,11 +419,7 @@ def fn_permut(n: Any, k: Any) -> int:
 
     if n_val < 0 or k_val < 0 or k_val > n_val:
         return 0
-
-    result = 1
-    for i in range(n_val - k_val + 1, n_val + 1):
-        result *= i
-    return result
+    return math.perm(n_val, k_val)
 
 
 def fn_combin(n: Any, k: Any) -> int:
@@ -378,15 +435,7 @@ def fn_combin(n: Any, k: Any) -> int:
 
     if n_val < 0 or k_val < 0 or k_val > n_val:
         return 0
-
-    # Use more efficient calculation
-    if k_val > n_val - k_val:
-        k_val = n_val - k_val
-
-    result = 1
-    for i in range(k_val):
-        result = result * (n_val - i) // (i + 1)
-    return result
+    return math.comb(n_val, k_val)
 
 
 def fn_fact(n: Any) -> int:
@@ -395,22 +444,24 @@ def fn_fact(n: Any) -> int:
     n_val = int(n_num) if n_num is not None else 0
     if n_val < 0:
         return 0
-    result = 1
-    for i in range(2, n_val + 1):
-        result *= i
-    return result
+    if n_val < len(_FACTORIALS):
+        return _FACTORIALS[n_val]
+    return math.factorial(n_val)
 
 
 def fn_sum(*args: Any) -> float:
     """@SUM - Sum of numeric values."""
-    numbers = _get_numbers(args)
-    return sum(numbers)
+    values = _flatten_args(args)
+    if _NUMBER_TYPES.issuperset(map(type, values)):
+        # All plain numbers: convert and add at C level, no intermediate list
+        return sum(map(float, values))
+    return sum(n for n in map(_to_number, values) if n is not None)
 
 
 def fn_sumsq(*args: Any) -> float:
     """@SUMSQ - Sum of squares."""
     numbers = _get_numbers(args)
-    return sum(x * x for x in numbers)
+    return math.sumprod(numbers, numbers)
 
 
 def fn_product(*args: Any) -> float:
@@ -418,23 +469,19 @@ def fn_product(*args: Any) -> float:
     numbers = _get_numbers(args)
     if not numbers:
         return 0.0
-    result = 1.0
-    for n in numbers:
-        result *= n
-    return result
+    return math.prod(numbers)
 
 
 def fn_geomean(*args: Any) -> float:
     """@GEOMEAN - Geometric mean."""
     numbers = _get_numbers(args)
-    if not numbers:
+    if not numbers or any(n <= 0 for n in numbers):
         return 0.0
-    product = 1.0
-    for n in numbers:
-        if n <= 0:
-            return 0.0
-        product *= n
-    return product ** (1 / len(numbers))
+    product = math.prod(numbers)
+    if 0.0 < product < math.inf:
+        return product ** (1 / len(numbers))
+    # The product over- or underflowed: average the logarithms instead
+    return math.exp(math.fsum(map(math.log, numbers)) / len(numbers))
 
 
 def fn_harmean(*args: Any) -> float:
@@ -442,52 +489,52 @@ def fn_harmean(*args: Any) -> float:
     numbers = _get_numbers(args)
     if not numbers:
         return 0.0
-    reciprocal_sum = 0.0
-    for n in numbers:
-        if n == 0:
-            return 0.0
-        reciprocal_sum += 1 / n
+    if 0.0 in numbers:
+        return 0.0
+    reciprocal_sum = sum(map((1.0).__truediv__, numbers))
     return len(numbers) / reciprocal_sum
 
 
-# Function registry for this module
-STATISTICAL_FUNCTIONS = {
-    # Basic statistics
-    "SUM": fn_sum,
-    "AVG": fn_avg,
-    "AVERAGE": fn_avg,
-    "COUNT": fn_count,
-    "COUNTA": fn_counta,
-    "COUNTBLANK": fn_countblank,
-    "MIN": fn_min,
-    "MAX": fn_max,
-    "PRODUCT": fn_product,
-    # Dispersion
-    "STD": fn_std,
-    "STDS": fn_stds,
-    "STDP": fn_stdp,
-    "STDEV": fn_std,
-    "VAR": fn_var,
-    "VARS": fn_vars,
-    "VARP": fn_varp,
-    "SUMSQ": fn_sumsq,
-    # Position
-    "MEDIAN": fn_median,
-    "MODE": fn_mode,
-    "LARGE": fn_large,
-    "SMALL": fn_small,
-    "RANK": fn_rank,
-    "PERCENTILE": fn_percentile,
-    "QUARTILE": fn_quartile,
-    # Random
-    "RAND": fn_rand,
-    "RANDBETWEEN": fn_randbetween,
-    # Combinatorics
-    "SUMPRODUCT": fn_sumproduct,
-    "PERMUT": fn_permut,
-    "COMBIN": fn_combin,
-    "FACT": fn_fact,
-    # Means
-    "GEOMEAN": fn_geomean,
-    "HARMEAN": fn_harmean,
-}
+# Function registry for this module (read-only; FunctionRegistry copies it)
+STATISTICAL_FUNCTIONS: Mapping[str, Callable[..., Any]] = MappingProxyType(
+    {
+        # Basic statistics
+        "SUM": fn_sum,
+        "AVG": fn_avg,
+        "AVERAGE": fn_avg,
+        "COUNT": fn_count,
+        "COUNTA": fn_counta,
+        "COUNTBLANK": fn_countblank,
+        "MIN": fn_min,
+        "MAX": fn_max,
+        "PRODUCT": fn_product,
+        # Dispersion
+        "STD": fn_std,
+        "STDS": fn_stds,
+        "STDP": fn_stdp,
+        "STDEV": fn_std,
+        "VAR": fn_var,
+        "VARS": fn_vars,
+        "VARP": fn_varp,
+        "SUMSQ": fn_sumsq,
+        # Position
+        "MEDIAN": fn_median,
+        "MODE": fn_mode,
+        "LARGE": fn_large,
+        "SMALL": fn_small,
+        "RANK": fn_rank,
+        "PERCENTILE": fn_percentile,
+        "QUARTILE": fn_quartile,
+        # Random
+        "RAND": fn_rand,
+        "RANDBETWEEN": fn_randbetween,
+        # Combinatorics
+        "SUMPRODUCT": fn_sumproduct,
+        "PERMUT": fn_permut,
+        "COMBIN": fn_combin,
+        "FACT": fn_fact,
+        # Means
+        "GEOMEAN": fn_geomean,
+        "HARMEAN": fn_harmean,
+    }
+)
@@ -6,16 +6,33 @@ Implements Lotus 1-2-3 compatible string functions:
 @VALUE, @STRING, @CHAR, @CODE, @REPEAT, @N, @S
 """
 
+import functools
 import re
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
 from typing import Any
 
+# Non-printable ASCII and Latin-1 control characters @CLEAN deletes with one
+# str.translate call; tab and newline are kept
+_CONTROL_CHARS = dict.fromkeys(
+    c for c in range(256) if not chr(c).isprintable() and chr(c) not in "\t\n"
+)
+
+# Prebuilt fixed-point format specs for @STRING/@FIXED/@DOLLAR, indexed by
+# decimal places, so the common cases skip building the spec text per call
+_PREBUILT_DECIMALS = 16
+_FIXED_SPECS = tuple(f".{d}f" for d in range(_PREBUILT_DECIMALS))
+_GROUPED_SPECS = tuple(f",.{d}f" for d in range(_PREBUILT_DECIMALS))
+
 
 def _to_string(value: Any) -> str:
     """Convert value to string."""
-    if value is None or value == "":
+    if type(value) is str:
+        return value
+    if value is None:
         return ""
-    if isinstance(value, float) and value == int(value):
-        return str(int(value))
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else str(value)
     return str(value)
 
 
@@ -90,6 +107,19 @@ def fn_find(find_text: Any, within_text: Any, start_pos: Any = 1) -> int:
     return pos + 1 if pos >= 0 else 0
 
 
+@functools.lru_cache(maxsize=256)
+def _search_pattern(find_s: str) -> re.Pattern[str] | None:
+    """Compile an @SEARCH pattern, or None if it is not a valid regex.
+
+    Cached because the same search text is usually copied down a column.
+    """
+    # Convert wildcards to regex
+    try:
+        return re.compile(find_s.replace("?", ".").replace("*", ".*"))
+    except re.error:
+        return None
+
+
 def fn_search(find_text: Any, within_text: Any, start_pos: Any = 1) -> int:
     """@SEARCH - Find substring position (case-insensitive).
 
@@ -100,14 +130,12 @@ def fn_search(find_text: Any, within_text: Any, start_pos: Any = 1) -> int:
     within_s = _to_string(within_text).lower()
     start = max(0, _to_int(start_pos) - 1)
 
-    # Convert wildcards to regex
-    pattern = find_s.replace("?", ".").replace("*", ".*")
-    try:
-        match = re.search(pattern, within_s[start:])
-        if match:
-            return match.start() + start + 1
-    except re.error:
-        pass
+    pattern = _search_pattern(find_s)
+    if pattern is None:
+        return 0
+    match = pattern.search(within_s[start:])
+    if match:
+        return match.start() + start + 1
     return 0
 
 
@@ -141,20 +169,16 @@ def fn_substitute(text: Any, old_text: Any, new_text: Any, instance: Any = None)
     if inst < 1:
         return s
 
-    # Replace specific instance
-    count = 0
-    result = []
-    i = 0
-    while i < len(s):
-        if s[i : i + len(old_s)] == old_s:
-            count += 1
-            if count == inst:
-                result.append(new_s)
-                i += len(old_s)
-                continue
-        result.append(s[i])
-        i += 1
-    return "".join(result)
+    # Replace specific instance. Occurrences may overlap, so each search
+    # resumes one character after the previous match.
+    pos = s.find(old_s)
+    for _ in range(inst - 1):
+        if pos < 0:
+            break
+        pos = s.find(old_s, pos + 1)
+    if pos < 0 or pos >= len(s):
+        return s
+    return s[:pos] + new_s + s[pos + len(old_s) :]
 
 
 def fn_upper(text: Any) -> str:
@@ -182,12 +206,26 @@ def fn_trim(text: Any) -> str:
 def fn_clean(text: Any) -> str:
     """@CLEAN - Remove non-printable characters."""
     s = _to_string(text)
+    if s.isprintable():
+        return s
+    s = s.translate(_CONTROL_CHARS)
+    if s.isascii():
+        return s
+    # Other non-printables (separators, format characters) are rare
     return "".join(c for c in s if c.isprintable() or c in "\t\n")
 
 
 def fn_value(text: Any) -> float:
     """@VALUE - Convert text to number."""
-    s = _to_string(text).strip()
+    if type(text) is float or type(text) is int:
+        return float(text)
+    s = _to_string(text)
+    try:
+        # Plain numeric text needs none of the clean-up below
+        return float(s)
+    except ValueError:
+        pass
+    s = s.strip()
     try:
         # Handle percentage
         if s.endswith("%"):
@@ -206,7 +244,7 @@ def fn_string(number: Any, decimals: Any = 0) -> str:
     """
     n = float(number) if isinstance(number, (int, float)) else 0.0
     d = max(0, _to_int(decimals))
-    return f"{n:.{d}f}"
+    return format(n, _FIXED_SPECS[d] if d < _PREBUILT_DECIMALS else f".{d}f")
 
 
 def fn_text(value: Any, format_text: Any = "") -> str:
@@ -276,7 +314,7 @@ def fn_exact(text1: Any, text2: Any) -> bool:
 
 def fn_concatenate(*args: Any) -> str:
     """@CONCATENATE - Join text values."""
-    return "".join(_to_string(arg) for arg in args)
+    return "".join(map(_to_string, args))
 
 
 def fn_concat(*args: Any) -> str:
@@ -290,16 +328,15 @@ def fn_fixed(number: Any, decimals: Any = 2, no_commas: Any = False) -> str:
     d = max(0, _to_int(decimals))
 
     if no_commas:
-        return f"{n:.{d}f}"
-    else:
-        return f"{n:,.{d}f}"
+        return format(n, _FIXED_SPECS[d] if d < _PREBUILT_DECIMALS else f".{d}f")
+    return format(n, _GROUPED_SPECS[d] if d < _PREBUILT_DECIMALS else f",.{d}f")
 
 
 def fn_dollar(number: Any, decimals: Any = 2) -> str:
     """@DOLLAR - Format as currency."""
     n = float(number) if isinstance(number, (int, float)) else 0.0
     d = max(0, _to_int(decimals))
-    return f"${n:,.{d}f}"
+    return "$" + format(n, _GROUPED_SPECS[d] if d < _PREBUILT_DECIMALS else f",.{d}f")
 
 
 def fn_t(value: Any) -> str:
@@ -309,46 +346,48 @@ def fn_t(value: Any) -> str:
     return ""
 
 
-# Function registry for this module
-STRING_FUNCTIONS = {
-    # Extraction
-    "LEFT": fn_left,
-    "RIGHT": fn_right,
-    "MID": fn_mid,
-    # Length
-    "LENGTH": fn_length,
-    "LEN": fn_len,
-    # Search
-    "FIND": fn_find,
-    "SEARCH": fn_search,
-    # Replacement
-    "REPLACE": fn_replace,
-    "SUBSTITUTE": fn_substitute,
-    # Case conversion
-    "UPPER": fn_upper,
-    "LOWER": fn_lower,
-    "PROPER": fn_proper,
-    # Cleaning
-    "TRIM": fn_trim,
-    "CLEAN": fn_clean,
-    # Conversion
-    "VALUE": fn_value,
-    "STRING": fn_string,
-    "TEXT": fn_text,
-    "CHAR": fn_char,
-    "CODE": fn_code,
-    "N": fn_n,
-    "S": fn_s,
-    "T": fn_t,
-    # Repetition
-    "REPEAT": fn_repeat,
-    "REPT": fn_rept,
-    # Comparison
-    "EXACT": fn_exact,
-    # Concatenation
-    "CONCATENATE": fn_concatenate,
-    "CONCAT": fn_concat,
-    # Formatting
-    "FIXED": fn_fixed,
-    "DOLLAR": fn_dollar,
-}
+# Function registry for this module (read-only; FunctionRegistry copies it)
+STRING_FUNCTIONS: Mapping[str, Callable[..., Any]] = MappingProxyType(
+    {
+        # Extraction
+        "LEFT": fn_left,
+        "RIGHT": fn_right,
+        "MID": fn_mid,
+        # Length
+        "LENGTH": fn_length,
+        "LEN": fn_len,
+        # Search
+        "FIND": fn_find,
+        "SEARCH": fn_search,
+        # Replacement
+        "REPLACE": fn_replace,
+        "SUBSTITUTE": fn_substitute,
+        # Case conversion
+        "UPPER": fn_upper,
+        "LOWER": fn_lower,
+        "PROPER": fn_proper,
+        # Cleaning
+        "TRIM": fn_trim,
+        "CLEAN": fn_clean,
+        # Conversion
+        "VALUE": fn_value,
+        "STRING": fn_string,
+        "TEXT": fn_text,
+        "CHAR": fn_char,
+        "CODE": fn_code,
+        "N": fn_n,
+        "S": fn_s,
+        "T": fn_t,
+        # Repetition
+        "REPEAT": fn_repeat,
+        "REPT": fn_rept,
+        # Comparison
+        "EXACT": fn_exact,
+        # Concatenation
+        "CONCATENATE": fn_concatenate,
+        "CONCAT": fn_concat,
+        # Formatting
+        "FIXED": fn_fixed,
+        "DOLLAR": fn_dollar,
+    }
+)
@@ -1,16 +1,60 @@
 """Formula parser with tokenization and expression building."""
 
+import functools
 import math
 import operator
+from dataclasses import dataclass
 from typing import Any
 
 from ..core.errors import FormulaError
+from ..core.reference import parse_cell_ref
 from ..core.spreadsheet_protocol import SpreadsheetProtocol
 from .context import EvaluationContext
-from .functions import REGISTRY
+from . import functions
 from .tokenizer import Token, Tokenizer, TokenType
 
 
+# Opcodes of compiled formulas. Each instruction is an (opcode, argument) pair.
+OP_CONST = 0  # push argument
+OP_CELL = 1  # push the value of cell reference argument
+OP_RANGE = 2  # push the values of range (start, end)
+OP_NEG = 3  # negate the top of the stack if it is a number
+OP_BINOP = 4  # pop two operands, push argument(left, right)
+OP_COMPARE = 5  # pop two operands, push argument(left, right)
+OP_CALL = 6  # pop argc arguments, push the result of calling function (name, argc)
+
+# Shared end-of-input token for reads past the end of a token list
+_EOF_TOKEN = Token(TokenType.EOF, None)
+
+# Returned by FormulaParser._run when only the interpreter can decide the result
+_FALLBACK = object()
+
+# Exceptions FormulaParser.evaluate maps to error values; raised by compiled
+# code they are left for the interpreter to reproduce
+_EVALUATION_ERRORS = (
+    ZeroDivisionError,
+    RecursionError,
+    ValueError,
+    TypeError,
+    KeyError,
+    IndexError,
+    AttributeError,
+    OverflowError,
+)
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_ref(ref: str) -> tuple[int, int]:
+    """Decode a cell reference such as "A1" or "$B$2" to 0-based (row, col).
+
+    Cached because a workbook evaluates the same few references over and over.
+
+    Raises:
+        ValueError: If the reference is not a valid A1-style reference
+    """
+    return parse_cell_ref(ref.replace("$", ""))
+
+
 class FormulaParser:
     """Parser and evaluator for spreadsheet formulas.
 
@@ -48,10 +92,12 @@ class FormulaParser:
     ) -> None:
         self.spreadsheet = spreadsheet
         # Use singleton registry to avoid expensive re-initialization
-        self.functions = REGISTRY
+        self.functions = functions.REGISTRY
         self.tokenizer = Tokenizer(spreadsheet)
         self._tokens: list[Token] = []
         self._pos: int = 0
+        # Range values already fetched by the current evaluate() call
+        self._ranges: dict[tuple[str, str], list[Any]] = {}
         self.context = context
 
     def evaluate(self, formula: str) -> Any:
@@ -67,10 +113,19 @@ class FormulaParser:
         if not formula:
             return ""
 
+        self._ranges.clear()
         try:
-            self._tokens = self.tokenizer.tokenize(formula)
-            self._pos = 0
-            result = self._parse_expression()
+            result = _FALLBACK
+            compiled = compile_formula(formula)
+            if compiled is not None and not self._uses_named_range(compiled):
+                try:
+                    result = self._run(compiled.code)
+                except _EVALUATION_ERRORS:
+                    result = _FALLBACK
+            if result is _FALLBACK:
+                self._tokens = self.tokenizer.tokenize(formula)
+                self._pos = 0
+                result = self._parse_expression()
 
             # Handle NaN as error
             if isinstance(result, float) and math.isnan(result):
@@ -84,11 +139,100 @@ class FormulaParser:
         except (ValueError, TypeError, KeyError, IndexError, AttributeError, OverflowError):
             return FormulaError.ERR
 
+    def _uses_named_range(self, compiled: CompiledFormula) -> bool:
+        """Whether a name in the formula is currently a named range."""
+        named_ranges = self.spreadsheet.named_ranges
+        return bool(named_ranges) and any(map(named_ranges.exists, compiled.names))
+
+    def _run(self, code: tuple[tuple[int, Any], ...]) -> Any:
+        """Execute compiled formula code.
+
+        Produces the same value as the interpreter whenever no operator sees an
+        error operand. When one does, the interpreter's early returns change
+        which tokens it consumes, so _FALLBACK is returned and the formula is
+        re-evaluated by _parse_expression instead. The exception is the last
+        instruction: nothing is left to consume, so an operator there yields
+        the interpreter's error directly (e.g. A1/B1 with B1 zero).
+        """
+        if len(code) == 1:
+            # Lone constants and cell references are the most common formulas
+            op, arg = code[0]
+            if op == OP_CONST:
+                return arg
+            if op == OP_CELL:
+                return self._get_cell_value(arg)
+
+        stack: list[Any] = []
+        push = stack.append
+        pop = stack.pop
+        is_error = FormulaError.is_error
+        last = code[-1]
+
+        for instruction in code:
+            op, arg = instruction
+            if op == OP_CELL:
+                push(self._get_cell_value(arg))
+            elif op == OP_CONST:
+                push(arg)
+            elif op == OP_BINOP:
+                right = pop()
+                left = stack[-1]
+                if is_error(left):
+                    result = left
+                elif is_error(right):
+                    result = right
+                else:
+                    try:
+                        result = arg(left, right)
+                    except ZeroDivisionError:
+                        result = FormulaError.DIV_ZERO
+                    except (ValueError, TypeError, OverflowError):
+                        result = FormulaError.ERR
+                if is_error(result) and instruction is not last:
+                    return _FALLBACK
+                stack[-1] = result
+            elif op == OP_CALL:
+                name, argc = arg
+                if argc:
+                    args = stack[-argc:]
+                    del stack[-argc:]
+                else:
+                    args = []
+                fn = self.functions.get(name)
+                if not fn:
+                    push(FormulaError.NAME)
+                    continue
+                try:
+                    push(fn(*args))
+                except (ValueError, TypeError, ZeroDivisionError, OverflowError, IndexError):
+                    push(FormulaError.ERR)
+            elif op == OP_RANGE:
+                push(self._get_range_values(*arg))
+            elif op == OP_COMPARE:
+                right = pop()
+                left = stack[-1]
+                if is_error(left):
+                    result = left
+                elif is_error(right):
+                    result = right
+                else:
+                    stack[-1] = arg(left, right)
+                    continue
+                if instruction is not last:
+                    return _FALLBACK
+                stack[-1] = result
+            else:  # OP_NEG
+                value = stack[-1]
+                if isinstance(value, (int, float)):
+                    stack[-1] = -value
+
+        return stack[-1]
+
     def _current(self) -> Token:
         """Get current token."""
         if self._pos < len(self._tokens):
             return self._tokens[self._pos]
-        return Token(TokenType.EOF, None)
+        return _EOF_TOKEN
 
     def _advance(self) -> Token:
         """Move to next token and return current."""
@@ -275,22 +419,165 @@ class FormulaParser:
     def _get_cell_value(self, ref: str) -> Any:
         """Get value of a cell reference."""
         try:
-            # Strip $ signs for lookup
-            clean_ref = ref.replace("$", "")
-            return self.spreadsheet.get_value_by_ref(clean_ref, context=self.context)
+            row, col = _parse_ref(ref)
         except ValueError:
             return FormulaError.REF
+        return self.spreadsheet.get_value(row, col, self.context)
 
     def _get_range_values(self, start_ref: str, end_ref: str) -> list[Any]:
         """Get 2D list of values from a range.
 
         Returns a list of lists (rows) to preserve range shape information
         needed by functions like VLOOKUP, HLOOKUP, INDEX, ROWS, COLS.
-        Functions that need flat values flatten internally.
+        Functions that need flat values flatten internally. A range named
+        more than once in a formula is fetched once and the same list is
+        returned again.
         """
+        key = (start_ref, end_ref)
+        values = self._ranges.get(key)
+        if values is not None:
+            return values
         try:
-            start = start_ref.replace("$", "")
-            end = end_ref.replace("$", "")
-            return self.spreadsheet.get_range(start, end, context=self.context)
+            start_row, start_col = _parse_ref(start_ref)
+            end_row, end_col = _parse_ref(end_ref)
         except ValueError:
             return [[FormulaError.REF]]
+        values = self._ranges[key] = self.spreadsheet.get_range_by_rc(
+            start_row, start_col, end_row, end_col, self.context
+        )
+        return values
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    """Stack-machine code for a formula, plus the names it references.
+
+    Attributes:
+        code: Instructions in evaluation order
+        names: Upper-cased identifiers compiled as cell references; a named
+            range with one of these names would change the token stream
+    """
+
+    code: tuple[tuple[int, Any], ...]
+    names: frozenset[str]
+
+
+class FormulaCompiler:
+    """Compiles a token stream into stack-machine code.
+
+    Mirrors FormulaParser's recursive descent rule for rule, but emits
+    instructions instead of evaluating, so a formula is parsed once no matter
+    how often it is recalculated.
+    """
+
+    def __init__(self, tokens: list[Token]) -> None:
+        self._tokens = tokens
+        self._pos = 0
+        self._code: list[tuple[int, Any]] = []
+
+    def compile(self) -> tuple[tuple[int, Any], ...]:
+        """Compile the first expression in the token stream."""
+        self._expression()
+        return tuple(self._code)
+
+    def _current(self) -> Token:
+        if self._pos < len(self._tokens):
+            return self._tokens[self._pos]
+        return _EOF_TOKEN
+
+    def _advance(self) -> Token:
+        token = self._current()
+        self._pos += 1
+        return token
+
+    def _expression(self) -> None:
+        self._arithmetic()
+        while self._current().type == TokenType.COMPARISON:
+            op_str = self._advance().value
+            self._arithmetic()
+            self._code.append((OP_COMPARE, FormulaParser.COMPARISONS[op_str]))
+
+    def _arithmetic(self, min_prec: int = 0) -> None:
+        self._atom()
+        while True:
+            token = self._current()
+            if token.type != TokenType.OPERATOR or token.value not in FormulaParser.OPERATORS:
+                break
+            prec, op_fn = FormulaParser.OPERATORS[token.value]
+            if prec < min_prec:
+                break
+            self._advance()
+            self._arithmetic(prec + 1)
+            self._code.append((OP_BINOP, op_fn))
+
+    def _atom(self) -> None:
+        token = self._advance()
+        code = self._code
+
+        if token.type == TokenType.OPERATOR and token.value in ("-", "+"):
+            self._atom()
+            if token.value == "-":
+                op, value = code[-1]
+                if op == OP_CONST and type(value) in (int, float):
+                    # Fold negative literals such as -42 into one constant
+                    code[-1] = (OP_CONST, -value)
+                else:
+                    code.append((OP_NEG, None))
+        elif token.type == TokenType.NUMBER or token.type == TokenType.STRING:
+            code.append((OP_CONST, token.value))
+        elif token.type == TokenType.CELL:
+            if self._current().type == TokenType.COLON:
+                self._advance()
+                if self._current().type == TokenType.CELL:
+                    code.append((OP_RANGE, (token.value, self._advance().value)))
+                    return
+            code.append((OP_CELL, token.value))
+        elif token.type == TokenType.RANGE:
+            parts = token.value.split(":")
+            if len(parts) == 2:
+                code.append((OP_RANGE, (parts[0], parts[1])))
+            else:
+                code.append((OP_CONST, FormulaError.REF))
+        elif token.type == TokenType.FUNCTION:
+            self._function(token.value)
+        elif token.type == TokenType.LPAREN:
+            self._expression()
+            if self._current().type == TokenType.RPAREN:
+                self._advance()
+        elif token.type == TokenType.EOF:
+            # Empty expression; EOF is never consumed
+            self._pos -= 1
+            code.append((OP_CONST, ""))
+        else:
+            # Unknown/unexpected token - malformed formula
+            code.append((OP_CONST, FormulaError.ERR))
+
+    def _function(self, name: str) -> None:
+        if self._current().type == TokenType.LPAREN:
+            self._advance()
+        argc = 0
+        while True:
+            token_type = self._current().type
+            if token_type == TokenType.RPAREN:
+                self._advance()
+                break
+            if token_type == TokenType.EOF:
+                break
+            if token_type == TokenType.COMMA:
+                self._advance()
+                continue
+            self._expression()
+            argc += 1
+        self._code.append((OP_CALL, (name, argc)))
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_formula(formula: str) -> CompiledFormula | None:
+    """Compile formula text, ignoring named ranges; None if it nests too deeply."""
+    tokens = Tokenizer().tokenize(formula)
+    try:
+        code = FormulaCompiler(tokens).compile()
+    except RecursionError:
+        return None
+    names = frozenset(t.raw_text.upper() for t in tokens if t.type == TokenType.CELL)
+    return CompiledFormula(code, names)
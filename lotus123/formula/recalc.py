@@ -105,6 +105,10 @@ class RecalcEngine:
         """
         import time
 
+        # Imported here so loading the engine doesn't load function modules
+        from .functions.database import clear_match_cache
+        from .functions.lookup import clear_lookup_cache
+
         start = time.time()
 
         stats = RecalcStats()
@@ -125,6 +129,8 @@ class RecalcEngine:
         ordered_cells = self._get_calculation_order(cells_to_calc)
 
         self._circular_refs.clear()
+        clear_match_cache()
+        clear_lookup_cache()
 
         for row, col in ordered_cells:
             cell = self.spreadsheet.get_cell_if_exists(row, col)
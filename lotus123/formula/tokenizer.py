@@ -1,14 +1,16 @@
 """Tokenizer for formula parsing and analysis."""
 
+import functools
 import re
-from dataclasses import dataclass
-from enum import Enum, auto
-from typing import Any
+import sys
+from enum import IntEnum, auto
+from typing import Any, NamedTuple
 
+from ..core.named_ranges import NamedRange
 from ..core.spreadsheet_protocol import SpreadsheetProtocol
 
 
-class TokenType(Enum):
+class TokenType(IntEnum):
     """Types of tokens in a formula."""
 
     NUMBER = auto()
@@ -25,9 +27,11 @@ class TokenType(Enum):
     EOF = auto()
 
 
-@dataclass
-class Token:
-    """A single token from the formula."""
+class Token(NamedTuple):
+    """A single token from the formula.
+
+    Tokens are immutable so scans and the parser can share them freely.
+    """
 
     type: TokenType
     value: Any
@@ -35,143 +39,139 @@ class Token:
     raw_text: str = ""
 
 
-class Tokenizer:
-    """Tokenizer for spreadsheet formulas."""
+# Scanners for the multi-character tokens, matched in place at the current
+# position. Single-character tokens are cheaper to classify directly.
+_NUMBER_RE = re.compile(r"\d+\.?\d*(?:[eE][+-]?\d+)?")
+_NAME_END_RE = re.compile(r"[^\w$]")
+_CALL_RE = re.compile(r"\s*\(")
 
-    # Regex patterns
-    NUMBER_PATTERN = re.compile(r"\d+\.?\d*([eE][+-]?\d+)?")
+# Token type of each character that is a token on its own
+_SINGLE_CHAR_TOKENS = {
+    **dict.fromkeys("<>=", TokenType.COMPARISON),
+    **dict.fromkeys("+-*/^%", TokenType.OPERATOR),
+    "(": TokenType.LPAREN,
+    ")": TokenType.RPAREN,
+    ",": TokenType.COMMA,
+    ":": TokenType.COLON,
+}
 
-    def __init__(self, spreadsheet: SpreadsheetProtocol | None = None) -> None:
-        self.spreadsheet = spreadsheet
 
-    def tokenize(self, formula: str) -> list[Token]:
-        """Convert formula string to tokens."""
-        tokens = []
-        i = 0
+def _named_range_token(named: NamedRange, token: Token) -> Token:
+    """Token standing for a named range at the position of its name token."""
+    from ..core.reference import RangeReference
 
-        while i < len(formula):
-            ch = formula[i]
+    token_type = TokenType.RANGE if isinstance(named.reference, RangeReference) else TokenType.CELL
+    return Token(token_type, named.reference.to_string(), token.position, token.raw_text)
 
-            # Skip whitespace
-            if ch.isspace():
-                i += 1
-                continue
 
-            # String literal
-            if ch == '"':
-                j = i + 1
-                while j < len(formula) and formula[j] != '"':
-                    if formula[j] == '"' and j + 1 < len(formula):
-                        j += 2
-                    else:
-                        j += 1
-                value = formula[i + 1 : j].replace('"', '"')
-                raw_text = formula[i : j + 1]
-                tokens.append(Token(TokenType.STRING, value, i, raw_text))
-                i = j + 1
-                continue
+@functools.lru_cache(maxsize=4096)
+def _scan(formula: str) -> tuple[Token, ...]:
+    """Tokens for formula, with every non-function name as a CELL token.
 
-            # Multi-char comparison operators
-            if i + 1 < len(formula):
-                two = formula[i : i + 2]
-                if two in ("<>", "<=", ">=", "!=", "=="):
-                    tokens.append(Token(TokenType.COMPARISON, two, i, two))
-                    i += 2
-                    continue
-
-            # Single char comparison/equals
-            if ch in "<>= ":
-                tokens.append(Token(TokenType.COMPARISON, ch, i, ch))
-                i += 1
-                continue
+    The result depends only on the text, so it is cached: recalculation
+    tokenizes the same formula strings over and over. Callers get shared
+    Token objects and must not modify them.
+    """
+    tokens = []
+    i = 0
 
-            # Operators
-            if ch in "+-*/^%":
-                tokens.append(Token(TokenType.OPERATOR, ch, i, ch))
-                i += 1
-                continue
+    while i < len(formula):
+        ch = formula[i]
 
-            # Parentheses and punctuation
-            if ch == "(":
-                tokens.append(Token(TokenType.LPAREN, ch, i, ch))
-                i += 1
-                continue
-            if ch == ")":
-                tokens.append(Token(TokenType.RPAREN, ch, i, ch))
-                i += 1
-                continue
-            if ch == ",":
-                tokens.append(Token(TokenType.COMMA, ch, i, ch))
-                i += 1
-                continue
-            if ch == ":":
-                tokens.append(Token(TokenType.COLON, ch, i, ch))
-                i += 1
-                continue
-            # Lotus-style range separator (..)
-            if ch == "." and i + 1 < len(formula) and formula[i + 1] == ".":
-                tokens.append(Token(TokenType.COLON, ":", i, ".."))
+        # Skip whitespace
+        if ch.isspace():
+            i += 1
+            continue
+
+        # String literal
+        if ch == '"':
+            # Runs to the closing quote, or to the end if unterminated
+            j = formula.find('"', i + 1)
+            if j < 0:
+                j = len(formula)
+            value = formula[i + 1 : j]
+            raw_text = formula[i : j + 1]
+            tokens.append(Token(TokenType.STRING, value, i, raw_text))
+            i = j + 1
+            continue
+
+        # Multi-char comparison operators
+        if ch in "<>!=":
+            two = formula[i : i + 2]
+            if two in ("<>", "<=", ">=", "!=", "=="):
+                tokens.append(Token(TokenType.COMPARISON, two, i, two))
                 i += 2
                 continue
 
-            # @ prefix for Lotus-style functions
-            if ch == "@":
-                i += 1
-                continue
+        # Single-character operators, comparisons and punctuation
+        token_type = _SINGLE_CHAR_TOKENS.get(ch)
+        if token_type is not None:
+            tokens.append(Token(token_type, ch, i, ch))
+            i += 1
+            continue
 
-            # Number
-            if ch.isdigit() or (ch == "." and i + 1 < len(formula) and formula[i + 1].isdigit()):
-                match = self.NUMBER_PATTERN.match(formula, i)
-                if match:
-                    num_str = match.group(0)
-                    num_value: int | float = (
-                        float(num_str) if "." in num_str or "e" in num_str.lower() else int(num_str)
-                    )
-                    tokens.append(Token(TokenType.NUMBER, num_value, i, num_str))
-                    i = match.end()
-                    continue
-
-            # Identifier (function name or cell reference)
-            if ch.isalpha() or ch == "_" or ch == "$":
-                j = i
-                while j < len(formula) and (formula[j].isalnum() or formula[j] in "_$"):
-                    j += 1
-                name = formula[i:j]
-
-                # Skip whitespace to check for function call
-                k = j
-                while k < len(formula) and formula[k].isspace():
-                    k += 1
-
-                if k < len(formula) and formula[k] == "(":
-                    # It's a function
-                    tokens.append(Token(TokenType.FUNCTION, name.upper(), i, name))
-                else:
-                    # Check if it's a named range (if spreadsheet is available)
-                    is_named_range = False
-                    if self.spreadsheet and self.spreadsheet.named_ranges.exists(name):
-                        named = self.spreadsheet.named_ranges.get(name)
-                        if named:
-                            from ..core.reference import RangeReference
-
-                            is_named_range = True
-                            if isinstance(named.reference, RangeReference):
-                                tokens.append(
-                                    Token(TokenType.RANGE, named.reference.to_string(), i, name)
-                                )
-                            else:
-                                tokens.append(
-                                    Token(TokenType.CELL, named.reference.to_string(), i, name)
-                                )
-
-                    if not is_named_range:
-                        # Cell reference
-                        tokens.append(Token(TokenType.CELL, name.upper(), i, name))
-                i = j
-                continue
+        # Lotus-style range separator (..)
+        if ch == "." and i + 1 < len(formula) and formula[i + 1] == ".":
+            tokens.append(Token(TokenType.COLON, ":", i, ".."))
+            i += 2
+            continue
 
-            # Unknown character - skip
+        # @ prefix for Lotus-style functions
+        if ch == "@":
             i += 1
+            continue
+
+        # Number
+        if ch.isdigit() or (ch == "." and i + 1 < len(formula) and formula[i + 1].isdigit()):
+            match = _NUMBER_RE.match(formula, i)
+            if match:
+                num_str = match.group(0)
+                num_value: int | float = (
+                    float(num_str) if "." in num_str or "e" in num_str.lower() else int(num_str)
+                )
+                tokens.append(Token(TokenType.NUMBER, num_value, i, num_str))
+                i = match.end()
+                continue
+
+        # Identifier (function name or cell reference)
+        if ch.isalpha() or ch == "_" or ch == "$":
+            end = _NAME_END_RE.search(formula, i + 1)
+            j = end.start() if end else len(formula)
+            name = formula[i:j]
+
+            # A "(" after optional whitespace makes it a function call
+            if _CALL_RE.match(formula, j):
+                # It's a function; interned so registry lookups hit on identity
+                tokens.append(Token(TokenType.FUNCTION, sys.intern(name.upper()), i, name))
+            else:
+                # Cell reference, or a named range resolved by the Tokenizer
+                tokens.append(Token(TokenType.CELL, name.upper(), i, name))
+            i = j
+            continue
+
+        # Unknown character - skip
+        i += 1
+
+    tokens.append(Token(TokenType.EOF, None, len(formula), ""))
+    return tuple(tokens)
+
 
-        tokens.append(Token(TokenType.EOF, None, len(formula), ""))
+class Tokenizer:
+    """Tokenizer for spreadsheet formulas."""
+
+    def __init__(self, spreadsheet: SpreadsheetProtocol | None = None) -> None:
+        self.spreadsheet = spreadsheet
+
+    def tokenize(self, formula: str) -> list[Token]:
+        """Convert formula string to tokens."""
+        tokens = list(_scan(formula))
+        # Named ranges belong to the spreadsheet, so they are resolved on
+        # every call rather than cached with the scan
+        if self.spreadsheet and self.spreadsheet.named_ranges:
+            named_ranges = self.spreadsheet.named_ranges
+            for index, token in enumerate(tokens):
+                if token.type is TokenType.CELL:
+                    named = named_ranges.get(token.raw_text)
+                    if named is not None:
+                        tokens[index] = _named_range_token(named, token)
         return tokens
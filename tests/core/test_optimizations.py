@@ -1,6 +1,11 @@
 """Tests for optimizations and refactoring."""
 
 import os
+import subprocess
+import sys
+
+import pytest
+
 from lotus123.core.spreadsheet import Spreadsheet
 from lotus123.core.cell import Cell
 from lotus123.formula.parser import FormulaParser
@@ -23,6 +28,57 @@ class TestOptimizations:
         new_registry = FunctionRegistry()
         assert parser1.functions is not new_registry
 
+    def test_function_names_interned(self):
+        """Test tokenized function names share identity with registry keys."""
+        from lotus123.formula.tokenizer import Tokenizer, TokenType
+
+        token = Tokenizer().tokenize("@sum(1,2)")[0]
+        assert token.type is TokenType.FUNCTION
+        key = next(k for k in REGISTRY.functions if k == "SUM")
+        assert token.value is key
+        assert REGISTRY.get("sum") is REGISTRY.get("SUM")
+
+    def test_compiled_function_names_interned(self):
+        """Test compiled calls carry the registry's own key objects."""
+        from lotus123.formula.parser import OP_CALL, compile_formula
+
+        compiled = compile_formula("@sum(1,@Max(2,3))")
+        assert compiled is not None
+        names = [arg[0] for op, arg in compiled.code if op == OP_CALL]
+        keys = {k: k for k in REGISTRY.functions}
+        assert names == ["MAX", "SUM"]
+        assert all(name is keys[name] for name in names)
+        assert "max" in REGISTRY and "MAX" in REGISTRY and "NOPE" not in REGISTRY
+
+    def test_module_function_tables_read_only(self):
+        """Test module function tables are frozen and registered."""
+        from lotus123.formula.functions import STATISTICAL_FUNCTIONS, STRING_FUNCTIONS
+
+        for table in (STATISTICAL_FUNCTIONS, STRING_FUNCTIONS):
+            with pytest.raises(TypeError):
+                table["NEW"] = len  # type: ignore[index]
+            assert all(name in REGISTRY for name in table)
+
+    def test_category_modules_load_on_demand(self):
+        """Test importing the functions package loads no category module."""
+        code = (
+            "import sys, lotus123.formula.functions as f\n"
+            "loaded = [m for m in sys.modules if m.startswith('lotus123.formula.functions.')]\n"
+            "assert not loaded, loaded\n"
+            "assert f.REGISTRY.get('SUM') is not None\n"
+            "assert 'lotus123.formula.functions.statistical' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_category_tables_served_lazily(self):
+        """Test package-level tables are the category modules' own objects."""
+        from lotus123.formula import functions
+        from lotus123.formula.functions import math as math_functions
+
+        assert functions.MATH_FUNCTIONS is math_functions.MATH_FUNCTIONS
+        with pytest.raises(AttributeError):
+            functions.NOPE_FUNCTIONS
+
     def test_formula_detection_logic(self):
         """Test enhanced is_formula detection logic."""
         c = Cell()
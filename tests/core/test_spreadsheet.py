@@ -129,6 +129,15 @@ class TestSpreadsheet:
         result = ss.get_range("A1", "B2")
         assert result == [[1, 2], [3, 4]]
 
+    def test_get_range_by_rc(self):
+        ss = Spreadsheet()
+        ss.set_cell(0, 0, "1")
+        ss.set_cell(0, 1, "2")
+        ss.set_cell(1, 0, "3")
+        ss.set_cell(1, 1, "4")
+        assert ss.get_range_by_rc(0, 0, 1, 1) == [[1, 2], [3, 4]]
+        assert ss.get_range_by_rc(1, 1, 0, 0) == [[1, 2], [3, 4]]
+
     def test_get_range_flat(self):
         ss = Spreadsheet()
         ss.set_cell(0, 0, "1")
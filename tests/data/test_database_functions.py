@@ -2,8 +2,12 @@
 
 from lotus123.formula.functions.database import (
     DATABASE_FUNCTIONS,
+    clear_match_cache,
+    _compile_criteria,
     _get_field_index,
+    _get_matching_values,
     _matches_criteria,
+    _row_predicate,
     _to_number,
     fn_davg,
     fn_dcount,
@@ -95,6 +99,22 @@ class TestMatchesCriteria:
         criteria = [["Name"], ["ALICE"]]
         assert _matches_criteria(row, headers, criteria) is True
 
+    def test_exact_match_casefold(self):
+        """Test exact match folds case beyond ASCII."""
+        row = ["Straße", 30, 50000]
+        headers = ["Name", "Age", "Salary"]
+        criteria = [["Name"], ["STRASSE"]]
+        assert _matches_criteria(row, headers, criteria) is True
+
+    def test_text_criteria_on_numeric_cells(self):
+        """Test text equality criteria against numeric cells."""
+        row = ["Alice", 30, 50000.5]
+        headers = ["Name", "Age", "Salary"]
+        assert _matches_criteria(row, headers, [["Age"], ["30"]]) is True
+        assert _matches_criteria(row, headers, [["Salary"], ["50000.5"]]) is True
+        assert _matches_criteria(row, headers, [["Age"], ["Thirty"]]) is False
+        assert _matches_criteria(row, headers, [["Age"], ["<>Thirty"]]) is True
+
     def test_greater_than(self):
         """Test > comparison."""
         row = ["Alice", 30, 50000]
@@ -167,6 +187,55 @@ class TestMatchesCriteria:
         criteria = [["Name"], ["Alice"], ["Bob"]]  # Alice OR Bob
         assert _matches_criteria(row, headers, criteria) is True
 
+    def test_unknown_header_never_matches(self):
+        """Test criteria on a column missing from the database."""
+        row = ["Alice", 30, 50000]
+        headers = ["Name", "Age", "Salary"]
+        assert _matches_criteria(row, headers, [["Dept"], ["Sales"]]) is False
+
+    def test_non_numeric_operand_never_matches(self):
+        """Test numeric operator with a non-numeric operand."""
+        row = ["Alice", 30, 50000]
+        headers = ["Name", "Age", "Salary"]
+        assert _matches_criteria(row, headers, [["Age"], [">abc"]]) is False
+
+    def test_blank_or_row_is_ignored(self):
+        """Test blank criteria rows do not match everything when others have conditions."""
+        row = ["Bob", 25, 40000]
+        headers = ["Name", "Age", "Salary"]
+        assert _matches_criteria(row, headers, [["Name"], [""], ["Alice"]]) is False
+        assert _matches_criteria(row, headers, [["Name"], [""], [""]]) is True
+
+
+class TestCompileCriteria:
+    """Tests for criteria compilation."""
+
+    def test_empty_criteria_matches_all(self):
+        """Test empty criteria compile to a single unconditional row."""
+        assert _compile_criteria([], ["Name"]) == [[]]
+        assert _compile_criteria([["Name"], [""]], ["Name"]) == [[]]
+
+    def test_header_resolved_to_column(self):
+        """Test criteria headers are resolved to database column indexes."""
+        compiled = _compile_criteria(
+            [["salary", "name"], [">100", "A*"]], ["Name", "Age", "Salary"]
+        )
+        assert [idx for idx, _ in compiled[0]] == [2, 0]
+        predicate = _row_predicate(compiled)
+        assert predicate is not None
+        assert predicate(["Alice", 30, 500]) is True
+        assert predicate(["Bob", 30, 500]) is False
+
+    def test_wildcard_or_rows_merged(self):
+        """Test single-wildcard OR rows on one column share a predicate."""
+        compiled = _compile_criteria([["Name"], ["A*"], ["?ob"]], ["Name", "Age"])
+        assert len(compiled) == 1
+        predicate = _row_predicate(compiled)
+        assert predicate is not None
+        assert predicate(["alice", 30]) is True
+        assert predicate(["Bob", 25]) is True
+        assert predicate(["Carol", 41]) is False
+
 
 class TestDSUM:
     """Tests for DSUM function."""
@@ -204,6 +273,58 @@ class TestDSUM:
         assert result == 0.0
 
 
+class TestMatchCache:
+    """Tests for memoized D-function matches."""
+
+    def setup_method(self):
+        """Start each test with an empty cache."""
+        clear_match_cache()
+
+    def test_equal_ranges_match_separately(self):
+        """Test a fresh range with identical contents gets its own match."""
+        db = [["Dept", "Salary"], ["Sales", 100], ["IT", 200]]
+        first = _get_matching_values(db, "Salary", [["Dept"], ["Sales"]])
+        copy = [list(row) for row in db]
+        second = _get_matching_values(copy, "Salary", [["Dept"], ["Sales"]])
+        assert second == first
+        assert second is not first
+
+    def test_same_range_shares_result(self):
+        """Test the same range passed twice reuses the cached match."""
+        db = [["Dept", "Salary"], ["Sales", 100], ["IT", 200]]
+        first = _get_matching_values(db, "Salary", [["Dept"], ["Sales"]])
+        assert _get_matching_values(db, "Salary", [["Dept"], ["Sales"]]) is first
+
+    def test_mutated_cached_range_is_not_served(self):
+        """Test mutating a cached range does not change what equal ranges get."""
+        db = [["Dept", "Salary"], ["Sales", 1], ["IT", 200]]
+        assert fn_dsum(db, "Salary", [["Dept"], ["Sales"]]) == 1
+        db[1][1] = 100
+        fresh = [["Dept", "Salary"], ["Sales", 100], ["IT", 200]]
+        assert fn_dsum(fresh, "Salary", [["Dept"], ["Sales"]]) == 100
+
+    def test_mutated_range_is_recomputed_after_clear(self):
+        """Test a range mutated in place is rescanned once the cache is cleared."""
+        db = [["Dept", "Salary"], ["Sales", 100], ["IT", 200]]
+        assert fn_dsum(db, "Salary", [["Dept"], ["Sales"]]) == 100
+        db[2][0] = "Sales"
+        clear_match_cache()
+        assert fn_dsum(db, "Salary", [["Dept"], ["Sales"]]) == 300
+
+    def test_value_types_distinguish_entries(self):
+        """Test equal values of different types are not confused by the cache."""
+        criteria = [["Code"], ["1"]]
+        assert fn_dcount([["Code", "N"], [1, 5]], "N", criteria) == 1
+        assert fn_dcount([["Code", "N"], [1.0, 5]], "N", criteria) == 0
+
+    def test_header_types_distinguish_entries(self):
+        """Test headers 1 and 1.0 get their own field maps."""
+        criteria = [["x"], ["a"]]
+        assert fn_dsum([[1, "x"], [5, "a"], [7, "b"]], "1", criteria) == 5
+        assert fn_dsum([[1.0, "x"], [5, "a"], [7, "b"]], "1.0", criteria) == 5
+        assert fn_dsum([[1.0, "x"], [5, "a"], [7, "b"]], "1", criteria) == 0
+
+
 class TestDAVG:
     """Tests for DAVG function."""
 
@@ -96,6 +96,11 @@ class TestHelperFunctions:
         date = _parse_date_string("invalid")
         assert date is None
 
+    def test_parse_date_string_other_iso_forms_rejected(self):
+        """Test ISO forms outside the supported formats are not accepted."""
+        assert _parse_date_string("20230615") is None
+        assert _parse_date_string("2023-W24-4") is None
+
     def test_to_number_int(self):
         """Test converting int."""
         assert _to_number(42) == 42.0
@@ -154,6 +159,12 @@ class TestDateFunctions:
         assert date.year == 2022
         assert date.month == 11
 
+    def test_fn_date_large_month_offset(self):
+        """Test large month offsets normalize in one step."""
+        date = serial_to_date(fn_date(2023, 1000, 1))
+        assert (date.year, date.month) == (2106, 4)
+        assert fn_date(2023, 10**12, 1) == 0
+
     def test_fn_date_invalid(self):
         """Test invalid date returns 0."""
         assert fn_date(2023, 2, 30) == 0  # Feb 30 doesn't exist
@@ -221,6 +232,14 @@ class TestDateFunctions:
         """Test WEEKDAY with invalid serial."""
         assert fn_weekday(float("inf")) == 0
 
+    def test_date_parts_over_range(self):
+        """Test date extraction functions apply element-wise to a range."""
+        dates = [[fn_date(2023, 1, 2)], [fn_date(2024, 6, 15)], [fn_date(2023, 1, 2)]]
+        assert fn_year(dates) == [[2023], [2024], [2023]]
+        assert fn_month(dates) == [[1], [6], [1]]
+        assert fn_day(dates) == [[2], [15], [2]]
+        assert fn_weekday(dates, 2) == [[1], [6], [1]]
+
     def test_fn_today(self):
         """Test TODAY returns current date."""
         serial = fn_today()
@@ -285,9 +304,21 @@ class TestTimeFunctions:
         time = serial_to_time(serial)
         assert time.hour == 14
 
+    def test_fn_timevalue_single_digit_fields(self):
+        """Test TIMEVALUE with unpadded hour and minute."""
+        time = serial_to_time(fn_timevalue("9:5:07"))
+        assert (time.hour, time.minute, time.second) == (9, 5, 7)
+
+    def test_fn_timevalue_unicode_digits(self):
+        """Test TIMEVALUE accepts the digits strptime accepts, and only those."""
+        assert fn_timevalue("\u0661:30") == fn_timevalue("1:30")
+        assert fn_timevalue("1\u00b2:30") == 0.0
+
     def test_fn_timevalue_invalid(self):
         """Test TIMEVALUE with invalid string."""
         assert fn_timevalue("invalid") == 0.0
+        assert fn_timevalue("25:00") == 0.0
+        assert fn_timevalue("12:345") == 0.0
 
     def test_fn_hour(self):
         """Test HOUR function."""
@@ -376,6 +407,12 @@ class TestDateCalculations:
         assert date.month == 2
         assert date.day == 28
 
+    def test_fn_eomonth_leap_years(self):
+        """Test EOMONTH February end in leap and century years."""
+        assert serial_to_date(fn_eomonth(fn_date(2024, 1, 15), 1)).day == 29
+        assert serial_to_date(fn_eomonth(fn_date(2000, 1, 15), 1)).day == 29
+        assert serial_to_date(fn_eomonth(fn_date(2100, 1, 15), 1)).day == 28
+
     def test_fn_eomonth_subtract_months(self):
         """Test EOMONTH subtracting months."""
         start = fn_date(2023, 3, 15)
@@ -269,3 +269,22 @@ class TestFindCircularReferences:
         circular = find_circular_references(graph)
         assert (0, 0) in circular
         assert (0, 1) in circular
+
+    def test_cycle_reached_through_chain(self):
+        """Test cycle detection when the cycle is entered from an acyclic chain."""
+        graph = {
+            (0, 0): {(0, 1)},
+            (0, 1): {(0, 2)},
+            (0, 2): {(0, 3)},
+            (0, 3): {(0, 2)},
+        }
+
+        circular = find_circular_references(graph)
+        assert sorted(circular) == [(0, 2), (0, 3)]
+
+    def test_long_chain_does_not_recurse(self):
+        """Test a dependency chain longer than the recursion limit."""
+        graph = {(i, 0): {(i + 1, 0)} for i in range(5000)}
+
+        circular = find_circular_references(graph)
+        assert circular == []
@@ -1,6 +1,12 @@
 """Tests for financial functions."""
 
+import math
+
+import pytest
+
 from lotus123.formula.functions.financial import (
+    _flatten_args,
+    _rate_newton,
     FINANCIAL_FUNCTIONS,
     fn_cterm,
     fn_ddb,
@@ -40,6 +46,57 @@ class TestPMT:
         assert result < 0  # Payment is negative (cash outflow)
 
 
+class TestFlattenArgs:
+    """Tests for flattening cash flow arguments."""
+
+    def test_range_rows(self):
+        """Test ranges of rows flatten in row-major order."""
+        assert _flatten_args(([[1, 2], [3, 4]], [[5]])) == [1, 2, 3, 4, 5]
+
+    def test_mixed_nesting(self):
+        """Test scalars, flat lists and deeper nesting keep their order."""
+        assert _flatten_args((1, [2, [3, [4]]], [[5]])) == [1, 2, 3, 4, 5]
+        assert _flatten_args(([[1, [2]]],)) == [1, 2]
+
+
+class TestResultTypes:
+    """Tests for the result types of the annuity functions."""
+
+    def test_annuity_results_are_float(self):
+        """Test integer arguments still produce float results."""
+        for fn in (fn_pmt, fn_pv, fn_fv):
+            assert type(fn(0, 10, 100)) is float
+            assert type(fn(1, 10, 100)) is float
+            # A negative base with a fractional period would be complex
+            with pytest.raises(TypeError):
+                fn(-2, 0.5, 100)
+            assert fn([-2], 0.5, 100) == ["#ERR!"]
+
+
+class TestRangeArguments:
+    """Tests for PMT, PV and FV applied element-wise to ranges."""
+
+    def test_pmt_over_rate_range(self):
+        """Test a range of rates gives a range of payments."""
+        result = fn_pmt([[0.05], [0.1]], 10, 1000)
+        assert result == [[fn_pmt(0.05, 10, 1000)], [fn_pmt(0.1, 10, 1000)]]
+
+    def test_pv_and_fv_pair_ranges(self):
+        """Test ranges of the same shape are paired cell by cell."""
+        assert fn_pv(0.1, [[1, 2]], [[110, 0]]) == [[fn_pv(0.1, 1, 110), fn_pv(0.1, 2, 0)]]
+        assert fn_fv([0, 0.1], 2, 100) == [fn_fv(0, 2, 100), fn_fv(0.1, 2, 100)]
+
+    def test_bad_cell_is_error(self):
+        """Test a cell that cannot be computed does not fail the range."""
+        assert fn_pmt([[0.1, "x"]], 10, 1000) == [[fn_pmt(0.1, 10, 1000), "#ERR!"]]
+
+    def test_mismatched_ranges_are_error(self):
+        """Test ranges of different lengths are neither truncated nor indexed past."""
+        assert fn_pmt([[0.1], [0.2], [0.3]], [[10], [20]], 100) == "#ERR!"
+        assert fn_pmt([[0.1], [0.2]], [[10], [20], [30]], 100) == "#ERR!"
+        assert fn_pv(0.1, [[1, 2]], [[110]]) == ["#ERR!"]
+
+
 class TestPV:
     """Tests for PV (present value) function."""
 
@@ -100,6 +157,19 @@ class TestNPV:
         result = fn_npv(0.1, -1000, 400, 400, 400)
         assert result > -200
 
+    def test_npv_matches_direct_discounting(self):
+        """Test NPV against the per-period discounting formula."""
+        flows = [-500, 120, 0, 250.5, 300, -40]
+        expected = sum(cf / 1.07 ** (i + 1) for i, cf in enumerate(flows))
+        assert fn_npv(0.07, flows) == pytest.approx(expected)
+
+    def test_npv_text_keeps_period(self):
+        """Test non-numeric entries are skipped but still take a period."""
+        result = fn_npv(0.1, [["", 100]])
+        assert result == pytest.approx(100 / 1.1**2)
+        result = fn_npv(0.1, ["100", None, True])
+        assert result == pytest.approx(100 / 1.1 + 1 / 1.1**3)
+
 
 class TestIRR:
     """Tests for IRR (internal rate of return) function."""
@@ -125,6 +195,37 @@ class TestIRR:
         result = fn_irr(None, -1000, 500, 500, 500)
         assert isinstance(result, float)
 
+    def test_irr_is_npv_root(self):
+        """Test the IRR discounts the cash flows to zero."""
+        flows = [-100, 10, 10, 110]
+        result = fn_irr(0.3, flows)
+        assert result == pytest.approx(0.1)
+        npv = sum(cf / (1 + result) ** i for i, cf in enumerate(flows))
+        assert npv == pytest.approx(0, abs=1e-9)
+
+    def test_irr_steep_loss(self):
+        """Test an IRR near -100% stays inside the rate > -1 domain."""
+        assert fn_irr(0.1, [-100, 5]) == pytest.approx(-0.95)
+
+    def test_irr_far_guess(self):
+        """Test a guess far from the root still converges."""
+        assert fn_irr(50, [-100, 130]) == pytest.approx(0.3)
+
+    def test_irr_numeric_text(self):
+        """Test numeric labels, including e-notation, count as cash flows."""
+        expected = fn_irr(0.1, [-1000, 400, 400, 400])
+        assert fn_irr(0.1, ["-1e3", "400", 400.0, "Total", "400"]) == pytest.approx(expected)
+        assert fn_irr(0.1, ["nan", "-100", "110"]) == pytest.approx(0.1)
+
+    def test_irr_independent_of_scale(self):
+        """Test tiny and huge cash flows give the same IRR."""
+        assert fn_irr(0.1, [-1e-12, 1.2e-12]) == pytest.approx(0.2)
+        assert fn_irr(0.1, [-1e12, 1.2e12]) == pytest.approx(0.2)
+
+    def test_irr_no_sign_change(self):
+        """Test flows without a sign change have no IRR."""
+        assert fn_irr(0.1, [100, 100]) == "#ERR!"
+
 
 class TestRATE:
     """Tests for RATE function."""
@@ -139,6 +240,21 @@ class TestRATE:
         result = fn_rate(10, -100, 1000, 500)
         assert isinstance(result, float)
 
+    def test_rate_from_zero_uses_secant(self):
+        """Test a zero starting rate, where the derivative vanishes, still converges."""
+        assert _rate_newton(5, 0, -100, 150, 0.0) == pytest.approx(1.5**0.2 - 1)
+
+    def test_rate_independent_of_scale(self):
+        """Test RATE gives the same answer for tiny and unit-sized amounts."""
+        expected = fn_rate(10, -1.5, 10)
+        assert fn_rate(10, -1.5e-12, 1e-11) == pytest.approx(expected)
+        assert fn_rate(10, -1.5e9, 1e10) == pytest.approx(expected)
+
+    def test_rate_solves_mortgage(self):
+        """Test RATE recovers the rate behind a level payment."""
+        payment = fn_pmt(0.005, 360, 100000)
+        assert fn_rate(360, payment, 100000) == pytest.approx(0.005)
+
 
 class TestNPER:
     """Tests for NPER (number of periods) function."""
@@ -181,6 +297,11 @@ class TestCTERM:
         result = fn_cterm(0.1, 2000, -1000)
         assert result == "#ERR!"
 
+    def test_cterm_tiny_rate_precision(self):
+        """Test CTERM stays accurate for rates near zero."""
+        result = fn_cterm(1e-12, 2, 1)
+        assert result == pytest.approx(math.log(2) / 1e-12, rel=1e-9)
+
 
 class TestTERM:
     """Tests for TERM function."""
@@ -195,6 +316,10 @@ class TestTERM:
         result = fn_term(100, 0, 1000)
         assert result == 10
 
+    def test_term_tiny_rate_precision(self):
+        """Test TERM approaches future/payment as the rate goes to zero."""
+        assert fn_term(100, 1e-12, 1000) == pytest.approx(10, rel=1e-9)
+
 
 class TestSLN:
     """Tests for SLN (straight-line depreciation) function."""
@@ -254,6 +379,15 @@ class TestDDB:
         assert isinstance(result, float)
         assert result > 0
 
+    def test_ddb_schedule(self):
+        """Test later periods decline and stop at salvage value."""
+        schedule = [fn_ddb(10000, 1000, 5, per) for per in range(1, 7)]
+        assert schedule == pytest.approx([4000, 2400, 1440, 864, 296, 0])
+
+    def test_ddb_large_period(self):
+        """Test a period far past the asset's life."""
+        assert fn_ddb(10000, 0, 5, 10**9) == 0
+
     def test_ddb_invalid_period(self):
         """Test DDB with invalid period."""
         result = fn_ddb(10000, 1000, 5, 0)
@@ -321,6 +455,13 @@ class TestPPMT:
         result = fn_ppmt(0, 1, 12, 12000)
         assert result == 1000
 
+    def test_ppmt_plus_ipmt_is_payment(self):
+        """Test principal and interest add up to the level payment."""
+        payment = -fn_pmt(0.01, 24, 5000)
+        for per in (1, 12, 24):
+            total = fn_ppmt(0.01, per, 24, 5000) + fn_ipmt(0.01, per, 24, 5000)
+            assert total == pytest.approx(payment)
+
 
 class TestFunctionRegistry:
     """Test the function registry."""
@@ -409,3 +409,123 @@ class TestErrorPropagation:
         """Test #NAME? propagates through arithmetic."""
         result = self.parser.evaluate("NOTAFUNC(1)+1")
         assert result == "#NAME?"
+
+
+class TestCompiledFormulas:
+    """Tests for the cached compiled form used by FormulaParser.evaluate."""
+
+    def setup_method(self):
+        self.ss = Spreadsheet()
+        self.parser = FormulaParser(self.ss)
+
+    def test_compiled_once_per_text(self):
+        """Test the same formula text reuses one compiled program."""
+        from lotus123.formula.parser import compile_formula
+
+        compiled = compile_formula("A1*2+@SUM(B1..B3)")
+        assert compiled is not None
+        assert compiled is compile_formula("A1*2+@SUM(B1..B3)")
+        assert compiled.names == frozenset({"A1", "B1", "B3"})
+
+    def test_results_follow_cell_changes(self):
+        """Test compiled programs read current cell values on every run."""
+        self.ss.set_cell(0, 0, "2")
+        assert self.parser.evaluate("A1*10+1") == 21
+        self.ss.set_cell(0, 0, "5")
+        assert self.parser.evaluate("A1*10+1") == 51
+
+    def test_error_operand_matches_interpreter(self):
+        """Test error operands give the same result as the interpreter."""
+        self.ss.set_cell(0, 0, "=1/0")
+        self.ss.set_cell(0, 1, "5")
+        assert self.parser.evaluate("@SUM(A1+B1)") == 5
+        assert self.parser.evaluate("A1*2") == "#DIV/0!"
+
+    def test_named_range_uses_current_definition(self):
+        """Test names defined after compiling are still resolved."""
+        self.ss.set_cell(0, 0, "3")
+        self.ss.set_cell(1, 0, "4")
+        assert self.parser.evaluate("@SUM(TOTAL)") == 0
+        self.ss.named_ranges.add_from_string("TOTAL", "A1:A2")
+        assert self.parser.evaluate("@SUM(TOTAL)") == 7
+
+    def test_absolute_and_invalid_references(self):
+        """Test cached reference decoding handles $ markers and bad names."""
+        self.ss.set_cell(1, 1, "7")
+        assert self.parser.evaluate("$B$2+B$2+$B2") == 21
+        assert self.parser.evaluate("@SUM($A$1..$B2)") == 7
+        assert self.parser.evaluate("NOTACELL") == "#REF!"
+
+    def test_simple_formulas_compile_to_one_instruction(self):
+        """Test lone references and (negated) literals need no operators."""
+        from lotus123.formula.parser import OP_CELL, OP_CONST, compile_formula
+
+        self.ss.set_cell(0, 0, "3")
+        for formula, instruction, expected in [
+            ("A1", (OP_CELL, "A1"), 3),
+            ("42", (OP_CONST, 42), 42),
+            ("-2.5", (OP_CONST, -2.5), -2.5),
+            ("--7", (OP_CONST, 7), 7),
+        ]:
+            compiled = compile_formula(formula)
+            assert compiled is not None
+            assert compiled.code == (instruction,)
+            assert self.parser.evaluate(formula) == expected
+        assert self.parser.evaluate('-"x"') == "x"
+
+    def test_error_in_last_operator_needs_no_interpreter(self, monkeypatch):
+        """Test errors from a formula's final operator are produced directly."""
+
+        def fail():
+            raise AssertionError("interpreter used")
+
+        self.ss.set_cell(0, 0, "=1/0")
+        self.ss.set_cell(0, 1, "4")
+        self.ss.set_cell(0, 2, "0")
+        monkeypatch.setattr(self.parser, "_parse_expression", fail)
+        assert self.parser.evaluate("B1/C1") == "#DIV/0!"
+        assert self.parser.evaluate('B1-"x"') == "#ERR!"
+        assert self.parser.evaluate("B1*2+A1") == "#DIV/0!"
+        assert self.parser.evaluate("B1<A1") == "#DIV/0!"
+
+    def test_error_before_last_operator_matches_interpreter(self):
+        """Test an error part-way through still follows the interpreter."""
+        self.ss.set_cell(0, 1, "4")
+        self.ss.set_cell(0, 2, "0")
+        assert self.parser.evaluate("B1/C1+1") == "#DIV/0!"
+        assert self.parser.evaluate("@SUM(B1/C1+1,2)") == self._interpreted("@SUM(B1/C1+1,2)")
+
+    def _interpreted(self, formula):
+        self.parser._tokens = self.parser.tokenizer.tokenize(formula)
+        self.parser._pos = 0
+        return self.parser._parse_expression()
+
+
+class TestRangeFetching:
+    """Tests for reuse of range values within one evaluation."""
+
+    def test_repeated_range_fetched_once(self, monkeypatch):
+        """Test a range named twice in a formula is read from the sheet once."""
+        ss = Spreadsheet()
+        for row in range(4):
+            ss.set_cell(row, 0, str(row + 1))
+        parser = FormulaParser(ss)
+        calls = []
+        get_range_by_rc = ss.get_range_by_rc
+
+        def counting_get_range_by_rc(*args):
+            calls.append(args[:4])
+            return get_range_by_rc(*args)
+
+        monkeypatch.setattr(ss, "get_range_by_rc", counting_get_range_by_rc)
+        assert parser.evaluate("@SUM(A1..A4)/@COUNT(A1..A4)+@MAX(A1..A2)") == 4.5
+        assert calls == [(0, 0, 3, 0), (0, 0, 1, 0)]
+
+    def test_ranges_refetched_on_next_evaluation(self):
+        """Test each evaluation sees current cell values."""
+        ss = Spreadsheet()
+        ss.set_cell(0, 0, "1")
+        parser = FormulaParser(ss)
+        assert parser.evaluate("@SUM(A1..A2)") == 1
+        ss.set_cell(1, 0, "5")
+        assert parser.evaluate("@SUM(A1..A2)") == 6
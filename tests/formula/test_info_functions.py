@@ -43,6 +43,16 @@ class TestType:
         """Test TYPE returns 64 for array."""
         assert fn_type([1, 2, 3]) == 64
 
+    def test_type_subclasses(self):
+        """Test TYPE classifies subclasses of the known types."""
+
+        class Label(str):
+            pass
+
+        assert fn_type(Label("abc")) == 2
+        assert fn_type(Label("#N/A")) == 16
+        assert fn_type(None) == 1
+
 
 class TestCell:
     """Tests for CELL function."""
@@ -141,6 +151,13 @@ class TestInfo:
         result = fn_info("numfile")
         assert result == 1
 
+    def test_info_directory_not_cached(self, tmp_path, monkeypatch):
+        """Test INFO directory follows the current directory."""
+        before = fn_info("directory")
+        monkeypatch.chdir(tmp_path)
+        assert fn_info('"Directory"') == str(tmp_path)
+        assert fn_info("directory") != before
+
     def test_info_origin(self):
         """Test INFO with origin type."""
         result = fn_info("origin")
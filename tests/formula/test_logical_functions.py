@@ -2,6 +2,7 @@
 
 from lotus123.formula.functions.logical import (
     _flatten_args,
+    _iter_args,
     _to_bool,
     fn_and,
     fn_choose,
@@ -86,6 +87,31 @@ class TestHelperFunctions:
         """Test converting None."""
         assert _to_bool(None) is False
 
+    def test_iter_args_is_lazy(self):
+        """Test values are produced only as they are consumed."""
+        values = _iter_args(([0, [1, 2]], 3))
+        assert next(values) == 0
+        assert list(values) == [1, 2, 3]
+
+    def test_and_or_short_circuit(self, monkeypatch):
+        """Test AND/OR stop converting at the first deciding value."""
+        from lotus123.formula.functions import logical
+
+        seen = []
+        to_bool = logical._to_bool
+
+        def recording_to_bool(value):
+            seen.append(value)
+            return to_bool(value)
+
+        monkeypatch.setattr(logical, "_to_bool", recording_to_bool)
+
+        assert fn_and([[1, 0], [1, 1]]) is False
+        assert seen == [1, 0]
+        seen.clear()
+        assert fn_or([[0, "TRUE"]], 0) is True
+        assert seen == [0, "TRUE"]
+
 
 class TestCoreFunctions:
     """Tests for core logical functions."""
@@ -204,6 +230,8 @@ class TestErrorFunctions:
         """Test ISERROR with normal value."""
         assert fn_iserror(123) is False
         assert fn_iserror("text") is False
+        assert fn_iserror("") is False
+        assert fn_iserror(None) is False
 
     def test_fn_isna_na(self):
         """Test ISNA with #N/A."""
@@ -362,6 +390,25 @@ class TestConditionalFunctions:
         result = fn_switch("X", "A", 1, "B", 2)
         assert result == ""
 
+    def test_fn_switch_first_duplicate_wins(self):
+        """Test SWITCH returns the first of duplicate cases."""
+        assert fn_switch("A", "A", 1, "B", 2, "A", 3) == 1
+
+    def test_fn_switch_keeps_result_types(self):
+        """Test equal but differently typed arguments keep their own results."""
+        assert type(fn_switch("A", "A", 1)) is int
+        assert fn_switch("A", "A", True) is True
+        assert type(fn_switch("A", "A", 1.0)) is float
+
+    def test_fn_switch_numeric_cases(self):
+        """Test numeric expressions match cases of equal value."""
+        assert fn_switch(2.0, 1, "one", 2, "two") == "two"
+
+    def test_fn_switch_unhashable(self):
+        """Test SWITCH falls back to a scan for range arguments."""
+        assert fn_switch([[1]], [[1]], "range", "default") == "range"
+        assert fn_switch([[2]], [[1]], "range", "default") == "default"
+
     def test_fn_choose_valid_index(self):
         """Test CHOOSE with valid index."""
         assert fn_choose(1, "a", "b", "c") == "a"
@@ -1,7 +1,12 @@
 """Tests for lookup and reference functions."""
 
+import operator
+
 from lotus123.formula.functions.lookup import (
     LOOKUP_FUNCTIONS,
+    _get_lookup_index,
+    _is_sorted,
+    clear_lookup_cache,
     fn_address,
     fn_cols,
     fn_column,
@@ -72,6 +77,45 @@ class TestVLOOKUP:
         result = fn_vlookup(2, table, 2, True)
         assert result == "#N/A"
 
+    def test_vlookup_range_large_numeric_table(self):
+        """Approximate match over a long sorted column finds the last key <= value."""
+        table = [[i // 2, f"row{i}"] for i in range(1000)]
+        assert fn_vlookup(250.5, table, 2, True) == "row501"
+        assert fn_vlookup(499, table, 2, True) == "row999"
+        assert fn_vlookup(-1, table, 2, True) == "#N/A"
+
+    def test_vlookup_range_text_keys(self):
+        """Approximate match over text keys compares case-insensitively."""
+        table = [["apple", 1], ["Banana", 2], ["cherry", 3]]
+        assert fn_vlookup("BLUEBERRY", table, 2, True) == 2
+        assert fn_vlookup("aardvark", table, 2, True) == "#N/A"
+
+    def test_vlookup_range_mixed_keys(self):
+        """Mixed numeric and text keys fall back to the pairwise scan."""
+        table = [[1, "one"], [2, "two"], ["x", "text"]]
+        assert fn_vlookup(2, table, 2, True) == "two"
+
+    def test_vlookup_range_mixed_keys_large(self):
+        """Mixed keys compare numerically pairwise and as text otherwise."""
+        table = [[i, "num"] for i in range(100)] + [["apple", "a"], ["Mango", "m"]]
+        assert fn_vlookup(50.5, table, 2, True) == "num"
+        assert fn_vlookup("banana", table, 2, True) == "a"
+        assert fn_vlookup("zebra", table, 2, True) == "m"
+        assert fn_vlookup("0", table, 2, True) == "num"
+
+    def test_vlookup_exact_large_table(self):
+        """Exact match over a long table returns the first matching row."""
+        table = [[f"Key{i % 500}", i] for i in range(1000)]
+        assert fn_vlookup("KEY250", table, 2, False) == 250
+        assert fn_vlookup("missing", table, 2, False) == "#N/A"
+
+    def test_vlookup_exact_large_table_keeps_types(self):
+        """Exact match over a long table does not equate text with numbers."""
+        table = [[i, f"n{i}"] for i in range(100)] + [["7", "text"]]
+        assert fn_vlookup(7.0, table, 2, False) == "n7"
+        assert fn_vlookup("7", table, 2, False) == "text"
+        assert fn_vlookup(float("nan"), table, 2, False) == "#N/A"
+
 
 class TestHLOOKUP:
     """Tests for HLOOKUP function."""
@@ -120,6 +164,86 @@ class TestHLOOKUP:
         result = fn_hlookup(2, table, 2, True)
         assert result == "#N/A"
 
+    def test_hlookup_range_large_row(self):
+        """Approximate match over a long sorted row finds the last key <= value."""
+        table = [list(range(0, 2000, 2)), [f"col{i}" for i in range(1000)]]
+        assert fn_hlookup(1001, table, 2, True) == "col500"
+        assert fn_hlookup(-5, table, 2, True) == "#N/A"
+
+    def test_hlookup_exact_large_row(self):
+        """Exact match over a long first row returns the first matching column."""
+        table = [[f"c{i % 50}" for i in range(200)], list(range(200))]
+        assert fn_hlookup("C42", table, 2, False) == 42
+        assert fn_hlookup("c99", table, 2, False) == "#N/A"
+
+
+class TestIsSorted:
+    """Tests for the approximate-match sort check."""
+
+    def test_numbers(self):
+        """Test numbers, including numeric text, are compared numerically."""
+        assert _is_sorted([1, "2", 10.5, True + 10])
+        assert not _is_sorted([1, "10", 2])
+
+    def test_text(self):
+        """Test text is compared case-insensitively."""
+        assert _is_sorted(["apple", "Banana", "cherry"])
+        assert not _is_sorted(["b", "A"])
+
+    def test_mixed(self):
+        """Test mixed numbers and text fall back to pairwise comparison."""
+        assert _is_sorted([1, 2, "a"])
+        assert not _is_sorted(["a", 1])
+        assert not _is_sorted(["x", "inf"])
+        assert not _is_sorted(["9x", "10"])
+
+    def test_short(self):
+        """Test empty and single-value columns count as sorted."""
+        assert _is_sorted([])
+        assert _is_sorted(["only"])
+
+
+class TestLookupCache:
+    """Tests for memoized lookup indexes."""
+
+    def setup_method(self):
+        """Start each test with an empty cache."""
+        clear_lookup_cache()
+
+    def test_equal_columns_share_index(self):
+        """Test a fresh column with identical contents reuses the cached index."""
+        first = _get_lookup_index([1, 2, 3])
+        assert _get_lookup_index([1, 2, 3]) is first
+        assert _get_lookup_index([1, 2, 4]) is not first
+
+    def test_value_types_distinguish_entries(self):
+        """Test equal values of different types are not confused by the cache."""
+        assert _get_lookup_index([1, 2]) is not _get_lookup_index([1.0, 2])
+
+    def test_mutated_table_is_reindexed(self):
+        """Test a table mutated in place is not served a stale index."""
+        table = [[i, f"r{i}"] for i in range(100)]
+        assert fn_vlookup(42, table, 2, False) == "r42"
+        table[10][0] = 42
+        assert fn_vlookup(42, table, 2, False) == "r10"
+        assert fn_hlookup(42, [row[0] for row in table], 1, False) == 42
+
+    def test_index_caches_text_conversions(self):
+        """Test a mixed column's numeric and text forms are computed once."""
+        index = _get_lookup_index([1, "b", 3])
+        assert index.numbers == [1.0, None, 3.0]
+        assert index.upper_keys == ["1", "B", "3"]
+        assert index.last_le("c") == 2
+        assert index.last_le(2) == 0
+        assert index.prefix_length(operator.le, 2) == 1
+
+    def test_unhashable_values_are_indexed_uncached(self):
+        """Test columns holding unhashable values get a fresh, scan-only index."""
+        index = _get_lookup_index([[1], 2])
+        assert index is not _get_lookup_index([[1], 2])
+        assert index.exact is None
+        assert fn_match(2, [[[1]]] + list(range(100)), 0) == 4
+
 
 class TestINDEX:
     """Tests for INDEX function."""
@@ -155,6 +279,11 @@ class TestINDEX:
         arr = [[1, 2], [3, 4]]
         assert fn_index(arr, 1, 5) == "#REF!"
 
+    def test_index_1d_ignores_col(self):
+        """Test INDEX on a 1D array ignores col_num."""
+        assert fn_index([10, 20, 30], 2, 5) == 20
+        assert fn_index([], 1) == "#REF!"
+
 
 class TestMATCH:
     """Tests for MATCH function."""
@@ -189,6 +318,35 @@ class TestMATCH:
         arr = ["apple", "banana", "cherry"]
         assert fn_match("banana", arr, 0) == 2
 
+    def test_match_ascending_ties(self):
+        """Test MATCH type 1 returns the last of equal values."""
+        arr = [i // 3 for i in range(300)]
+        assert fn_match(50, arr, 1) == 153
+        assert fn_match(-1, arr, 1) == 0
+
+    def test_match_descending_ties(self):
+        """Test MATCH type -1 returns the last value >= lookup."""
+        arr = [i // 3 for i in range(300)][::-1]
+        assert fn_match(50, arr, -1) == 150
+        assert fn_match(1000, arr, -1) == 0
+
+    def test_match_descending_text(self):
+        """Test MATCH type -1 over descending text compares case-insensitively."""
+        arr = ["delta", "Charlie", "bravo", "alpha"]
+        assert fn_match("BZ", arr, -1) == 2
+
+    def test_match_unsorted_stops_at_first_break(self):
+        """Test MATCH over unsorted values keeps the scan's stop-at-break result."""
+        assert fn_match(25, [10, 30, 20], 1) == 1
+        assert fn_match(25, [40, 10, 30], -1) == 1
+
+    def test_match_unsorted_long_run(self):
+        """Test MATCH over unsorted numbers and text counts the leading run."""
+        arr = list(range(100)) + [5, 200]
+        assert fn_match(150, arr, 1) == 101
+        assert fn_match("m", ["b", "C", "z", "a"], 1) == 2
+        assert fn_match("B", ["z", "C", "a", "y"], -1) == 2
+
 
 class TestLOOKUP:
     """Tests for LOOKUP function."""
@@ -216,6 +374,20 @@ class TestLOOKUP:
         result = fn_lookup(5, lookup)
         assert result == "#N/A"
 
+    def test_lookup_ranges(self):
+        """Test LOOKUP flattens row and column ranges for both vectors."""
+        lookup = [[10], [20], [30]]
+        result = [["A", "B", "C"]]
+        assert fn_lookup(25, lookup, result) == "B"
+
+    def test_lookup_unsorted_takes_last_match(self):
+        """Test LOOKUP over unsorted values returns the last value <= lookup."""
+        assert fn_lookup(5, [1, 9, 4, 7], ["a", "b", "c", "d"]) == "c"
+
+    def test_lookup_short_result_vector(self):
+        """Test LOOKUP past the end of the result vector is #N/A."""
+        assert fn_lookup(3, [1, 2, 3], ["a"]) == "#N/A"
+
 
 class TestROWS:
     """Tests for ROWS function."""
@@ -283,6 +455,11 @@ class TestTRANSPOSE:
         result = fn_transpose([])
         assert result == [[]]
 
+    def test_transpose_ragged(self):
+        """Test TRANSPOSE pads short rows with blanks."""
+        result = fn_transpose([[1, 2, 3], [4], []])
+        assert result == [[1, 4, ""], [2, "", ""], [3, "", ""]]
+
 
 class TestOFFSET:
     """Tests for OFFSET function."""
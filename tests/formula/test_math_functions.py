@@ -1,6 +1,7 @@
 """Tests for mathematical functions."""
 
 import math
+from enum import IntEnum
 
 
 from lotus123.formula.functions.math import (
@@ -64,6 +65,16 @@ class TestHelperFunctions:
         """Test None returns 0."""
         assert _to_number(None) == 0.0
 
+    def test_to_number_bool_and_subclasses(self):
+        """Test bools and int subclasses convert like plain numbers."""
+
+        class Level(IntEnum):
+            HIGH = 3
+
+        assert _to_number(True) == 1.0
+        assert _to_number(Level.HIGH) == 3.0
+        assert type(_to_number(7)) is float
+
     def test_flatten_args_simple(self):
         """Test flattening simple args."""
         result = _flatten_args((1, 2, 3))
@@ -74,6 +85,18 @@ class TestHelperFunctions:
         result = _flatten_args((1, [2, 3], 4))
         assert result == [1, 2, 3, 4]
 
+    def test_flatten_args_mixed_depths(self):
+        """Test flattening keeps order across rows and nested lists."""
+        result = _flatten_args(([[1, 2], [3, [4, [5]]]], 6, [[7]]))
+        assert result == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_flatten_args_deep_nesting(self):
+        """Test flattening nesting deeper than the recursion limit."""
+        nested: list = [1]
+        for _ in range(5000):
+            nested = [nested]
+        assert _flatten_args((nested, 2)) == [1, 2]
+
 
 class TestBasicMath:
     """Tests for basic math functions."""
@@ -94,6 +117,10 @@ class TestBasicMath:
         """Test SUM ignores non-numeric text."""
         assert fn_sum(1, "text", 2) == 3
 
+    def test_fn_sum_mixed_range(self):
+        """Test SUM over a range mixing numbers, numeric text and blanks."""
+        assert fn_sum([[1, "1,000"], ["", None]]) == 1001
+
     def test_fn_abs_positive(self):
         """Test ABS with positive."""
         assert fn_abs(5) == 5
@@ -163,6 +190,11 @@ class TestBasicMath:
         """Test SIGN with zero."""
         assert fn_sign(0) == 0
 
+    def test_fn_sign_returns_int(self):
+        """Test SIGN returns a plain int, with NaN treated as zero."""
+        assert type(fn_sign(-2.5)) is int
+        assert fn_sign(float("nan")) == 0
+
     def test_fn_trunc_positive(self):
         """Test TRUNC with positive."""
         assert fn_trunc(3.7) == 3
@@ -175,6 +207,23 @@ class TestBasicMath:
         """Test TRUNC with decimals."""
         assert fn_trunc(3.14159, 2) == 3.14
 
+    def test_fn_trunc_representation_error(self):
+        """Test TRUNC keeps digits that binary floats store just below."""
+        assert fn_trunc(0.29, 2) == 0.29
+        assert fn_trunc(-0.29, 2) == -0.29
+        assert fn_trunc(1.005, 2) == 1.0
+
+    def test_fn_trunc_just_below_whole_number(self):
+        """Test TRUNC does not round up values that really sit below a boundary."""
+        assert fn_trunc(1.99999999999999) == 1.0
+        assert fn_trunc(123456.99999999) == 123456.0
+        assert fn_trunc(12.3499999999999, 2) == 12.34
+
+    def test_fn_trunc_negative_decimals(self):
+        """Test TRUNC with negative decimals truncates to tens, hundreds."""
+        assert fn_trunc(987.6, -2) == 900.0
+        assert fn_trunc(-987.6, -1) == -980.0
+
     def test_fn_ceiling_positive(self):
         """Test CEILING with positive."""
         assert fn_ceiling(3.1) == 4
@@ -191,6 +240,12 @@ class TestBasicMath:
         """Test FLOOR with negative."""
         assert fn_floor(-3.1) == -4
 
+    def test_rounding_functions_return_int(self):
+        """Test INT, CEILING and FLOOR return plain ints, also for text."""
+        for func in (fn_int, fn_ceiling, fn_floor):
+            assert type(func(2.5)) is int
+            assert type(func("7")) is int
+
     def test_fn_fact_basic(self):
         """Test FACT basic usage."""
         assert fn_fact(5) == 120
@@ -215,6 +270,12 @@ class TestBasicMath:
         """Test LCM with zero."""
         assert fn_lcm(4, 0) == 0
 
+    def test_fn_gcd_lcm_many_arguments(self):
+        """Test GCD and LCM over several values and ranges."""
+        assert fn_gcd(24, [[36], [60]], -12) == 12
+        assert fn_lcm(2, [3, 4], 5) == 60
+        assert fn_lcm(-4, 6) == 12
+
 
 class TestExponentialLog:
     """Tests for exponential and logarithmic functions."""
@@ -318,3 +379,37 @@ class TestConstantsRandom:
         for _ in range(10):
             r = fn_rand()
             assert 0 <= r < 1
+
+
+class TestRangeArguments:
+    """Tests for single-value functions applied across ranges."""
+
+    def test_abs_range(self):
+        """Test ABS keeps the shape of a range argument."""
+        assert fn_abs([[-1, 2], [-3.5, "-4"]]) == [[1, 2], [3.5, 4]]
+
+    def test_round_broadcasts_decimals(self):
+        """Test ROUND pairs range cells with scalar or range decimals."""
+        assert fn_round([1.234, 5.678], 1) == [1.2, 5.7]
+        assert fn_round(1.2345, [0, 2]) == [1, 1.23]
+
+    def test_mismatched_ranges_are_error(self):
+        """Test ROUND rejects value and decimals ranges of different lengths."""
+        assert fn_round([1.234, 5.678], [1]) == "#ERR!"
+        assert fn_round([1.234], [1, 2]) == "#ERR!"
+
+    def test_trunc_range(self):
+        """Test TRUNC applies to each cell of a range."""
+        assert fn_trunc([[1.99], [-1.99]]) == [[1.0], [-1.0]]
+
+    def test_failing_cell_becomes_err(self):
+        """Test a cell that overflows is ERR without failing the range."""
+        result = fn_exp([1, 1000])
+        assert result[0] == math.exp(1)
+        assert result[1] == "#ERR!"
+
+    def test_domain_errors_stay_nan(self):
+        """Test out-of-domain cells give NaN like scalar calls."""
+        result = fn_sqrt([4, -1])
+        assert result[0] == 2.0
+        assert math.isnan(result[1])
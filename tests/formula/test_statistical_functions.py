@@ -1,8 +1,10 @@
 """Tests for statistical functions."""
 
 import math
+from enum import IntEnum
 
 
+from lotus123.formula.functions import REGISTRY
 from lotus123.formula.functions.statistical import (
     _flatten_args,
     _get_numbers,
@@ -63,6 +65,25 @@ class TestHelperFunctions:
         """Test invalid conversion returns None."""
         assert _to_number("abc") is None
 
+    def test_to_number_bool_and_none(self):
+        """Booleans convert to 0/1; None and other types are non-numeric."""
+        assert _to_number(True) == 1.0
+        assert _to_number(None) is None
+        assert _to_number([1]) is None
+
+    def test_to_number_subclasses(self):
+        """int/str subclasses outside the exact-type table still convert."""
+
+        class Level(IntEnum):
+            HIGH = 3
+
+        class Text(str):
+            pass
+
+        assert _to_number(Level.HIGH) == 3.0
+        assert _to_number(Text("2,500")) == 2500.0
+        assert _to_number(Text("x")) is None
+
     def test_flatten_args_simple(self):
         """Test flattening simple args."""
         result = _flatten_args((1, 2, 3))
@@ -73,11 +94,30 @@ class TestHelperFunctions:
         result = _flatten_args((1, [2, 3], 4))
         assert result == [1, 2, 3, 4]
 
+    def test_flatten_args_deep_nesting(self):
+        """Deep nesting does not hit the recursion limit and keeps order."""
+        nested: list = [5]
+        for _ in range(5000):
+            nested = [nested]
+        result = _flatten_args((1, [[2, 3], [4]], nested, 6))
+        assert result == [1, 2, 3, 4, 5, 6]
+
+    def test_flatten_args_range_rows(self):
+        """Rows of a range are flattened in row-major order."""
+        result = _flatten_args(([[1, "a"], [None, 2.5]],))
+        assert result == [1, "a", None, 2.5]
+
     def test_get_numbers_basic(self):
         """Test extracting numbers."""
         result = _get_numbers((1, 2, "3", "text"))
         assert result == [1.0, 2.0, 3.0]
 
+    def test_get_numbers_all_numeric(self):
+        """Test plain numbers, including bools, convert to floats."""
+        result = _get_numbers(([[1, 2.5], [True, -4]],))
+        assert result == [1.0, 2.5, 1.0, -4.0]
+        assert all(type(n) is float for n in result)
+
 
 class TestBasicStatistics:
     """Tests for basic statistical functions."""
@@ -94,6 +134,21 @@ class TestBasicStatistics:
         """Test SUM ignores text."""
         assert fn_sum(1, "text", 2) == 3
 
+    def test_fn_sum_all_numbers(self):
+        """Test SUM over plain numbers returns a float total."""
+        result = fn_sum([[1], [2.5], [True]], 10**20)
+        assert result == 1e20 + 3.5
+        assert isinstance(result, float)
+
+    def test_fn_sum_mixed_range(self):
+        """Test SUM over a range mixing numbers, numeric text and blanks."""
+        assert fn_sum([[1, "1,000"], ["", None]]) == 1001
+
+    def test_sum_and_fact_registered_from_statistical(self):
+        """Test @SUM and @FACT dispatch to this module's functions."""
+        assert REGISTRY.get("SUM") is fn_sum
+        assert REGISTRY.get("FACT") is fn_fact
+
     def test_fn_avg_basic(self):
         """Test basic AVG."""
         assert fn_avg(1, 2, 3) == 2
@@ -150,6 +205,12 @@ class TestBasicStatistics:
         """Test PRODUCT with no numbers."""
         assert fn_product() == 0
 
+    def test_fn_product_range_with_text(self):
+        """Test PRODUCT over a range skips text and returns a float."""
+        result = fn_product([[2, "x"], ["1.5", 4]])
+        assert result == 12.0
+        assert type(result) is float
+
 
 class TestDispersionFunctions:
     """Tests for dispersion functions."""
@@ -199,10 +260,22 @@ class TestDispersionFunctions:
         """Test VARP with no values."""
         assert fn_varp() == 0
 
+    def test_variance_large_offset(self):
+        """Test variance stays exact for values far from zero."""
+        values = [1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16]
+        assert fn_var(values) == 30.0
+        assert fn_varp(values) == 22.5
+        assert fn_stdp([5, 5, 5]) == 0.0
+
     def test_fn_sumsq_basic(self):
         """Test sum of squares."""
         assert fn_sumsq(1, 2, 3) == 14  # 1 + 4 + 9
 
+    def test_fn_sumsq_range_and_empty(self):
+        """Test SUMSQ over a range with text and with no numbers."""
+        assert fn_sumsq([[3, "x"], ["-4", ""]]) == 25
+        assert fn_sumsq() == 0
+
 
 class TestPositionFunctions:
     """Tests for position functions."""
@@ -227,6 +300,10 @@ class TestPositionFunctions:
         """Test MODE with no repeated values."""
         assert fn_mode(1, 2, 3) == 1  # Returns first
 
+    def test_fn_mode_tie_returns_smallest(self):
+        """Test MODE breaks ties between equally frequent values by size."""
+        assert fn_mode([[9, 4, 9], [4, 7, 7]]) == 4
+
     def test_fn_mode_empty(self):
         """Test MODE with no values."""
         assert fn_mode() == 0
@@ -251,6 +328,14 @@ class TestPositionFunctions:
         result = fn_small(1, 2, 3, 10)
         assert math.isnan(result)
 
+    def test_fn_large_small_long_range(self):
+        """Test LARGE and SMALL agree with a full sort for small and large k."""
+        values = [(i * 37) % 101 for i in range(101)]
+        ordered = sorted(values)
+        for k in (1, 3, 50, 101):
+            assert fn_large([values], k) == ordered[-k]
+            assert fn_small([values], k) == ordered[k - 1]
+
     def test_fn_rank_descending(self):
         """Test RANK with descending order."""
         assert fn_rank(5, [1, 2, 3, 4, 5], 0) == 1  # 5 is largest
@@ -263,6 +348,14 @@ class TestPositionFunctions:
         """Test RANK when value not in list."""
         assert fn_rank(10, [1, 2, 3]) == 0
 
+    def test_fn_rank_ties_share_first_position(self):
+        """Test tied values get the rank of their first sorted position."""
+        values = [[7, 3, 7], [1, "x", 9]]
+        assert fn_rank(7, values, 0) == 2
+        assert fn_rank(7, values, 1) == 3
+        assert fn_rank("3", values, 1) == 2
+        assert fn_rank(9, values) == 1
+
     def test_fn_percentile_basic(self):
         """Test PERCENTILE basic usage."""
         result = fn_percentile(1, 2, 3, 4, 5, 0.5)  # 50th percentile
@@ -283,6 +376,14 @@ class TestPositionFunctions:
         result = fn_quartile(1, 2, 3, 5)  # Invalid quartile
         assert math.isnan(result)
 
+    def test_percentile_matches_sorted_interpolation(self):
+        """Test positions near either end and in the middle of a large range."""
+        values = [(i * 37) % 101 for i in range(101)]  # 0..100 shuffled
+        for k in (0.0, 0.005, 0.015, 0.25, 0.5, 0.987, 0.995, 1.0):
+            assert math.isclose(fn_percentile(values, k), k * 100, abs_tol=1e-9)
+        assert fn_quartile(values, 1) == 25.0
+        assert fn_quartile(values, 4) == 100.0
+
 
 class TestRandomFunctions:
     """Tests for random functions."""
@@ -314,6 +415,11 @@ class TestCombinatoricsFunctions:
         """Test FACT with negative."""
         assert fn_fact(-1) == 0
 
+    def test_fn_fact_table_boundary(self):
+        """Test FACT on both sides of the precomputed table."""
+        assert fn_fact(20) == math.factorial(20)
+        assert fn_fact(21) == math.factorial(21)
+
     def test_fn_permut_basic(self):
         """Test PERMUT basic usage."""
         assert fn_permut(5, 2) == 20  # 5!/(5-2)! = 5*4
@@ -332,6 +438,14 @@ class TestCombinatoricsFunctions:
         assert fn_combin(5, 0) == 1
         assert fn_combin(5, 5) == 1
 
+    def test_combinatorics_large_and_fractional(self):
+        """Test exact big-integer results and truncation of fractional args."""
+        assert fn_fact(25) == 15511210043330985984000000
+        assert fn_permut(30, 3) == 24360
+        assert fn_combin(60, 30) == 118264581564861424
+        assert fn_combin("10", 3.9) == 120
+        assert fn_permut(4.7, 0) == 1
+
     def test_fn_combin_invalid(self):
         """Test COMBIN with invalid inputs."""
         assert fn_combin(-1, 2) == 0
@@ -346,6 +460,21 @@ class TestCombinatoricsFunctions:
         """Test SUMPRODUCT with no arrays."""
         assert fn_sumproduct() == 0
 
+    def test_fn_sumproduct_unequal_lengths(self):
+        """Longer arrays are truncated to the shortest one."""
+        assert fn_sumproduct([1, 2, 3], [4, 5]) == 14.0
+        assert fn_sumproduct([1, 2, 3], [4, 5, 6], [2, 1]) == 18.0
+
+    def test_fn_sumproduct_single_and_scalar(self):
+        """One array sums its values; scalars act as one-element arrays."""
+        assert fn_sumproduct([[1, 2], [3, 4]]) == 10.0
+        assert fn_sumproduct(3, [4, 5]) == 12.0
+
+    def test_fn_sumproduct_non_numeric_as_zero(self):
+        """Text and blank cells count as zero."""
+        assert fn_sumproduct([1, "x", None, "2"], [5, 6, 7, 8]) == 21.0
+        assert fn_sumproduct([[1, 2], [3, 4]], [[5, 6], [7, 8]], [[1, 1], [1, 2]]) == 102.0
+
 
 class TestMeanFunctions:
     """Tests for mean functions."""
@@ -363,10 +492,20 @@ class TestMeanFunctions:
         """Test GEOMEAN with negative."""
         assert fn_geomean(2, -1, 8) == 0
 
+    def test_fn_geomean_nan_before_negative(self):
+        """Test a leading NaN does not hide a later negative from GEOMEAN."""
+        assert fn_geomean(float("nan"), -4, 8) == 0
+
     def test_fn_geomean_empty(self):
         """Test GEOMEAN with no values."""
         assert fn_geomean() == 0
 
+    def test_fn_geomean_overflow_and_underflow(self):
+        """GEOMEAN stays finite when the plain product would not."""
+        assert math.isclose(fn_geomean([1e200] * 4), 1e200)
+        assert math.isclose(fn_geomean([1e-200] * 4), 1e-200)
+        assert math.isclose(fn_geomean(1e300, 1e300, 1e-300), 1e100)
+
     def test_fn_harmean_basic(self):
         """Test HARMEAN basic usage."""
         result = fn_harmean(1, 2, 4)
@@ -377,6 +516,10 @@ class TestMeanFunctions:
         """Test HARMEAN with zero."""
         assert fn_harmean(2, 0, 8) == 0
 
+    def test_fn_harmean_negative_zero(self):
+        """Test HARMEAN treats -0.0 like zero."""
+        assert fn_harmean(2, -0.0, 8) == 0
+
     def test_fn_harmean_empty(self):
         """Test HARMEAN with no values."""
         assert fn_harmean() == 0
@@ -54,6 +54,17 @@ class TestHelperFunctions:
         """Test converting float."""
         assert _to_string(3.14) == "3.14"
 
+    def test_to_string_non_finite_float(self):
+        """Test infinities and NaN convert instead of raising."""
+        assert _to_string(float("inf")) == "inf"
+        assert _to_string(float("nan")) == "nan"
+
+    def test_to_string_other_types(self):
+        """Test ints, booleans and large whole floats."""
+        assert _to_string(7) == "7"
+        assert _to_string(True) == "True"
+        assert _to_string(1e20) == "100000000000000000000"
+
     def test_to_int_int(self):
         """Test converting int."""
         assert _to_int(42) == 42
@@ -175,6 +186,16 @@ class TestSearchFunctions:
         """Test SEARCH with * wildcard."""
         assert fn_search("H*o", "Hello") == 1
 
+    def test_fn_search_with_start(self):
+        """Test SEARCH from a start position reports the absolute position."""
+        assert fn_search("L?", "Hello World", 5) == 10
+        assert fn_search("L?", "Hello World", 5) == 10  # cached pattern
+
+    def test_fn_search_invalid_pattern(self):
+        """Test SEARCH returns 0 for text that is not a valid pattern."""
+        assert fn_search("(", "a(b") == 0
+        assert fn_search("[", "a[b") == 0
+
 
 class TestReplacementFunctions:
     """Tests for replacement functions."""
@@ -199,6 +220,14 @@ class TestReplacementFunctions:
         """Test SUBSTITUTE specific instance."""
         assert fn_substitute("banana", "a", "o", 2) == "banona"
 
+    def test_fn_substitute_instance_edges(self):
+        """Test SUBSTITUTE instance past the end, overlaps and empty text."""
+        assert fn_substitute("banana", "a", "o", 4) == "banana"
+        assert fn_substitute("banana", "a", "o", 0) == "banana"
+        assert fn_substitute("aaaa", "aa", "X", 2) == "aXa"
+        assert fn_substitute("abc", "", "-", 2) == "a-bc"
+        assert fn_substitute("abc", "", "-", 4) == "abc"
+
     def test_fn_substitute_invalid_instance(self):
         """Test SUBSTITUTE with invalid instance."""
         assert fn_substitute("banana", "a", "o", 0) == "banana"
@@ -239,6 +268,11 @@ class TestCleaningFunctions:
         """Test CLEAN keeps tabs and newlines."""
         assert fn_clean("Hello\tWorld\n") == "Hello\tWorld\n"
 
+    def test_fn_clean_non_ascii(self):
+        """Test CLEAN keeps printable Unicode and drops other control characters."""
+        assert fn_clean("Café\x07 中") == "Café 中"
+        assert fn_clean("a\x85b​c d") == "abcd"
+
 
 class TestConversionFunctions:
     """Tests for conversion functions."""
@@ -263,6 +297,13 @@ class TestConversionFunctions:
         """Test VALUE with invalid string."""
         assert fn_value("abc") == 0.0
 
+    def test_fn_value_numbers_and_padding(self):
+        """Test VALUE passes numbers through and trims padded text."""
+        assert fn_value(2.5) == 2.5
+        assert fn_value(7) == 7.0
+        assert fn_value("  -1.5e3 ") == -1500.0
+        assert fn_value(" 12.5% ") == 0.125
+
     def test_fn_string_basic(self):
         """Test STRING basic usage."""
         assert fn_string(3.14159, 2) == "3.14"
@@ -365,6 +406,11 @@ class TestConcatenationFunctions:
         """Test CONCATENATE with numbers."""
         assert fn_concatenate("Value: ", 42) == "Value: 42"
 
+    def test_fn_concatenate_mixed_and_empty(self):
+        """Test CONCATENATE with whole floats, blanks and no arguments."""
+        assert fn_concatenate(3.0, None, "-", 2.5, "") == "3-2.5"
+        assert fn_concatenate() == ""
+
     def test_fn_concat_alias(self):
         """Test CONCAT is alias."""
         assert fn_concat("a", "b") == fn_concatenate("a", "b")
@@ -388,3 +434,11 @@ class TestFormattingFunctions:
     def test_fn_dollar_no_decimals(self):
         """Test DOLLAR with no decimals."""
         assert fn_dollar(1234.567, 0) == "$1,235"
+
+    def test_formatting_many_decimals(self):
+        """Test decimal counts beyond the prebuilt format specs."""
+        assert fn_fixed(1234.5, 18) == "1,234.500000000000000000"
+        assert fn_fixed(1234.5, 18, True) == "1234.500000000000000000"
+        assert fn_dollar(-0.25, 17) == "$-0.25000000000000000"
+        assert fn_string(1.5, 16) == "1.5000000000000000"
+        assert fn_string(1.5, 15) == "1.500000000000000"
@@ -0,0 +1,107 @@
+"""Tests for the formula tokenizer."""
+
+import pytest
+
+from lotus123 import Spreadsheet
+from lotus123.formula.tokenizer import Tokenizer, TokenType
+
+
+def _kinds(formula: str) -> list[tuple[TokenType, object]]:
+    return [(t.type, t.value) for t in Tokenizer().tokenize(formula)]
+
+
+class TestTokenizer:
+    """Tests for Tokenizer.tokenize."""
+
+    def test_function_call_and_range(self):
+        """Test a Lotus function over a ".." range."""
+        tokens = Tokenizer().tokenize("@sum (A1..b2)")
+        assert [(t.type, t.value, t.position, t.raw_text) for t in tokens] == [
+            (TokenType.FUNCTION, "SUM", 1, "sum"),
+            (TokenType.LPAREN, "(", 5, "("),
+            (TokenType.CELL, "A1", 6, "A1"),
+            (TokenType.COLON, ":", 8, ".."),
+            (TokenType.CELL, "B2", 10, "b2"),
+            (TokenType.RPAREN, ")", 12, ")"),
+            (TokenType.EOF, None, 13, ""),
+        ]
+
+    def test_numbers(self):
+        """Test integer, decimal and exponent literals."""
+        assert _kinds("12+3.5*2e3-1E") == [
+            (TokenType.NUMBER, 12),
+            (TokenType.OPERATOR, "+"),
+            (TokenType.NUMBER, 3.5),
+            (TokenType.OPERATOR, "*"),
+            (TokenType.NUMBER, 2000.0),
+            (TokenType.OPERATOR, "-"),
+            (TokenType.NUMBER, 1),
+            (TokenType.CELL, "E"),
+            (TokenType.EOF, None),
+        ]
+
+    def test_comparisons(self):
+        """Test two-character comparisons win over single characters."""
+        values = [v for t, v in _kinds("a<>b<=c>=d!=e==f<g>h=i") if t is TokenType.COMPARISON]
+        assert values == ["<>", "<=", ">=", "!=", "==", "<", ">", "="]
+
+    def test_strings(self):
+        """Test string literals, including an unterminated one."""
+        tokens = Tokenizer().tokenize('"a b"&"rest')
+        assert (tokens[0].value, tokens[0].raw_text) == ("a b", '"a b"')
+        assert tokens[1].type is TokenType.STRING
+        assert (tokens[1].value, tokens[1].raw_text) == ("rest", '"rest')
+
+    def test_absolute_names_and_unknown_characters(self):
+        """Test $-references, underscores and skipped characters."""
+        assert _kinds("$A$1 # my_name") == [
+            (TokenType.CELL, "$A$1"),
+            (TokenType.CELL, "MY_NAME"),
+            (TokenType.EOF, None),
+        ]
+
+    def test_named_range(self):
+        """Test identifiers resolve to named ranges when a sheet is given."""
+        sheet = Spreadsheet()
+        sheet.named_ranges.add_from_string("SALES", "A1:A3")
+        tokens = Tokenizer(sheet).tokenize("@SUM(sales)")
+        assert (tokens[2].type, tokens[2].value, tokens[2].raw_text) == (
+            TokenType.RANGE,
+            "A1:A3",
+            "sales",
+        )
+
+    def test_named_range_added_after_first_scan(self):
+        """Test cached scans still pick up names defined later."""
+        sheet = Spreadsheet()
+        tokenizer = Tokenizer(sheet)
+        assert tokenizer.tokenize("total+1")[0].value == "TOTAL"
+        sheet.named_ranges.add_from_string("TOTAL", "C5")
+        assert tokenizer.tokenize("total+1")[0].value == "C5"
+        sheet.named_ranges.delete("TOTAL")
+        assert tokenizer.tokenize("total+1")[0].value == "TOTAL"
+
+    def test_repeat_tokenize_returns_fresh_list(self):
+        """Test callers may modify the returned list without affecting the cache."""
+        tokenizer = Tokenizer()
+        first = tokenizer.tokenize("1+A1")
+        first.clear()
+        assert [t.type for t in tokenizer.tokenize("1+A1")] == [
+            TokenType.NUMBER,
+            TokenType.OPERATOR,
+            TokenType.CELL,
+            TokenType.EOF,
+        ]
+
+    def test_tokens_are_immutable(self):
+        """Test cached tokens cannot be modified through a returned list."""
+        token = Tokenizer().tokenize("A1+1")[0]
+        with pytest.raises(AttributeError):
+            token.value = "B2"  # type: ignore[misc]
+        assert Tokenizer().tokenize("A1+1")[0].value == "A1"
+
+    def test_tokens_are_plain_tuples(self):
+        """Test tokens unpack as tuples with integer token types."""
+        kind, value, position, raw_text = Tokenizer().tokenize("  b7")[0]
+        assert (kind, value, position, raw_text) == (TokenType.CELL, "B7", 2, "b7")
+        assert isinstance(kind, int)